@@ -0,0 +1,60 @@
+"""Sorted-letter signature index for accepting any valid anagram."""
+
+
+def signature(word):
+    """Letters of ``word`` in sorted order; anagrams share one signature"""
+    return ''.join(sorted(word))
+
+
+class AnagramIndex:
+    """Map each signature to the lexicon words spelled with those letters.
+
+    Signatures with a single word store the bare string and larger classes a
+    tuple, which keeps the index close to one dict entry per word.
+    """
+
+    def __init__(self, words):
+        classes = {}
+        for word in words:
+            key = signature(word)
+            entry = classes.get(key)
+            if entry is None:
+                classes[key] = word
+            elif isinstance(entry, str):
+                if entry != word:
+                    classes[key] = (entry, word)
+            elif word not in entry:
+                classes[key] = entry + (word,)
+        self._classes = classes
+
+    def __len__(self):
+        return len(self._classes)
+
+    def anagrams(self, word):
+        """All lexicon words using exactly the letters of ``word``"""
+        entry = self._classes.get(signature(word), ())
+        return (entry,) if isinstance(entry, str) else entry
+
+    def words_with_signature(self, key):
+        """Lexicon words whose sorted letters are exactly ``key``"""
+        entry = self._classes.get(key, ())
+        return (entry,) if isinstance(entry, str) else entry
+
+    def anagram_count(self, word):
+        """Number of lexicon words that are valid answers for ``word``"""
+        entry = self._classes.get(signature(word))
+        if entry is None:
+            return 0
+        return 1 if isinstance(entry, str) else len(entry)
+
+    def is_valid_answer(self, guess, answer):
+        """True when ``guess`` is a lexicon word with the same letters as ``answer``"""
+        if len(guess) != len(answer):
+            return False
+        key = signature(guess)
+        if key != signature(answer):
+            return False
+        entry = self._classes.get(key)
+        if entry is None:
+            return False
+        return guess == entry if isinstance(entry, str) else guess in entry
@@ -0,0 +1,232 @@
+"""Daily gameplay metrics aggregated from the event log.
+
+Reads completed event log files (see event_log.py) and writes two summary
+files for the in-app dashboard::
+
+    python analytics.py run events/ -o analytics/ [--workers 8]
+
+daily.tsv has one row per UTC day, game mode and difficulty with the
+counters in COUNTERS: games started and completed, rounds and how they
+ended, hints by type, power-ups, purchases, banner ad slots rendered (not
+impressions, which the app cannot see) and rewarded ads watched. sessions.tsv has one row per day with the number of
+sessions and players and their median, mean and 90th percentile duration.
+A session is a player's run of events with no gap longer than SESSION_GAP
+seconds, counted on the day it started.
+
+Round counters use each round's own difficulty, which auto difficulty may
+change between rounds. Games started and completed both use the game's:
+its first round's difficulty, which game_complete events also carry, and
+the day it started, so completion rates stay per game.
+
+Each file is one shard for a worker in a multiprocessing pool. A worker
+streams its file line by line and returns only its counters and each
+player's session intervals, which the parent merges, so no event is held
+in memory. Players seen in several files (a worker process that rotated,
+or a player served by two processes) have their intervals joined across
+shards before durations are taken. Lines without every field or with a
+time that is not a number are counted and skipped rather than failing the
+job.
+"""
+
+import argparse
+import glob
+import gzip
+import multiprocessing
+import os
+import time
+
+from engine import HINT_TYPES
+from event_log import FIELDS
+
+SESSION_GAP = 1800.0
+COUNTERS = ('games_started', 'games_completed', 'rounds', 'solved', 'skipped', 'timed_out', 'hints', 'free_hints',
+            *(f"hint_{hint}" for hint in HINT_TYPES), 'power_ups', 'purchases', 'ad_slots_rendered', 'rewarded_ads')
+DAILY_HEADER = "\t".join(('day', 'mode', 'difficulty', *COUNTERS)) + "\n"
+SESSIONS_HEADER = "day\tsessions\tplayers\tmedian_seconds\tmean_seconds\tp90_seconds\n"
+DAY = 86400
+
+_COLUMN = {name: i for i, name in enumerate(COUNTERS)}
+# Event kind -> counter it always bumps
+_KIND_COUNTER = {'game_complete': 'games_completed', 'skip': 'skipped', 'time_up': 'timed_out',
+                 'power_up': 'power_ups', 'purchase': 'purchases', 'ad_slot_rendered': 'ad_slots_rendered',
+                 'ad_view': 'rewarded_ads'}
+
+
+def event_files(paths):
+    """Completed event log files among ``paths`` (files or directories)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, "*.tsv.gz")))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def aggregate_file(path):
+    """Map step: counters by (day, mode, difficulty) and session intervals by player for one file.
+
+    Returns (counters, sessions, malformed lines skipped).
+    """
+    counters = {}
+    sessions = {}
+    malformed = 0
+    width = len(COUNTERS)
+    kind_column = {kind: _COLUMN[name] for kind, name in _KIND_COUNTER.items()}
+    round_end = ('guess', 'skip', 'time_up')
+    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) != len(FIELDS):
+                malformed += 1
+                continue
+            t, kind, player, mode, difficulty, _, seconds, _, detail = fields
+            try:
+                t = float(t)
+                if kind == 'game_complete' and seconds:
+                    key = (int((t - float(seconds)) // DAY), mode, difficulty)
+                else:
+                    key = (int(t // DAY), mode, difficulty)
+            except (ValueError, OverflowError):
+                malformed += 1
+                continue
+            row = counters.get(key)
+            if row is None:
+                row = counters[key] = [0] * width
+            if kind in round_end:
+                row[_COLUMN['rounds']] += 1
+                if kind == 'guess' and detail == '1':
+                    row[_COLUMN['solved']] += 1
+            if kind == 'round_start':
+                if detail == '1':
+                    row[_COLUMN['games_started']] += 1
+            elif kind == 'hint':
+                hint, _, free = detail.partition(':')
+                row[_COLUMN['free_hints' if free else 'hints']] += 1
+                column = _COLUMN.get(f"hint_{hint}")
+                if column is not None:
+                    row[column] += 1
+            else:
+                column = kind_column.get(kind)
+                if column is not None:
+                    row[column] += 1
+
+            intervals = sessions.get(player)
+            if intervals is None:
+                sessions[player] = [[t, t]]
+            else:
+                last = intervals[-1]
+                if t - last[1] > SESSION_GAP:
+                    intervals.append([t, t])
+                elif t > last[1]:
+                    last[1] = t
+                elif t < last[0]:
+                    last[0] = t  # Emitted by another thread just before the previous event
+    return counters, sessions, malformed
+
+
+def merge(partials):
+    """Reduce step: summed counters, each player's sessions joined across shards and malformed lines"""
+    counters = {}
+    intervals = {}
+    malformed = 0
+    for shard_counters, shard_sessions, shard_malformed in partials:
+        malformed += shard_malformed
+        for key, row in shard_counters.items():
+            total = counters.get(key)
+            if total is None:
+                counters[key] = row
+            else:
+                for i, value in enumerate(row):
+                    total[i] += value
+        for player, spans in shard_sessions.items():
+            intervals.setdefault(player, []).extend(spans)
+
+    sessions_by_day = {}
+    for player, spans in intervals.items():
+        spans.sort()
+        start, end = spans[0]
+        for next_start, next_end in spans[1:]:
+            if next_start - end > SESSION_GAP:
+                sessions_by_day.setdefault(int(start // DAY), []).append((player, end - start))
+                start = next_start
+            end = max(end, next_end)
+        sessions_by_day.setdefault(int(start // DAY), []).append((player, end - start))
+    return counters, sessions_by_day, malformed
+
+
+def _day(day):
+    return time.strftime('%Y-%m-%d', time.gmtime(day * DAY))
+
+
+def _write(path, header, lines):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8', newline='\n') as out:
+        out.write(header)
+        out.writelines(lines)
+    os.replace(tmp, path)
+
+
+def write_summaries(counters, sessions_by_day, directory):
+    os.makedirs(directory, exist_ok=True)
+    _write(os.path.join(directory, "daily.tsv"), DAILY_HEADER,
+           (f"{_day(day)}\t{mode}\t{difficulty}\t" + "\t".join(map(str, row)) + "\n"
+            for (day, mode, difficulty), row in sorted(counters.items())))
+
+    lines = []
+    for day, sessions in sorted(sessions_by_day.items()):
+        durations = sorted(duration for _, duration in sessions)
+        players = len({player for player, _ in sessions})
+        median = durations[len(durations) // 2]
+        p90 = durations[min(len(durations) - 1, int(0.9 * len(durations)))]
+        lines.append(f"{_day(day)}\t{len(durations)}\t{players}\t{median:.1f}\t"
+                     f"{sum(durations) / len(durations):.1f}\t{p90:.1f}\n")
+    _write(os.path.join(directory, "sessions.tsv"), SESSIONS_HEADER, lines)
+
+
+def aggregate(paths, directory, workers=None):
+    """Run the whole job; returns (files read, malformed lines, daily rows, days with sessions)"""
+    files = event_files(paths)
+    with multiprocessing.Pool(workers) as pool:
+        counters, sessions_by_day, malformed = merge(pool.imap_unordered(aggregate_file, files))
+    write_summaries(counters, sessions_by_day, directory)
+    return len(files), malformed, len(counters), len(sessions_by_day)
+
+
+def load_summaries(directory):
+    """(daily rows, session rows) from a summary directory, as dicts with numeric values; None if absent"""
+    try:
+        with open(os.path.join(directory, "daily.tsv"), encoding='utf-8') as fh:
+            header = fh.readline().rstrip('\n').split('\t')
+            daily = [dict(zip(header, line.rstrip('\n').split('\t'))) for line in fh]
+        with open(os.path.join(directory, "sessions.tsv"), encoding='utf-8') as fh:
+            header = fh.readline().rstrip('\n').split('\t')
+            sessions = [dict(zip(header, line.rstrip('\n').split('\t'))) for line in fh]
+    except FileNotFoundError:
+        return None
+    for row in daily:
+        for name in COUNTERS:
+            row[name] = int(row[name])
+    for row in sessions:
+        for name in ('sessions', 'players'):
+            row[name] = int(row[name])
+        for name in ('median_seconds', 'mean_seconds', 'p90_seconds'):
+            row[name] = float(row[name])
+    return daily, sessions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate gameplay event logs into daily metrics")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="write daily.tsv and sessions.tsv from event logs")
+    run.add_argument('logs', nargs='+', help="event log files or directories holding them")
+    run.add_argument('-o', '--output', default='analytics')
+    run.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    files, malformed, rows, days = aggregate(args.logs, args.output, args.workers)
+    print(f"Read {files} event files ({malformed} malformed lines skipped); wrote {rows} daily rows and {days} days of sessions to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
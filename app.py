@@ -1,11 +1,34 @@
 import streamlit as st
-import random
 import time
 import json
 import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import RerunException, get_script_run_ctx
 from datetime import datetime, timedelta
 import hashlib
 import math
+import os
+import re
+import sqlite3
+import uuid
+import analytics
+from anagrams import AnagramIndex
+from calibration import DifficultyTable
+from daily import build_daily_challenge, challenge_day
+from definitions import DefinitionStore
+from event_log import EventLog
+from engine import ACHIEVEMENTS, DAILY_MODE, GAME_CONFIG, GAME_MODES, POWER_UPS, SHOP_ITEMS, SKIP_GUESS, GameEngine
+from leaderboard import LeaderboardStore, PeriodLeaderboards
+from lexicon import MappedLexicon, LexiconError
+import metrics
+from metrics import timed
+from player_state import PlayerProfile
+from profile_store import ProfileStore
+from ratings import WordRatings
+from score_sketch import ScoreDistributions
+from session_memory import SessionMemory, deep_size
+from similar_words import SimilarWords
+from static_assets import build_assets
+from word_index import WordIndex
 
 # Configure page
 st.set_page_config(
@@ -15,17 +38,58 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Game configuration
-GAME_CONFIG = {
-    "base_rounds": 5,
-    "base_time_per_round": 60,
-    "base_points_per_correct": 10,
-    "time_bonus_multiplier": 0.1,
-    "xp_per_game": 50,
-    "xp_per_correct": 25,
-    "level_up_base_xp": 500,
-    "daily_streak_bonus": 1.2,
-    "achievement_xp_bonus": 100
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Optional on-disk lexicon built with `python lexicon.py build`; WORD_DATABASE below is the built-in fallback
+LEXICON_PATH = os.environ.get("WORD_SCRAMBLE_LEXICON", os.path.join(APP_DIR, "lexicon.bin"))
+# Round timer: "component" counts down in the browser and reports time-up back to Python,
+# using the fragment timer until the client's component has checked in; "fragment" re-runs
+# only the timer region every TIMER_INTERVAL seconds (needs st.fragment); "rerun" polls
+# from main() with full-script reruns
+TIMER_MODE = os.environ.get("WORD_SCRAMBLE_TIMER_MODE", "component")
+TIMER_INTERVAL = 1.0
+# With WORD_SCRAMBLE_METRICS on (see metrics.py), also show a rerun metrics panel under the page
+METRICS_OVERLAY = os.environ.get("WORD_SCRAMBLE_METRICS_OVERLAY", "") not in ("", "0")
+# Optional sorted definitions file built with `python definitions.py build`
+DEFINITIONS_PATH = os.environ.get("WORD_SCRAMBLE_DEFINITIONS", os.path.join(APP_DIR, "definitions.tsv"))
+# Optional word difficulty table built from round logs with `python calibration.py run`
+DIFFICULTY_TABLE_PATH = os.environ.get("WORD_SCRAMBLE_DIFFICULTY_TABLE", os.path.join(APP_DIR, "difficulty.tsv"))
+# Directory for the gameplay event log (event_log.py); empty disables it
+EVENT_LOG_DIR = os.environ.get("WORD_SCRAMBLE_EVENT_LOG", os.path.join(APP_DIR, "events"))
+# Summaries written by `python analytics.py run`
+ANALYTICS_DIR = os.environ.get("WORD_SCRAMBLE_ANALYTICS", os.path.join(APP_DIR, "analytics"))
+# Operators only: with WORD_SCRAMBLE_ANALYTICS_DASHBOARD on, the home screen links to the Analytics screen
+ANALYTICS_DASHBOARD = os.environ.get("WORD_SCRAMBLE_ANALYTICS_DASHBOARD", "") not in ("", "0")
+# SQLite (WAL) database holding player profiles keyed by the ?player= id
+PROFILE_DB_PATH = os.environ.get("WORD_SCRAMBLE_PROFILE_DB", os.path.join(APP_DIR, "profiles.db"))
+# Shape of the ids get_player_id mints (uuid4().hex)
+PLAYER_ID = re.compile(r"[0-9a-f]{32}")
+# Per-session memory accounting (session_memory.py): sessions idle past SESSION_IDLE_SECONDS, or the
+# least recently used ones once all sessions exceed SESSION_MEMORY_CAP_MB, are saved and trimmed
+SESSION_MEMORY = os.environ.get("WORD_SCRAMBLE_SESSION_MEMORY", "") not in ("", "0")
+SESSION_IDLE_SECONDS = float(os.environ.get("WORD_SCRAMBLE_SESSION_IDLE", 900))
+SESSION_MEMORY_CAP_MB = float(os.environ.get("WORD_SCRAMBLE_SESSION_CAP_MB", 256))
+# Leaderboard screen: top N players plus this many neighbours either side of the player
+LEADERBOARD_TOP = 10
+LEADERBOARD_RADIUS = 2
+# Leaderboard screen tabs: label -> None for all-time, else a PeriodLeaderboards window
+LEADERBOARD_PERIODS = {"All Time": None, "Today": "daily", "Last 7 Days": "weekly"}
+# Completed games a mode needs before the final screen shows a percentile
+PERCENTILE_MIN_GAMES = 20
+# "static" serves assets/ (stylesheet, AdSense bootstrap) once as cacheable, content-hashed
+# files referenced by URL; "inline" sends their contents with every rerun
+ASSET_MODE = os.environ.get("WORD_SCRAMBLE_ASSET_MODE", "static")
+ASSET_SOURCE_DIR = os.path.join(APP_DIR, "assets")
+
+# AdSense: placeholder ids used when st.secrets has no [google] section
+DEFAULT_ADSENSE_CLIENT = "ca-pub-2020561089374332"
+DEFAULT_AD_SLOT = "1234567890"
+# Ad unit sizes; slot ids come from st.secrets["google"]["<type>_ad_slot"]
+AD_UNITS = {
+    "top": (728, 90),
+    "footer": (728, 90),
+    "interstitial": (970, 250),
+    "rewarded": (300, 250)
 }
 
 # Enhanced word database with categories and difficulty levels
@@ -50,623 +114,506 @@ WORD_DATABASE = {
     }
 }
 
-# Achievement definitions
-ACHIEVEMENTS = {
-    "first_game": {"name": "Getting Started", "desc": "Complete your first game", "xp": 100, "icon": "🎮"},
-    "perfect_game": {"name": "Perfectionist", "desc": "Get all words correct in one game", "xp": 200, "icon": "🎯"},
-    "speed_demon": {"name": "Speed Demon", "desc": "Solve a word in under 10 seconds", "xp": 150, "icon": "⚡"},
-    "streak_3": {"name": "Hot Streak", "desc": "Get 3 words correct in a row", "xp": 100, "icon": "🔥"},
-    "streak_7": {"name": "Daily Warrior", "desc": "Play for 7 consecutive days", "xp": 300, "icon": "🗡️"},
-    "word_master": {"name": "Word Master", "desc": "Solve 100 words total", "xp": 500, "icon": "📚"},
-    "hint_less": {"name": "No Help Needed", "desc": "Complete a game without using hints", "xp": 250, "icon": "🧠"},
-    "power_user": {"name": "Power User", "desc": "Use 10 power-ups in total", "xp": 200, "icon": "⭐"},
-    "social_butterfly": {"name": "Social Butterfly", "desc": "Share your score", "xp": 150, "icon": "📱"},
-    "level_10": {"name": "Rising Star", "desc": "Reach level 10", "xp": 400, "icon": "🌟"},
-    "category_master": {"name": "Category Expert", "desc": "Complete all categories", "xp": 600, "icon": "🏆"}
+# Built-in definitions used when the external definition store has no entry
+WORD_DEFINITIONS = {
+    # Animals
+    'CAT': '🐱 A small domesticated carnivorous mammal',
+    'DOG': '🐕 A domesticated descendant of the wolf',
+    'ELEPHANT': '🐘 The largest existing land animal',
+    'GIRAFFE': '🦒 The tallest living terrestrial animal',
+    'MONKEY': '🐒 A primate mammal that is typically tree-dwelling',
+    'RABBIT': '🐰 A small mammal with long ears and a short tail',
+    'TURTLE': '🐢 A slow-moving reptile with a shell',
+    'CHICKEN': '🐔 A domestic fowl kept for eggs or meat',
+    'DOLPHIN': '🐬 An intelligent marine mammal',
+    'FISH': '🐠 An aquatic vertebrate animal',
+    'BIRD': '🐦 A warm-blooded vertebrate with feathers',
+    'BEAR': '🐻 A large heavy mammal with thick fur',
+    'LION': '🦁 A large wild cat known as king of jungle',
+    'FROG': '🐸 An amphibian that lives both in water and on land',
+    'DUCK': '🦆 A waterfowl with webbed feet',
+
+    # Technology
+    'PYTHON': '🐍 A high-level programming language',
+    'CODING': '💻 The process of creating computer software',
+    'ALGORITHM': '⚙️ A step-by-step procedure for solving problems',
+    'LAPTOP': '💻 A portable personal computer',
+    'MOBILE': '📱 A handheld wireless communication device',
+    'TABLET': '📱 A portable touchscreen computer',
+    'CAMERA': '📷 A device for capturing photographs',
+    'STREAM': '🌊 A continuous flow of data or water',
+
+    # Countries
+    'FRANCE': '🇫🇷 A country in Western Europe',
+    'BRAZIL': '🇧🇷 The largest country in South America',
+    'CANADA': '🇨🇦 A country in North America',
+    'EGYPT': '🇪🇬 A country in North Africa',
+    'JAPAN': '🇯🇵 An island nation in East Asia',
+    'RUSSIA': '🇷🇺 The largest country in the world',
+    'MEXICO': '🇲🇽 A country in North America',
+
+    # Nature
+    'FOREST': '🌲 A large area covered chiefly with trees',
+    'SUNSET': '🌅 The time when the sun disappears below the horizon',
+    'JUNGLE': '🌿 A dense tropical forest',
+    'PLANET': '🪐 A large celestial body orbiting a star',
+    'GARDEN': '🌷 A plot of ground where plants are cultivated',
+    'FLOWER': '🌸 The reproductive part of a flowering plant',
+    'WINTER': '❄️ The coldest season of the year',
+
+    # Colors
+    'RED': '🔴 The color of blood or fire',
+    'BLUE': '🔵 The color of the sky or sea',
+    'GREEN': '🟢 The color of grass or leaves',
+    'BLACK': '⚫ The darkest color, opposite of white',
+    'WHITE': '⚪ The lightest color, opposite of black',
+    'PINK': '🩷 A pale red color',
+    'GOLD': '🟡 A precious yellow metal',
+
+    # Food
+    'CAKE': '🍰 A sweet dessert typically made with flour',
+    'MILK': '🥛 A white liquid produced by mammals',
+    'BREAD': '🍞 A baked food made from flour and water',
+    'RICE': '🍚 A cereal grain that is a staple food',
+    'MEAT': '🥩 Animal flesh used as food',
+    'SOUP': '🍲 A liquid dish with vegetables, meat, or fish',
+
+    # Objects
+    'BOOK': '📖 A written work consisting of pages',
+    'CHAIR': '🪑 A seat for one person with a back',
+    'DOOR': '🚪 A movable barrier used to close an entrance',
+    'LAMP': '💡 A device that produces light',
+    'DESK': '📝 A piece of furniture with a flat surface for writing',
+    'PHONE': '📞 A device used for communication',
+    'CLOCK': '🕐 A device used to tell time',
+
+    # Hard words
+    'PHILOSOPHY': '🤔 The study of fundamental questions about existence',
+    'PSYCHOLOGY': '🧠 The scientific study of mind and behavior',
+    'MATHEMATICS': '🔢 The study of numbers, quantities, and shapes',
+    'ENGINEERING': '⚙️ The application of science to design and build',
+    'ARCHITECTURE': '🏛️ The design and construction of buildings'
 }
 
-# Power-up definitions
-POWER_UPS = {
-    "time_freeze": {"name": "Time Freeze", "desc": "Pause timer for 10 seconds", "cost": 2, "icon": "⏰", "duration": 10},
-    "double_points": {"name": "Double Points", "desc": "2x points for this round", "cost": 3, "icon": "💰", "multiplier": 2},
-    "letter_reveal": {"name": "Letter Reveal", "desc": "Show 2 random letters", "cost": 2, "icon": "💡", "count": 2},
-    "word_bank": {"name": "Word Bank", "desc": "Show 3 possible answers", "cost": 4, "icon": "📝", "options": 3},
-    "shuffle_master": {"name": "Shuffle Master", "desc": "Re-scramble optimally", "cost": 1, "icon": "🔄", "uses": 1}
-}
+@st.cache_resource
+def get_static_assets():
+    """Publish content-hashed copies of assets/ once per process; returns {name: url}"""
+    output_dir = os.path.join(APP_DIR, "frontend", "assets")
+    manifest = build_assets(ASSET_SOURCE_DIR, output_dir)
+    # Component file routes serve CSS/JS with real content types and Cache-Control: public
+    assets_component = components.declare_component("assets", path=output_dir)
+    base_path = st.get_option("server.baseUrlPath").strip("/")
+    prefix = f"/{base_path}/component/" if base_path else "/component/"
+    return {name: f"{prefix}{assets_component.name}/{hashed}" for name, hashed in manifest.items()}
+
+@st.cache_resource
+def read_asset(name):
+    """Contents of a file in assets/, read once per process"""
+    with open(os.path.join(ASSET_SOURCE_DIR, name), encoding="utf-8") as fh:
+        return fh.read()
+
+@timed('inject_styles')
+def inject_styles():
+    """Apply the app stylesheet: a cacheable <link> in static mode, an inline <style> otherwise"""
+    if ASSET_MODE == 'static':
+        st.markdown(f'<link rel="stylesheet" href="{get_static_assets()["app.css"]}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{read_asset('app.css')}</style>", unsafe_allow_html=True)
 
-def add_adsense_meta_tag():
-    """Add Google AdSense account verification meta tag"""
-    meta_html = """
-    <script>
-    if (!document.querySelector('meta[name="google-adsense-account"]')) {
-        var meta = document.createElement('meta');
-        meta.name = 'google-adsense-account';
-        meta.content = 'ca-pub-2020561089374332';
-        document.head.appendChild(meta);
+@st.cache_resource
+def get_ad_config():
+    """Read AdSense settings from st.secrets once per process"""
+    try:
+        google = dict(st.secrets["google"])
+    except (FileNotFoundError, KeyError):
+        google = {}
+    return {
+        'client': google.get('adsense_client_id', DEFAULT_ADSENSE_CLIENT),
+        'slots': {ad_type: google.get(f'{ad_type}_ad_slot', DEFAULT_AD_SLOT) for ad_type in AD_UNITS}
     }
+
+@timed('load_ad_runtime')
+def load_ad_runtime():
+    """Install the page-level ad runtime once: meta tag, one adsbygoogle.js load, lazy slots"""
+    if ASSET_MODE == 'static':
+        source = f"s.src = {json.dumps(get_static_assets()['adsense.js'])};"
+    else:
+        source = f"s.textContent = {json.dumps(read_asset('adsense.js'))};"
+
+    # Identical on every rerun, so the frontend keeps this iframe instead of recreating it
+    loader_html = f"""
+    <script>
+    (function () {{
+        var doc = window.parent.document;
+        if (doc.getElementById('ws-ad-runtime')) return;
+        var s = doc.createElement('script');
+        s.id = 'ws-ad-runtime';
+        s.dataset.client = {json.dumps(get_ad_config()['client'])};
+        {source}
+        doc.head.appendChild(s);
+    }})();
     </script>
     """
-    components.html(meta_html, height=0)
+    components.html(loader_html, height=0)
 
+def ad_slot_html(ad_type):
+    """Markup for a lazy ad slot; stable across reruns so the filled ad is kept"""
+    config = get_ad_config()
+    width, height = AD_UNITS[ad_type]
+    return (f'<ins class="ws-ad" data-ws-lazy="1" style="display:inline-block;width:{width}px;height:{height}px" '
+            f'data-ad-client="{config["client"]}" data-ad-slot="{config["slots"][ad_type]}"></ins>')
+
+@timed('banner_ad')
 def show_banner_ad(ad_type="top"):
     """Display banner advertisement using Google AdSense"""
-    try:
-        adsense_client = st.secrets["google"]["adsense_client_id"]
-        ad_slot = st.secrets["google"][f"{ad_type}_ad_slot"]
-    except:
-        adsense_client = "ca-pub-2020561089374332"
-        ad_slot = "1234567890"
-
-    ad_html = f"""
+    # The slot survives reruns, so log it only when it appears on another screen. Rendering is not an
+    # impression: AdSense fills the slot lazily and it may never scroll into view
+    logged = st.session_state.ad_slots_logged
+    if logged.get(ad_type) != st.session_state.screen:
+        logged[ad_type] = st.session_state.screen
+        get_engine().log_event('ad_slot_rendered', detail=ad_type)
+    st.markdown(f"""
     <div style="text-align: center; margin: 20px 0;">
-        <script>
-        if (!document.querySelector('meta[name="google-adsense-account"]')) {{
-            var meta = document.createElement('meta');
-            meta.name = 'google-adsense-account';
-            meta.content = 'ca-pub-2020561089374332';
-            document.head.appendChild(meta);
-        }}
-        </script>
-
-        <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={adsense_client}"
-                crossorigin="anonymous"></script>
-        <ins class="adsbygoogle"
-             style="display:inline-block;width:728px;height:90px"
-             data-ad-client="{adsense_client}"
-             data-ad-slot="{ad_slot}"></ins>
-        <script>
-             (adsbygoogle = window.adsbygoogle || []).push({{}});
-        </script>
+        {ad_slot_html(ad_type)}
     </div>
-    """
-    components.html(ad_html, height=120)
+    """, unsafe_allow_html=True)
 
+@timed('rewarded_ad')
 def show_rewarded_ad(reward_type="power_up"):
     """Display rewarded advertisement"""
-    try:
-        adsense_client = st.secrets["google"]["adsense_client_id"]
-        rewarded_slot = st.secrets["google"]["rewarded_ad_slot"]
-    except:
-        adsense_client = "ca-pub-2020561089374332"
-        rewarded_slot = "1234567890"
-
     reward_messages = {
         "power_up": "🎁 Watch ad to earn a free power-up!",
         "hint": "💡 Watch ad to unlock a premium hint!",
         "xp": "⭐ Watch ad to earn bonus XP!",
         "coins": "💰 Watch ad to earn coins!"
     }
+    get_engine().log_event('ad_view', detail=f"rewarded:{reward_type}")
 
-    ad_html = f"""
+    st.markdown(f"""
     <div style="text-align: center; padding: 30px; background: #fff8dc; border: 2px solid #ffd700; border-radius: 10px;">
         <h4 style="color: #b8860b; margin-bottom: 15px;">{reward_messages.get(reward_type, "🎁 Free Reward!")}</h4>
         <p style="color: #666; margin-bottom: 20px;">Support the game and earn rewards!</p>
-
-        <script>
-        if (!document.querySelector('meta[name="google-adsense-account"]')) {{
-            var meta = document.createElement('meta');
-            meta.name = 'google-adsense-account';
-            meta.content = 'ca-pub-2020561089374332';
-            document.head.appendChild(meta);
-        }}
-        </script>
-
-        <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={adsense_client}"
-                crossorigin="anonymous"></script>
-        <ins class="adsbygoogle"
-             style="display:inline-block;width:300px;height:250px"
-             data-ad-client="{adsense_client}"
-             data-ad-slot="{rewarded_slot}"></ins>
-        <script>
-             (adsbygoogle = window.adsbygoogle || []).push({{}});
-        </script>
+        {ad_slot_html("rewarded")}
     </div>
-    """
-    components.html(ad_html, height=320)
+    """, unsafe_allow_html=True)
+
+def get_player_id():
+    """Stable player id kept in the ?player= query parameter so it survives refreshes"""
+    player_id = st.query_params.get("player")
+    # Ids are minted here; anything else in the URL would reach the profile store and the event log verbatim
+    if not player_id or not PLAYER_ID.fullmatch(player_id):
+        player_id = uuid.uuid4().hex
+        st.query_params["player"] = player_id
+    return player_id
+
+@st.cache_resource
+def get_profile_store():
+    """Open the profile database once per process; None keeps profiles session-only"""
+    try:
+        return ProfileStore(PROFILE_DB_PATH, encode=PlayerProfile.to_json, decode=PlayerProfile.from_json)
+    except sqlite3.Error as e:
+        print(f"Profile persistence disabled ({PROFILE_DB_PATH}): {e}")
+        return None
 
 def init_player_profile():
-    """Initialize comprehensive player profile"""
-    if 'player_profile' not in st.session_state:
-        st.session_state.player_profile = {
-            'level': 1,
-            'xp': 0,
-            'total_games': 0,
-            'total_words_solved': 0,
-            'total_score': 0,
-            'current_streak': 0,
-            'best_streak': 0,
-            'last_played': None,
-            'daily_streak': 0,
-            'coins': 5,  # In-game currency
-            'power_ups': {'time_freeze': 1, 'double_points': 1, 'letter_reveal': 2},
-            'achievements_unlocked': [],
-            'statistics': {
-                'games_played': 0,
-                'words_correct': 0,
-                'words_total': 0,
-                'average_time': 0,
-                'fastest_solve': float('inf'),
-                'perfect_games': 0,
-                'hints_used': 0,
-                'power_ups_used': 0
-            },
-            'preferences': {
-                'difficulty': 'medium',
-                'preferred_categories': [],
-                'auto_difficulty': True,
-                'sound_enabled': True
-            }
-        }
+    """Create the session's game engine, loading saved progress once per session"""
+    if 'engine' not in st.session_state:
+        st.session_state.player_id = get_player_id()
+        store = get_profile_store()
+        saved = store.load(st.session_state.player_id) if store is not None else None
+        # Saved profiles keep defaults for any fields added since they were written
+        st.session_state.engine = GameEngine(
+            get_word_index(),
+            anagram_index=get_anagram_index(),
+            similar_words=get_similar_words(),
+            word_ratings=get_word_ratings(),
+            difficulty_table=get_difficulty_table(),
+            event_log=get_event_log(),
+            player_id=st.session_state.player_id,
+            define=get_word_definition,
+            profile=saved or PlayerProfile()
+        )
+        memory = get_session_memory()
+        if memory is not None:
+            memory.register(get_script_run_ctx().session_id, st.session_state.engine, st.session_state.player_id)
+    elif SESSION_MEMORY:
+        touch_session()
+
+def get_engine():
+    """This session's GameEngine (player profile and current game)"""
+    engine = st.session_state.engine
+    if engine.profile is None:
+        resume_session(engine)
+    return engine
+
+def measure_session(engine):
+    """Bytes owned by one session's engine, excluding the shared word indexes"""
+    return deep_size(engine, exclude=engine.shared_objects())
+
+@st.cache_resource
+def get_session_memory():
+    """Per-process session accounting; None when disabled or profiles cannot be saved"""
+    if not SESSION_MEMORY:
+        return None
+    store = get_profile_store()
+    if store is None:
+        print("Idle-session trimming disabled: profiles are not persisted")
+        return None
+
+    def trim(player_id, engine):
+        store.save(player_id, engine.hibernate())
+
+    def after_sweep(totals):
+        try:
+            store.flush()
+        except sqlite3.Error as e:
+            print(f"Profile flush failed, will retry: {e}")
+        metrics.record_session_totals(totals)
+
+    return SessionMemory(measure_session, trim, cap_bytes=int(SESSION_MEMORY_CAP_MB * 2**20),
+                         idle_seconds=SESSION_IDLE_SECONDS, after_sweep=after_sweep)
+
+def touch_session():
+    """Mark this session active so the memory sweep leaves it alone; call before each script run uses the engine"""
+    memory = get_session_memory()
+    if memory is not None:
+        memory.touch(get_script_run_ctx().session_id)
+
+def resume_session(engine):
+    """Reload the profile of a session trimmed while idle; its unfinished game was dropped"""
+    store = get_profile_store()
+    engine.resume(store.load(st.session_state.player_id) if store is not None else None)
+    st.session_state.screen = 'home'
+    st.session_state.final_percentile = None
+
+def save_player_profile():
+    """Buffer the session's profile for the next batched write"""
+    store = get_profile_store()
+    if store is not None:
+        store.save(st.session_state.player_id, get_engine().profile)
+
+def flush_player_profiles():
+    """Write all buffered profiles; called at round and game boundaries"""
+    store = get_profile_store()
+    if store is not None:
+        try:
+            store.flush()
+        except sqlite3.Error as e:
+            print(f"Profile flush failed, will retry: {e}")
+
+@st.cache_resource
+def get_leaderboard():
+    """Load the global leaderboard (stored next to the profiles) once per process"""
+    try:
+        return LeaderboardStore(PROFILE_DB_PATH)
+    except sqlite3.Error as e:
+        print(f"Leaderboard disabled ({PROFILE_DB_PATH}): {e}")
+        return None
+
+@st.cache_resource
+def get_period_leaderboards():
+    """Load the daily/weekly leaderboards once per process"""
+    try:
+        return PeriodLeaderboards(PROFILE_DB_PATH)
+    except sqlite3.Error as e:
+        print(f"Daily/weekly leaderboards disabled ({PROFILE_DB_PATH}): {e}")
+        return None
+
+def record_leaderboard_score():
+    """Move the player to their new all-time total and add this game to the daily/weekly boards"""
+    engine = get_engine()
+    profile = engine.profile
+    player_id = st.session_state.player_id
+    try:
+        board = get_leaderboard()
+        if board is not None:
+            board.update(player_id, profile.total_score, profile.level, profile.total_games)
+        periods = get_period_leaderboards()
+        if periods is not None:
+            periods.record(player_id, engine.score, profile.level)
+    except sqlite3.Error as e:
+        print(f"Leaderboard update failed: {e}")
+
+@st.cache_resource
+def get_score_distributions():
+    """Per-mode sketches of completed-game scores, merged across worker processes"""
+    try:
+        return ScoreDistributions(PROFILE_DB_PATH)
+    except sqlite3.Error as e:
+        print(f"Score percentiles disabled ({PROFILE_DB_PATH}): {e}")
+        return None
+
+def record_score_percentile():
+    """Add this game's score to its mode's distribution and remember where it placed"""
+    st.session_state.final_percentile = None
+    distributions = get_score_distributions()
+    if distributions is None:
+        return
+    engine = get_engine()
+    mode = engine.game_mode
+    try:
+        distributions.record(mode, engine.score)
+        beaten = distributions.fraction_below(mode, engine.score)
+        if distributions.games(mode) >= PERCENTILE_MIN_GAMES:
+            st.session_state.final_percentile = beaten * 100
+    except sqlite3.Error as e:
+        print(f"Score percentile unavailable: {e}")
 
 def init_session_state():
     """Initialize all session state variables"""
     if 'initialized' not in st.session_state:
-        # Game state
+        # Screen routing; game state lives in the GameEngine
         st.session_state.screen = 'home'
-        st.session_state.game_mode = 'classic'
-        st.session_state.current_round = 1
-        st.session_state.score = 0
-        st.session_state.current_word = ''
-        st.session_state.scrambled_word = ''
-        st.session_state.current_category = ''
-        st.session_state.current_difficulty = 'medium'
-        st.session_state.round_start_time = None
-        st.session_state.hint_used = False
-        st.session_state.hints_available = {'category': True, 'definition': True, 'shuffle': True, 'reveal': True}
-        st.session_state.feedback_message = ''
-        st.session_state.feedback_type = 'info'
-        st.session_state.awaiting_next_round = False
-        st.session_state.last_update = time.time()
-        st.session_state.game_complete = False
-        st.session_state.round_results = []
-
-        # Enhanced features
-        st.session_state.active_power_ups = {}
-        st.session_state.round_multiplier = 1
-        st.session_state.time_freeze_remaining = 0
-        st.session_state.letters_revealed = []
-        st.session_state.word_bank_shown = False
-
-        # Game modes
-        st.session_state.total_rounds = GAME_CONFIG['base_rounds']
-        st.session_state.time_per_round = GAME_CONFIG['base_time_per_round']
+        # Share of this mode's games the last completed game beat, set when it ends
+        st.session_state.final_percentile = None
+        # Screen each banner slot was last logged as viewed on
+        st.session_state.ad_slots_logged = {}
 
         # Social features
         st.session_state.show_leaderboard = False
         st.session_state.leaderboard_data = []
 
-        # FIXED: Add hint display state
-        st.session_state.current_hint_text = ''
-        st.session_state.show_hint = False
+        # Set once this browser's timer component has reported back
+        st.session_state.timer_component_ready = False
 
         st.session_state.initialized = True
 
     # Always ensure player profile is initialized
     init_player_profile()
 
-def get_player_level_info():
-    """Calculate level progression info"""
-    profile = st.session_state.player_profile
-    current_level = profile['level']
-    current_xp = profile['xp']
-
-    # Calculate XP needed for current level
-    xp_for_current_level = GAME_CONFIG['level_up_base_xp'] * (current_level - 1) * 1.5
-    xp_for_next_level = GAME_CONFIG['level_up_base_xp'] * current_level * 1.5
-
-    xp_progress = current_xp - xp_for_current_level
-    xp_needed = xp_for_next_level - xp_for_current_level
-
-    progress_percentage = min(100, (xp_progress / xp_needed) * 100) if xp_needed > 0 else 100
-
-    return {
-        'current_level': current_level,
-        'xp_progress': xp_progress,
-        'xp_needed': xp_needed,
-        'progress_percentage': progress_percentage,
-        'next_level': current_level + 1
-    }
-
-def add_xp(amount, reason=""):
-    """Add XP and handle level ups"""
-    profile = st.session_state.player_profile
-    profile['xp'] += amount
-
-    # Check for level up
-    level_info = get_player_level_info()
-    if level_info['progress_percentage'] >= 100:
-        profile['level'] += 1
-        profile['coins'] += profile['level'] * 2  # Coins reward for leveling
-        st.success(f"🎉 Level Up! You're now level {profile['level']}! Earned {profile['level'] * 2} coins!")
-
-        # Check for level-based achievements
-        if profile['level'] == 10:
-            unlock_achievement('level_10')
-
-def unlock_achievement(achievement_id):
-    """Unlock an achievement and add rewards"""
-    if achievement_id not in st.session_state.player_profile['achievements_unlocked']:
-        achievement = ACHIEVEMENTS[achievement_id]
-        st.session_state.player_profile['achievements_unlocked'].append(achievement_id)
-        add_xp(achievement['xp'], f"Achievement: {achievement['name']}")
-        st.success(f"🏆 Achievement Unlocked: {achievement['icon']} {achievement['name']}!")
-
-def select_word_by_difficulty():
-    """Intelligent word selection based on player performance and preferences"""
-    profile = st.session_state.player_profile
-
-    if profile['preferences']['auto_difficulty']:
-        # AI-driven difficulty adjustment
-        accuracy = profile['statistics']['words_correct'] / max(1, profile['statistics']['words_total'])
-
-        if accuracy < 0.4:
-            difficulty = 'easy'
-        elif accuracy > 0.8:
-            difficulty = 'hard'
-        else:
-            difficulty = 'medium'
-    else:
-        difficulty = profile['preferences']['difficulty']
-
-    # Select category
-    categories = list(WORD_DATABASE[difficulty].keys())
-    if profile['preferences']['preferred_categories']:
-        available_categories = [cat for cat in profile['preferences']['preferred_categories'] 
-                              if cat in categories]
-        if available_categories:
-            categories = available_categories
-
-    category = random.choice(categories)
-    word = random.choice(WORD_DATABASE[difficulty][category])
-
-    st.session_state.current_difficulty = difficulty
-    st.session_state.current_category = category
-
-    return word, category, difficulty
-
-def scramble_word(word):
-    """Advanced word scrambling with multiple algorithms"""
-    letters = list(word)
-
-    # Different scrambling strategies for variety
-    strategies = ['random', 'vowel_separate', 'reverse_chunks']
-    strategy = random.choice(strategies)
-
-    if strategy == 'random':
-        random.shuffle(letters)
-    elif strategy == 'vowel_separate':
-        vowels = [l for l in letters if l.lower() in 'aeiou']
-        consonants = [l for l in letters if l.lower() not in 'aeiou']
-        random.shuffle(vowels)
-        random.shuffle(consonants)
-        letters = vowels + consonants
-    elif strategy == 'reverse_chunks':
-        mid = len(letters) // 2
-        letters = letters[mid:] + letters[:mid]
-        random.shuffle(letters)
-
-    scrambled = ''.join(letters)
-    return scrambled if scrambled != word else scramble_word(word)
-
-def get_hint(hint_type):
-    """FIXED: Enhanced hint system with multiple types"""
-    word = st.session_state.current_word
-    category = st.session_state.current_category
-
-    # Ensure we have valid word and category
-    if not word:
-        return "No word available for hint"
-    if not category:
-        category = "unknown"
-
+def show_events(events):
+    """Announce level-ups, achievements, power-ups and rewards, then buffer the profile"""
+    if not events:
+        return events
+    for event in events:
+        if event.message and event.kind in ('level_up', 'achievement', 'power_up', 'purchase', 'reward', 'daily_streak'):
+            st.success(event.message)
+    save_player_profile()
+    return events
+
+@st.cache_resource
+def get_word_index():
+    """Map the on-disk lexicon once per process, falling back to WORD_DATABASE"""
+    if os.path.exists(LEXICON_PATH):
+        try:
+            return MappedLexicon(LEXICON_PATH)
+        except (OSError, LexiconError) as e:
+            print(f"Ignoring lexicon {LEXICON_PATH}: {e}")
+    return WordIndex.from_database(WORD_DATABASE)
+
+@st.cache_resource
+def get_anagram_index():
+    """Build the anagram signature index over the active lexicon once per process"""
+    return AnagramIndex(get_word_index())
+
+@st.cache_resource
+def get_word_ratings():
+    """Elo ratings of the active lexicon's words, shared with other workers through the profile database"""
     try:
-        if hint_type == 'category':
-            return f"💡 Category: This is a {category.replace('_', ' ')}"
-        elif hint_type == 'definition':
-            return get_word_definition(word)
-        elif hint_type == 'shuffle':
-            new_scramble = scramble_word(word)
-            return f"🔄 Try this arrangement: {new_scramble}"
-        elif hint_type == 'reveal':
-            return get_letter_reveal_hint(word)
-        else:
-            return "Hint type not available"
-    except Exception as e:
-        return f"Error generating hint: {str(e)}"
-
-def get_word_definition(word):
+        return WordRatings(get_word_index(), PROFILE_DB_PATH, difficulty_table=get_difficulty_table())
+    except sqlite3.Error as e:
+        print(f"Word ratings kept in this process only ({PROFILE_DB_PATH}): {e}")
+        return WordRatings(get_word_index(), difficulty_table=get_difficulty_table())
+
+@st.cache_resource
+def get_event_log():
+    """Open the gameplay event log once per process; None when disabled or unwritable"""
+    if not EVENT_LOG_DIR:
+        return None
+    try:
+        return EventLog(EVENT_LOG_DIR)
+    except OSError as e:
+        print(f"Event log disabled ({EVENT_LOG_DIR}): {e}")
+        return None
+
+@st.cache_resource
+def get_difficulty_table():
+    """Load the calibrated word difficulty table once per process, if one has been built"""
+    if os.path.exists(DIFFICULTY_TABLE_PATH):
+        try:
+            return DifficultyTable(DIFFICULTY_TABLE_PATH)
+        except (OSError, ValueError, IndexError) as e:
+            print(f"Ignoring difficulty table {DIFFICULTY_TABLE_PATH}: {e}")
+    return None
+
+@st.cache_resource
+def get_similar_words():
+    """Look-alike word search for word-bank distractors, over the anagram index"""
+    return SimilarWords(get_anagram_index(), get_word_index())
+
+def get_word_definition(word, category=''):
     """FIXED: Generate contextual definitions for words"""
     if not word:
         return "💭 No word available for definition"
 
-    definitions = {
-        # Animals
-        'CAT': '🐱 A small domesticated carnivorous mammal',
-        'DOG': '🐕 A domesticated descendant of the wolf',
-        'ELEPHANT': '🐘 The largest existing land animal',
-        'GIRAFFE': '🦒 The tallest living terrestrial animal',
-        'MONKEY': '🐒 A primate mammal that is typically tree-dwelling',
-        'RABBIT': '🐰 A small mammal with long ears and a short tail',
-        'TURTLE': '🐢 A slow-moving reptile with a shell',
-        'CHICKEN': '🐔 A domestic fowl kept for eggs or meat',
-        'DOLPHIN': '🐬 An intelligent marine mammal',
-        'FISH': '🐠 An aquatic vertebrate animal',
-        'BIRD': '🐦 A warm-blooded vertebrate with feathers',
-        'BEAR': '🐻 A large heavy mammal with thick fur',
-        'LION': '🦁 A large wild cat known as king of jungle',
-        'FROG': '🐸 An amphibian that lives both in water and on land',
-        'DUCK': '🦆 A waterfowl with webbed feet',
-
-        # Technology
-        'PYTHON': '🐍 A high-level programming language',
-        'CODING': '💻 The process of creating computer software',
-        'ALGORITHM': '⚙️ A step-by-step procedure for solving problems',
-        'LAPTOP': '💻 A portable personal computer',
-        'MOBILE': '📱 A handheld wireless communication device',
-        'TABLET': '📱 A portable touchscreen computer',
-        'CAMERA': '📷 A device for capturing photographs',
-        'STREAM': '🌊 A continuous flow of data or water',
-
-        # Countries
-        'FRANCE': '🇫🇷 A country in Western Europe',
-        'BRAZIL': '🇧🇷 The largest country in South America',
-        'CANADA': '🇨🇦 A country in North America',
-        'EGYPT': '🇪🇬 A country in North Africa',
-        'JAPAN': '🇯🇵 An island nation in East Asia',
-        'RUSSIA': '🇷🇺 The largest country in the world',
-        'MEXICO': '🇲🇽 A country in North America',
-
-        # Nature
-        'FOREST': '🌲 A large area covered chiefly with trees',
-        'SUNSET': '🌅 The time when the sun disappears below the horizon',
-        'JUNGLE': '🌿 A dense tropical forest',
-        'PLANET': '🪐 A large celestial body orbiting a star',
-        'GARDEN': '🌷 A plot of ground where plants are cultivated',
-        'FLOWER': '🌸 The reproductive part of a flowering plant',
-        'WINTER': '❄️ The coldest season of the year',
-
-        # Colors
-        'RED': '🔴 The color of blood or fire',
-        'BLUE': '🔵 The color of the sky or sea',
-        'GREEN': '🟢 The color of grass or leaves',
-        'BLACK': '⚫ The darkest color, opposite of white',
-        'WHITE': '⚪ The lightest color, opposite of black',
-        'PINK': '🩷 A pale red color',
-        'GOLD': '🟡 A precious yellow metal',
-
-        # Food
-        'CAKE': '🍰 A sweet dessert typically made with flour',
-        'MILK': '🥛 A white liquid produced by mammals',
-        'BREAD': '🍞 A baked food made from flour and water',
-        'RICE': '🍚 A cereal grain that is a staple food',
-        'MEAT': '🥩 Animal flesh used as food',
-        'SOUP': '🍲 A liquid dish with vegetables, meat, or fish',
-
-        # Objects
-        'BOOK': '📖 A written work consisting of pages',
-        'CHAIR': '🪑 A seat for one person with a back',
-        'DOOR': '🚪 A movable barrier used to close an entrance',
-        'LAMP': '💡 A device that produces light',
-        'DESK': '📝 A piece of furniture with a flat surface for writing',
-        'PHONE': '📞 A device used for communication',
-        'CLOCK': '🕐 A device used to tell time',
-
-        # Hard words
-        'PHILOSOPHY': '🤔 The study of fundamental questions about existence',
-        'PSYCHOLOGY': '🧠 The scientific study of mind and behavior',
-        'MATHEMATICS': '🔢 The study of numbers, quantities, and shapes',
-        'ENGINEERING': '⚙️ The application of science to design and build',
-        'ARCHITECTURE': '🏛️ The design and construction of buildings'
-    }
-
-    # Get definition or create a generic one
-    definition = definitions.get(word, f'💭 A word related to {st.session_state.current_category.replace("_", " ")}')
+    # External store first, then the built-in table, then a generic category sentence
+    store = get_definition_store()
+    definition = store.lookup(word) if store is not None else None
+    if definition is None:
+        definition = WORD_DEFINITIONS.get(word, f'💭 A word related to {category.replace("_", " ")}')
     return definition
 
-def get_letter_reveal_hint(word):
-    """FIXED: Smart letter reveal based on difficulty"""
-    if not word:
-        return "💡 No word available for letter reveal"
-
-    try:
-        if len(word) <= 4:
-            return f"💡 First letter: {word[0]}"
-        elif len(word) <= 7:
-            return f"💡 Letters: {word[0]}_{'_' * (len(word)-2)}{word[-1]}"
-        else:
-            mid = len(word) // 2
-            return f"💡 Letters: {word[0]}_{word[mid]}_{'_' * (len(word)-3)}{word[-1]}"
-    except Exception as e:
-        return f"💡 Error revealing letters: {str(e)}"
-
-def use_power_up(power_up_type):
-    """Activate power-up effects"""
-    if power_up_type in st.session_state.player_profile['power_ups']:
-        if st.session_state.player_profile['power_ups'][power_up_type] > 0:
-            st.session_state.player_profile['power_ups'][power_up_type] -= 1
-            st.session_state.player_profile['statistics']['power_ups_used'] += 1
-
-            if power_up_type == 'time_freeze':
-                st.session_state.time_freeze_remaining = POWER_UPS['time_freeze']['duration']
-                st.success("⏰ Time frozen for 10 seconds!")
-            elif power_up_type == 'double_points':
-                st.session_state.round_multiplier = 2
-                st.success("💰 Double points activated for this round!")
-            elif power_up_type == 'letter_reveal':
-                word = st.session_state.current_word
-                available_positions = [i for i in range(len(word)) if i not in st.session_state.letters_revealed]
-                if available_positions:
-                    reveal_positions = random.sample(available_positions, min(2, len(available_positions)))
-                    st.session_state.letters_revealed.extend(reveal_positions)
-                    st.success(f"💡 Letters revealed at positions: {[p+1 for p in reveal_positions]}")
-            elif power_up_type == 'word_bank':
-                st.session_state.word_bank_shown = True
-                st.success("📝 Word bank activated!")
-            elif power_up_type == 'shuffle_master':
-                st.session_state.scrambled_word = scramble_word(st.session_state.current_word)
-                st.success("🔄 Word re-scrambled optimally!")
-
-            # Check achievement
-            if st.session_state.player_profile['statistics']['power_ups_used'] >= 10:
-                unlock_achievement('power_user')
-
-            return True
-    return False
-
-def calculate_score(time_taken, difficulty, hints_used):
-    """Advanced scoring system with multiple factors"""
-    base_points = GAME_CONFIG['base_points_per_correct']
-
-    # Difficulty multiplier
-    difficulty_multipliers = {'easy': 1.0, 'medium': 1.5, 'hard': 2.0}
-    difficulty_bonus = base_points * difficulty_multipliers[difficulty]
-
-    # Time bonus
-    time_remaining = max(0, st.session_state.time_per_round - time_taken)
-    time_bonus = int(time_remaining * GAME_CONFIG['time_bonus_multiplier'])
-
-    # Hint penalty
-    hint_penalty = hints_used * 2
-
-    # Round multiplier (power-ups)
-    multiplier = st.session_state.round_multiplier
-
-    # Streak bonus
-    streak_bonus = min(st.session_state.player_profile['current_streak'] * 2, 20)
-
-    total_score = int((difficulty_bonus + time_bonus + streak_bonus - hint_penalty) * multiplier)
-
-    return max(5, total_score)  # Minimum 5 points
-
-def start_new_round():
-    """Initialize a new game round with enhanced features"""
-    word, category, difficulty = select_word_by_difficulty()
-
-    st.session_state.current_word = word
-    st.session_state.scrambled_word = scramble_word(word)
-    st.session_state.current_category = category
-    st.session_state.current_difficulty = difficulty
-    st.session_state.round_start_time = time.time()
-    st.session_state.hint_used = False
-    st.session_state.hints_available = {'category': True, 'definition': True, 'shuffle': True, 'reveal': True}
-    st.session_state.feedback_message = ''
-    st.session_state.feedback_type = 'info'
-    st.session_state.awaiting_next_round = False
-    st.session_state.last_update = time.time()
+@st.cache_resource
+def get_definition_store():
+    """Open the external definition store once per process, if one is configured"""
+    if os.path.exists(DEFINITIONS_PATH):
+        try:
+            return DefinitionStore(DEFINITIONS_PATH)
+        except OSError as e:
+            print(f"Ignoring definitions {DEFINITIONS_PATH}: {e}")
+    return None
+
+def start_game(mode_id):
+    """Start the first round of a game mode"""
+    show_events(get_engine().start_game(mode_id))
     st.session_state.screen = 'playing'
 
-    # Reset round-specific power-up effects
-    st.session_state.round_multiplier = 1
-    st.session_state.letters_revealed = []
-    st.session_state.word_bank_shown = False
-
-    # FIXED: Reset hint display state
-    st.session_state.current_hint_text = ''
-    st.session_state.show_hint = False
-
-def process_guess(user_guess):
-    """Process user guess with comprehensive feedback"""
-    current_word = st.session_state.current_word
-    start_time = st.session_state.round_start_time
-
-    if user_guess == current_word:
-        # Correct guess
-        elapsed_time = time.time() - start_time
-        hints_used = len([h for h in st.session_state.hints_available.values() if not h])
-
-        round_score = calculate_score(elapsed_time, st.session_state.current_difficulty, hints_used)
-        st.session_state.score += round_score
-
-        # Update player statistics
-        profile = st.session_state.player_profile
-        profile['statistics']['words_correct'] += 1
-        profile['statistics']['words_total'] += 1
-        profile['current_streak'] += 1
-        profile['best_streak'] = max(profile['best_streak'], profile['current_streak'])
-
-        if elapsed_time < profile['statistics']['fastest_solve']:
-            profile['statistics']['fastest_solve'] = elapsed_time
-
-        # Store round result
-        st.session_state.round_results.append({
-            'word': current_word,
-            'time': elapsed_time,
-            'score': round_score,
-            'difficulty': st.session_state.current_difficulty,
-            'correct': True
-        })
-
-        st.session_state.feedback_message = f"🎉 Correct! '{current_word}' is right! +{round_score} points!"
-        st.session_state.feedback_type = 'success'
-        st.session_state.awaiting_next_round = True
-
-        # Check achievements
-        if elapsed_time < 10:
-            unlock_achievement('speed_demon')
-        if st.session_state.player_profile['current_streak'] >= 3:
-            unlock_achievement('streak_3')
-        if hints_used == 0 and st.session_state.current_round == st.session_state.total_rounds:
-            unlock_achievement('hint_less')
-
-        # XP reward
-        difficulty_xp = {'easy': 15, 'medium': 25, 'hard': 40}
-        add_xp(difficulty_xp[st.session_state.current_difficulty], "Correct answer")
+@st.cache_resource(max_entries=2)
+def get_daily_challenge(day):
+    """The day's challenge, built by the first session to ask for it and shared by every other"""
+    return build_daily_challenge(day, get_word_index(), get_anagram_index(), get_similar_words(),
+                                 get_word_definition)
+
+def start_daily_challenge():
+    """Start today's daily challenge, unless the player has already completed it"""
+    engine = get_engine()
+    show_events(engine.start_daily_challenge(get_daily_challenge(challenge_day())))
+    if engine.daily_challenge is not None:
+        # Persist the start day now, so a restart after seeing the answers is not ranked
+        save_player_profile()
+        flush_player_profiles()
+        st.session_state.screen = 'playing'
 
+def next_round():
+    """Enhanced round progression"""
+    engine = get_engine()
+    events = show_events(engine.next_round())
+
+    if engine.game_complete:
+        # A daily challenge finished again on the same day is not ranked
+        if all(event.data.get('ranked', True) for event in events if event.kind == 'game_complete'):
+            record_leaderboard_score()
+            record_score_percentile()
+        else:
+            st.session_state.final_percentile = None
+        st.session_state.screen = 'complete'
     else:
-        # Incorrect guess
-        st.session_state.player_profile['statistics']['words_total'] += 1
-        st.session_state.player_profile['current_streak'] = 0
-
-        st.session_state.round_results.append({
-            'word': current_word,
-            'time': time.time() - start_time,
-            'score': 0,
-            'difficulty': st.session_state.current_difficulty,
-            'correct': False
-        })
-
-        st.session_state.feedback_message = f"❌ '{user_guess}' is incorrect. The word was '{current_word}'"
-        st.session_state.feedback_type = 'error'
-        st.session_state.awaiting_next_round = True
+        st.session_state.screen = 'playing'
+
+    # Round/game boundary: write buffered profile changes in one batch
+    flush_player_profiles()
 
 def get_game_modes():
     """Define available game modes"""
-    return {
-        'classic': {
-            'name': 'Classic Mode',
-            'desc': 'Traditional 5-round word scramble',
-            'rounds': 5,
-            'time_per_round': 60,
-            'icon': '🎯'
-        },
-        'speed': {
-            'name': 'Speed Challenge',
-            'desc': '10 rounds, 30 seconds each',
-            'rounds': 10,
-            'time_per_round': 30,
-            'icon': '⚡'
-        },
-        'marathon': {
-            'name': 'Marathon Mode',
-            'desc': '20 rounds with increasing difficulty',
-            'rounds': 20,
-            'time_per_round': 45,
-            'icon': '🏃'
-        },
-        'themed': {
-            'name': 'Category Challenge',
-            'desc': 'Focus on specific word categories',
-            'rounds': 8,
-            'time_per_round': 50,
-            'icon': '📚'
-        }
-    }
+    return GAME_MODES
 
+@timed('timer_html')
 def create_auto_refresh_timer():
     """Enhanced timer with power-up effects"""
-    start_time = st.session_state.round_start_time
-    round_duration = st.session_state.time_per_round
-    time_freeze = st.session_state.time_freeze_remaining
+    engine = get_engine()
+    start_time = engine.round_start_time
+    round_duration = engine.time_per_round
+    time_freeze = engine.time_freeze_remaining
 
     timer_html = f"""
     <div id="timer-container" style="text-align: center; margin: 10px 0;">
@@ -755,213 +702,144 @@ def create_auto_refresh_timer():
     """
     return timer_html
 
-def generate_leaderboard():
-    """Generate mock leaderboard data"""
-    # In a real app, this would connect to a database
-    mock_data = [
-        {"name": "WordMaster", "score": 2450, "level": 15, "games": 127},
-        {"name": "SpeedDemon", "score": 2380, "level": 14, "games": 98},
-        {"name": "BrainPower", "score": 2220, "level": 12, "games": 156},
-        {"name": "QuickThink", "score": 2100, "level": 11, "games": 89},
-        {"name": "PuzzlePro", "score": 1980, "level": 10, "games": 143},
-        {"name": "You", "score": st.session_state.player_profile['total_score'], "level": st.session_state.player_profile['level'], "games": st.session_state.player_profile['total_games']}
-    ]
+def show_time_left():
+    """Time-left metric for the game screen header"""
+    engine = get_engine()
+    if engine.round_start_time:
+        elapsed = time.time() - engine.round_start_time
+        time_left = max(0, engine.time_per_round - elapsed)
+
+        if engine.time_freeze_remaining > 0:
+            st.metric("❄️ Time Frozen", f"{int(engine.time_freeze_remaining)}s")
+        elif time_left <= 10:
+            st.metric("⚠️ Time Left", f"{int(time_left)}s", delta="Hurry!")
+        else:
+            st.metric("⏰ Time Left", f"{int(time_left)}s")
+    else:
+        st.metric("Time Left", f"{engine.time_per_round}s")
+
+def tick_round_timer():
+    """Advance the freeze countdown and detect time-up; True when the round just ran out"""
+    return bool(show_events(get_engine().tick()))
+
+@timed('round_timer')
+def show_round_timer():
+    """Timer region re-executed on its own while a round is running"""
+    if metrics.ENABLED and get_script_run_ctx().fragment_ids_this_run:
+        metrics.count_rerun('fragment')
+    if SESSION_MEMORY:
+        touch_session()
+    if tick_round_timer():
+        # Time is up: rerun the whole page to show feedback and the next-round controls
+        if metrics.ENABLED:
+            st.session_state.metrics_trigger = 'st_rerun'
+        st.rerun()
+    show_time_left()
+
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+round_timer_fragment = _fragment(run_every=TIMER_INTERVAL)(show_round_timer) if _fragment else None
+
+_round_timer_component = components.declare_component(
+    "round_timer",
+    path=os.path.join(APP_DIR, "frontend", "round_timer")
+)
 
-    return sorted(mock_data, key=lambda x: x['score'], reverse=True)
+def handle_timer_event():
+    """on_change callback: apply time-up / freeze-end reported by the timer component"""
+    if SESSION_MEMORY and 'engine' in st.session_state:
+        # Callbacks run before main(): mark the session active before touching its engine
+        touch_session()
+    engine = get_engine()
+    event = st.session_state.get('round_timer')
+    if not event:
+        return
+    st.session_state.timer_component_ready = True
+    if metrics.ENABLED:
+        st.session_state.metrics_trigger = 'timer_component'
+    if event['round'] != engine.round_start_time or engine.awaiting_next_round:
+        return  # Stale event from a previous round
+
+    if engine.time_freeze_remaining > 0 and (event['event'] == 'freeze_end' or time.time() >= engine.freeze_until):
+        # A time_up can replace a freeze_end sent just before it, so check the freeze's own end too
+        engine.end_freeze()
+    if event['event'] == 'time_up' and engine.time_freeze_remaining <= 0:
+        # Allow for a little clock drift between browser and server
+        elapsed = time.time() - engine.round_start_time
+        if elapsed >= engine.time_per_round - 1:
+            show_events(engine.expire_round())
+
+@timed('timer_component')
+def show_timer_component():
+    """Persistent countdown that only talks to Python when time runs out or a freeze ends"""
+    engine = get_engine()
+    freeze_until = engine.freeze_until if engine.time_freeze_remaining > 0 else 0
+    _round_timer_component(
+        round_id=engine.round_start_time,
+        start_time=engine.round_start_time,
+        duration=engine.time_per_round,
+        freeze_until=freeze_until,
+        stopped=engine.awaiting_next_round,
+        acknowledged=st.session_state.timer_component_ready,
+        server_now=time.time(),
+        key='round_timer',
+        on_change=handle_timer_event,
+        default=None
+    )
+
+def timer_component_active():
+    """Whether this client's timer component reports time-up, so no server polling is needed"""
+    return TIMER_MODE == 'component' and st.session_state.timer_component_ready
+
+def use_fragment_timer():
+    """Whether the round timer runs as an isolated fragment instead of full reruns"""
+    return (TIMER_MODE in ('component', 'fragment') and round_timer_fragment is not None
+            and not timer_component_active())
+
+def generate_leaderboard(window=None):
+    """Top players plus the rows around this player, ordered by rank.
+
+    ``window`` names a daily/weekly board; None is the all-time leaderboard.
+    """
+    player_id = st.session_state.player_id
+    rows = []
+    if window is None:
+        board = get_leaderboard()
+        if board is not None:
+            board.sync()
+            rows = board.top(LEADERBOARD_TOP)
+            rows += board.around(player_id, LEADERBOARD_RADIUS)
+    else:
+        periods = get_period_leaderboards()
+        if periods is not None:
+            periods.sync()
+            rows = periods.top(window, LEADERBOARD_TOP)
+            rows += periods.around(window, player_id, LEADERBOARD_RADIUS)
+    shown = set()
+    rows = [row for row in rows if not (row['player_id'] in shown or shown.add(row['player_id']))]
+
+    for row in rows:
+        row['name'] = "You" if row['player_id'] == player_id else f"Player {row['player_id'][:6]}"
+    if all(row['player_id'] != player_id for row in rows):
+        # No completed game on the board yet
+        profile = get_engine().profile
+        rows.append({"rank": None, "player_id": player_id, "name": "You",
+                     "score": profile.total_score if window is None else 0,
+                     "level": profile.level, "games": profile.total_games if window is None else 0})
+    return rows
 
 def main():
     """Main application with all enhanced features"""
     init_session_state()
-    add_adsense_meta_tag()
+    engine = get_engine()
+    load_ad_runtime()
 
     # Enhanced CSS with proper final screen contrast
-    st.markdown("""
-    <style>
-    .main-header {
-        text-align: center;
-        padding: 25px 0;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 15px;
-        margin-bottom: 25px;
-        box-shadow: 0 8px 16px rgba(0,0,0,0.1);
-    }
-    .player-stats {
-        background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%);
-        color: white;
-        padding: 20px;
-        border-radius: 12px;
-        margin: 15px 0;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-    }
-    .power-up-card {
-        background: linear-gradient(135deg, #ff9a56 0%, #ffad56 100%);
-        color: white;
-        padding: 15px;
-        border-radius: 10px;
-        margin: 10px 0;
-        text-align: center;
-        cursor: pointer;
-        transition: transform 0.2s;
-    }
-    .power-up-card:hover {
-        transform: scale(1.05);
-    }
-    .achievement-badge {
-        background: linear-gradient(135deg, #ffd700 0%, #ffed4a 100%);
-        color: #333;
-        padding: 10px;
-        border-radius: 20px;
-        margin: 5px;
-        display: inline-block;
-        font-size: 0.9em;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .game-mode-card {
-        background: white;
-        border: 2px solid #e3f2fd;
-        border-radius: 12px;
-        padding: 20px;
-        margin: 10px 0;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-    }
-    .game-mode-card:hover {
-        border-color: #2196f3;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 16px rgba(0,0,0,0.1);
-    }
-    .scrambled-word {
-        font-size: 3.5em;
-        font-weight: bold;
-        text-align: center;
-        color: #4CAF50;
-        letter-spacing: 0.3em;
-        margin: 25px 0;
-        padding: 25px;
-        background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-        border-radius: 15px;
-        border: 3px dashed #4CAF50;
-        box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .word-reveal {
-        background: #fff3cd;
-        border: 2px solid #ffc107;
-        color: #856404;
-        padding: 10px;
-        border-radius: 8px;
-        margin: 10px 0;
-        text-align: center;
-        font-weight: bold;
-    }
-    .leaderboard-item {
-        background: white;
-        border-left: 4px solid #4CAF50;
-        padding: 15px;
-        margin: 8px 0;
-        border-radius: 0 8px 8px 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    /* FIXED: Perfect contrast for final score card */
-    .final-score-card {
-        background: #ffffff;
-        color: #1a1a1a;
-        border: 4px solid #4CAF50;
-        padding: 40px;
-        border-radius: 20px;
-        margin: 25px 0;
-        box-shadow: 0 12px 24px rgba(76, 175, 80, 0.3);
-        text-align: center;
-    }
-    .final-score-title {
-        color: #1a1a1a;
-        font-size: 2.5em;
-        font-weight: bold;
-        margin-bottom: 20px;
-    }
-    .final-score-value {
-        font-size: 4.5em;
-        color: #4CAF50;
-        font-weight: bold;
-        margin: 30px 0;
-        text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
-        padding: 20px;
-        background: #f8f9fa;
-        border-radius: 15px;
-        border: 3px solid #4CAF50;
-    }
-    .final-score-label {
-        color: #1a1a1a;
-        font-size: 1.4em;
-        font-weight: 600;
-        margin-bottom: 30px;
-    }
-    .final-score-summary {
-        background: #f8f9fa;
-        color: #1a1a1a;
-        padding: 25px;
-        border-radius: 12px;
-        margin: 25px 0;
-        border: 2px solid #e9ecef;
-    }
-    .performance-message {
-        color: #1a1a1a;
-        font-size: 1.3em;
-        font-weight: 600;
-        margin: 25px 0;
-        padding: 20px;
-        background: #e8f5e8;
-        border-radius: 12px;
-        border-left: 5px solid #4CAF50;
-    }
-    .xp-progress {
-        background: #e9ecef;
-        height: 20px;
-        border-radius: 10px;
-        overflow: hidden;
-        margin: 10px 0;
-    }
-    .xp-fill {
-        background: linear-gradient(90deg, #4CAF50, #45a049);
-        height: 100%;
-        transition: width 0.5s ease;
-        border-radius: 10px;
-    }
-    /* FIXED: Hint display styles */
-    .hint-display {
-        background: #e3f2fd;
-        color: #1565c0;
-        padding: 15px;
-        border-radius: 8px;
-        margin: 10px 0;
-        border-left: 4px solid #2196f3;
-        font-weight: 500;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    # Auto-refresh mechanism
-    if st.session_state.screen == 'playing' and st.session_state.round_start_time:
-        current_time = time.time()
-        elapsed = current_time - st.session_state.round_start_time
-
-        if current_time - st.session_state.last_update >= 2.0:
-            st.session_state.last_update = current_time
-
-            # Handle time freeze
-            if st.session_state.time_freeze_remaining > 0:
-                st.session_state.time_freeze_remaining = max(0, st.session_state.time_freeze_remaining - 2)
-            else:
-                if elapsed >= st.session_state.time_per_round and not st.session_state.awaiting_next_round:
-                    st.session_state.feedback_message = f"⏰ Time's up! The word was '{st.session_state.current_word}'"
-                    st.session_state.feedback_type = 'error'
-                    st.session_state.awaiting_next_round = True
-
-                    # Record as incorrect
-                    st.session_state.player_profile['statistics']['words_total'] += 1
-                    st.session_state.player_profile['current_streak'] = 0
+    inject_styles()
 
+    # Auto-refresh mechanism (the fragment timer and timer component handle this without full reruns)
+    if not use_fragment_timer() and not timer_component_active() and st.session_state.screen == 'playing' and engine.round_start_time:
+        if time.time() - engine.last_update >= 2.0:
+            tick_round_timer()
             st.rerun()
 
     # Top banner advertisement
@@ -979,39 +857,39 @@ def main():
 
     # Player stats header
     if st.session_state.screen != 'home':
-        profile = st.session_state.player_profile
-        level_info = get_player_level_info()
+        profile = engine.profile
+        level_info = engine.level_info()
 
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             st.markdown(f"""
             <div class="player-stats">
-                <div style="font-size: 1.2em; font-weight: bold;">🏆 Level {profile['level']}</div>
-                <div style="font-size: 0.9em; opacity: 0.9;">XP: {profile['xp']}</div>
+                <div style="font-size: 1.2em; font-weight: bold;">🏆 Level {profile.level}</div>
+                <div style="font-size: 0.9em; opacity: 0.9;">XP: {profile.xp}</div>
             </div>
             """, unsafe_allow_html=True)
 
         with col2:
             st.markdown(f"""
             <div class="player-stats">
-                <div style="font-size: 1.2em; font-weight: bold;">💰 {profile['coins']} Coins</div>
-                <div style="font-size: 0.9em; opacity: 0.9;">Total Score: {profile['total_score']}</div>
+                <div style="font-size: 1.2em; font-weight: bold;">💰 {profile.coins} Coins</div>
+                <div style="font-size: 0.9em; opacity: 0.9;">Total Score: {profile.total_score}</div>
             </div>
             """, unsafe_allow_html=True)
 
         with col3:
             st.markdown(f"""
             <div class="player-stats">
-                <div style="font-size: 1.2em; font-weight: bold;">🔥 {profile['current_streak']} Streak</div>
-                <div style="font-size: 0.9em; opacity: 0.9;">Best: {profile['best_streak']}</div>
+                <div style="font-size: 1.2em; font-weight: bold;">🔥 {profile.current_streak} Streak</div>
+                <div style="font-size: 0.9em; opacity: 0.9;">Best: {profile.best_streak}</div>
             </div>
             """, unsafe_allow_html=True)
 
         with col4:
             st.markdown(f"""
             <div class="player-stats">
-                <div style="font-size: 1.2em; font-weight: bold;">📊 {len(profile['achievements_unlocked'])} Badges</div>
-                <div style="font-size: 0.9em; opacity: 0.9;">Games: {profile['total_games']}</div>
+                <div style="font-size: 1.2em; font-weight: bold;">📊 {len(profile.achievements_unlocked)} Badges</div>
+                <div style="font-size: 0.9em; opacity: 0.9;">Games: {profile.total_games}</div>
             </div>
             """, unsafe_allow_html=True)
 
@@ -1040,20 +918,23 @@ def main():
         show_achievements_screen()
     elif st.session_state.screen == 'shop':
         show_shop_screen()
+    elif st.session_state.screen == 'analytics' and ANALYTICS_DASHBOARD:
+        show_analytics_screen()
 
     # Footer advertisement
     st.markdown("---")
     show_banner_ad("footer")
 
+@timed('screen.home')
 def show_home_screen():
     """Enhanced home screen with all features"""
     st.markdown("### 🎮 Welcome to Word Scramble Mini Pro!")
 
     # Recent achievements
-    profile = st.session_state.player_profile
-    if profile['achievements_unlocked']:
+    profile = get_engine().profile
+    if profile.achievements_unlocked:
         st.markdown("#### 🏆 Recent Achievements")
-        recent_achievements = profile['achievements_unlocked'][-3:]
+        recent_achievements = profile.achievements_unlocked[-3:]
         cols = st.columns(len(recent_achievements))
         for i, achievement_id in enumerate(recent_achievements):
             achievement = ACHIEVEMENTS[achievement_id]
@@ -1098,12 +979,40 @@ def show_home_screen():
         if st.button("⚙️ Settings", use_container_width=True):
             show_settings_modal()
 
+    if ANALYTICS_DASHBOARD and get_analytics() is not None:
+        if st.button("📈 Analytics", use_container_width=True):
+            st.session_state.screen = 'analytics'
+            st.rerun()
+
+@timed('screen.mode_select')
 def show_mode_selection_screen():
     """Game mode selection with detailed info"""
     st.markdown("### 🎮 Select Game Mode")
 
     game_modes = get_game_modes()
 
+    # Daily challenge: played once per day, counting toward the daily streak
+    profile = get_engine().profile
+    played_today = profile.last_played == challenge_day()
+    started_today = profile.daily_started == challenge_day()
+    streak = f"🔥 {profile.daily_streak}-day streak" if profile.daily_streak else "Start a streak today"
+    st.markdown(f"""
+    <div class="game-mode-card">
+        <h4 style="margin: 0; color: #2c3e50;">{DAILY_MODE['icon']} {DAILY_MODE['name']}</h4>
+        <p style="margin: 5px 0; color: #7f8c8d;">{DAILY_MODE['desc']}</p>
+        <small style="color: #95a5a6;">{DAILY_MODE['time_per_round']}s per round • {streak}</small>
+    </div>
+    """, unsafe_allow_html=True)
+    if played_today:
+        label = "✅ Completed today — come back tomorrow"
+    elif started_today:
+        label = f"Replay {DAILY_MODE['name']} (not ranked)"
+    else:
+        label = f"Play {DAILY_MODE['name']}"
+    if st.button(label, key="play_daily", disabled=played_today, use_container_width=True):
+        start_daily_challenge()
+        st.rerun()
+
     for mode_id, mode_info in game_modes.items():
         with st.container():
             st.markdown(f"""
@@ -1121,44 +1030,37 @@ def show_mode_selection_screen():
             """, unsafe_allow_html=True)
 
             if st.button(f"Play {mode_info['name']}", key=f"play_{mode_id}", use_container_width=True):
-                st.session_state.game_mode = mode_id
-                st.session_state.total_rounds = mode_info['rounds']
-                st.session_state.time_per_round = mode_info['time_per_round']
-                start_new_round()
+                start_game(mode_id)
                 st.rerun()
 
     if st.button("🏠 Back to Home", use_container_width=True):
         st.session_state.screen = 'home'
         st.rerun()
 
+@timed('screen.playing')
 def show_enhanced_game_screen():
     """FIXED: Enhanced gameplay screen with working hint system"""
+    engine = get_engine()
     # Game stats with power-up indicators
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Round", f"{st.session_state.current_round}/{st.session_state.total_rounds}")
+        st.metric("Round", f"{engine.current_round}/{engine.total_rounds}")
     with col2:
-        multiplier_text = f" (×{st.session_state.round_multiplier})" if st.session_state.round_multiplier > 1 else ""
-        st.metric("Score", f"{st.session_state.score}{multiplier_text}")
+        multiplier_text = f" (×{engine.round_multiplier})" if engine.round_multiplier > 1 else ""
+        st.metric("Score", f"{engine.score}{multiplier_text}")
     with col3:
-        if st.session_state.round_start_time:
-            elapsed = time.time() - st.session_state.round_start_time
-            time_left = max(0, st.session_state.time_per_round - elapsed)
-
-            if st.session_state.time_freeze_remaining > 0:
-                st.metric("❄️ Time Frozen", f"{int(st.session_state.time_freeze_remaining)}s")
-            elif time_left <= 10:
-                st.metric("⚠️ Time Left", f"{int(time_left)}s", delta="Hurry!")
-            else:
-                st.metric("⏰ Time Left", f"{int(time_left)}s")
+        if use_fragment_timer() and engine.round_start_time and not engine.awaiting_next_round:
+            round_timer_fragment()
         else:
-            st.metric("Time Left", f"{st.session_state.time_per_round}s")
+            show_time_left()
     with col4:
         difficulty_colors = {'easy': '🟢', 'medium': '🟡', 'hard': '🔴'}
-        st.metric("Difficulty", f"{difficulty_colors.get(st.session_state.current_difficulty, '⚪')} {st.session_state.current_difficulty.title()}")
+        st.metric("Difficulty", f"{difficulty_colors.get(engine.current_difficulty, '⚪')} {engine.current_difficulty.title()}")
 
     # Auto-updating visual timer
-    if st.session_state.round_start_time and not st.session_state.awaiting_next_round:
+    if TIMER_MODE == 'component' and engine.round_start_time:
+        show_timer_component()
+    elif engine.round_start_time and not engine.awaiting_next_round:
         timer_html = create_auto_refresh_timer()
         components.html(timer_html, height=120)
 
@@ -1168,11 +1070,11 @@ def show_enhanced_game_screen():
 
     for i, (power_id, power_info) in enumerate(POWER_UPS.items()):
         with power_up_cols[i]:
-            available = st.session_state.player_profile['power_ups'].get(power_id, 0)
-            if available > 0 and not st.session_state.awaiting_next_round:
+            available = engine.profile.power_ups.get(power_id, 0)
+            if available > 0 and not engine.awaiting_next_round:
                 if st.button(f"{power_info['icon']} {power_info['name']} ({available})", 
                            key=f"power_{power_id}", use_container_width=True):
-                    use_power_up(power_id)
+                    show_events(engine.use_power_up(power_id))
                     st.rerun()
             else:
                 st.markdown(f"""
@@ -1182,12 +1084,12 @@ def show_enhanced_game_screen():
                 """, unsafe_allow_html=True)
 
     # Enhanced word display with letter reveals
-    word_display = st.session_state.scrambled_word
-    if st.session_state.letters_revealed:
+    word_display = engine.scrambled_word
+    if engine.letters_revealed:
         word_list = list(word_display)
-        for pos in st.session_state.letters_revealed:
+        for pos in engine.letters_revealed:
             if pos < len(word_list):
-                word_list[pos] = f"<span style='color: #e74c3c; background: #ffebee; padding: 2px 4px; border-radius: 3px;'>{st.session_state.current_word[pos]}</span>"
+                word_list[pos] = f"<span style='color: #e74c3c; background: #ffebee; padding: 2px 4px; border-radius: 3px;'>{engine.current_word[pos]}</span>"
         word_display = "".join(word_list)
 
     st.markdown(f"""
@@ -1197,11 +1099,8 @@ def show_enhanced_game_screen():
     """, unsafe_allow_html=True)
 
     # Word bank (if power-up is active)
-    if st.session_state.word_bank_shown:
-        word = st.session_state.current_word
-        fake_words = generate_fake_words(word, 2)
-        options = [word] + fake_words
-        random.shuffle(options)
+    if engine.word_bank_shown:
+        options = engine.word_bank_options
 
         st.markdown("""
         <div class="word-reveal">
@@ -1213,18 +1112,18 @@ def show_enhanced_game_screen():
         for i, option in enumerate(options):
             with bank_cols[i]:
                 if st.button(option, key=f"bank_{i}", use_container_width=True):
-                    process_guess(option)
+                    show_events(engine.process_guess(option))
                     st.rerun()
 
     # FIXED: Working hint system
-    if not st.session_state.awaiting_next_round and not st.session_state.word_bank_shown:
+    if not engine.awaiting_next_round and not engine.word_bank_shown:
         st.markdown("#### 💡 Hints Available")
 
         # Display current hint if one is active
-        if st.session_state.show_hint and st.session_state.current_hint_text:
+        if engine.show_hint and engine.current_hint_text:
             st.markdown(f"""
             <div class="hint-display">
-                {st.session_state.current_hint_text}
+                {engine.current_hint_text}
             </div>
             """, unsafe_allow_html=True)
 
@@ -1239,14 +1138,10 @@ def show_enhanced_game_screen():
 
         for i, (hint_id, (icon, name)) in enumerate(hint_types.items()):
             with hint_cols[i]:
-                if st.session_state.hints_available.get(hint_id, True):
+                if engine.hints_available.get(hint_id, True):
                     if st.button(f"{icon} {name}", key=f"hint_{hint_id}", use_container_width=True):
                         # Generate and display hint
-                        hint_text = get_hint(hint_id)
-                        st.session_state.current_hint_text = hint_text
-                        st.session_state.show_hint = True
-                        st.session_state.hints_available[hint_id] = False
-                        st.session_state.player_profile['statistics']['hints_used'] += 1
+                        show_events(engine.use_hint(hint_id))
                         st.rerun()
                 else:
                     st.markdown(f"""
@@ -1256,14 +1151,14 @@ def show_enhanced_game_screen():
                     """, unsafe_allow_html=True)
 
     # Show feedback
-    if st.session_state.feedback_message:
-        if st.session_state.feedback_type == 'success':
-            st.success(st.session_state.feedback_message)
-        elif st.session_state.feedback_type == 'error':
-            st.error(st.session_state.feedback_message)
+    if engine.feedback_message:
+        if engine.feedback_type == 'success':
+            st.success(engine.feedback_message)
+        elif engine.feedback_type == 'error':
+            st.error(engine.feedback_message)
 
     # User input form
-    if not st.session_state.awaiting_next_round:
+    if not engine.awaiting_next_round:
         with st.form(key="guess_form", clear_on_submit=True):
             user_guess = st.text_input(
                 "Your guess:", 
@@ -1281,25 +1176,19 @@ def show_enhanced_game_screen():
 
         if submit_guess:
             if user_guess.strip():
-                process_guess(user_guess.strip().upper())
+                show_events(engine.process_guess(user_guess.strip().upper()))
                 st.rerun()
             else:
                 st.warning("Please enter a word!")
 
         if skip_round:
-            process_guess("__SKIP__")  # Process as incorrect
+            show_events(engine.process_guess(SKIP_GUESS))  # Process as incorrect
             st.rerun()
 
         if watch_ad:
             show_rewarded_ad("hint")
             # Grant a free hint
-            available_hints = [k for k, v in st.session_state.hints_available.items() if v]
-            if available_hints:
-                hint_id = random.choice(available_hints)
-                hint_text = get_hint(hint_id)
-                st.session_state.current_hint_text = f"🎁 Free hint: {hint_text}"
-                st.session_state.show_hint = True
-                st.session_state.hints_available[hint_id] = False
+            if show_events(engine.use_free_hint()):
                 st.rerun()
     else:
         # Show next round button
@@ -1312,55 +1201,22 @@ def show_enhanced_game_screen():
             if st.button("📺 Earn Power-up", use_container_width=True):
                 show_rewarded_ad("power_up")
                 # Grant random power-up
-                power_up = random.choice(list(POWER_UPS.keys()))
-                st.session_state.player_profile['power_ups'][power_up] = st.session_state.player_profile['power_ups'].get(power_up, 0) + 1
-                st.success(f"🎁 Earned {POWER_UPS[power_up]['name']}!")
+                show_events(engine.grant_random_power_up())
                 st.rerun()
 
-def next_round():
-    """Enhanced round progression"""
-    st.session_state.current_round += 1
-    st.session_state.feedback_message = ''
-    st.session_state.awaiting_next_round = False
-
-    if st.session_state.current_round <= st.session_state.total_rounds:
-        start_new_round()
-    else:
-        # Game complete
-        profile = st.session_state.player_profile
-        profile['total_games'] += 1
-        profile['total_score'] += st.session_state.score
-
-        # Check for perfect game
-        all_correct = all(r['correct'] for r in st.session_state.round_results)
-        if all_correct:
-            unlock_achievement('perfect_game')
-            profile['statistics']['perfect_games'] += 1
-
-        # Check first game
-        if profile['total_games'] == 1:
-            unlock_achievement('first_game')
-
-        # Check word master (100 words)
-        if profile['statistics']['words_correct'] >= 100:
-            unlock_achievement('word_master')
-
-        # Add game completion XP
-        add_xp(GAME_CONFIG['xp_per_game'], "Game completed")
-
-        st.session_state.screen = 'complete'
-
+@timed('screen.complete')
 def show_enhanced_final_screen():
     """Enhanced final screen with proper HTML rendering and contrast"""
-    profile = st.session_state.player_profile
-    results = st.session_state.round_results
+    engine = get_engine()
+    profile = engine.profile
+    results = engine.round_results
 
     # Calculate stats
-    correct_answers = sum(1 for r in results if r['correct'])
+    correct_answers = results.correct_count()
     total_rounds = len(results)
-    average_time = sum(r['time'] for r in results) / len(results) if results else 0
-    best_time = min(r['time'] for r in results) if results else 0
-    total_xp_earned = GAME_CONFIG['xp_per_game'] + sum(25 for r in results if r['correct'])
+    average_time = results.average_time()
+    best_time = results.best_time()
+    total_xp_earned = GAME_CONFIG['xp_per_game'] + 25 * correct_answers
 
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
@@ -1371,7 +1227,7 @@ def show_enhanced_final_screen():
         st.markdown('<div class="final-score-title">🎮 Game Complete!</div>', unsafe_allow_html=True)
 
         # Score Display
-        st.markdown(f'<div class="final-score-value">{st.session_state.score}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="final-score-value">{engine.score}</div>', unsafe_allow_html=True)
         st.markdown('<div class="final-score-label">Final Score</div>', unsafe_allow_html=True)
 
         # Round Summary - Using proper Streamlit container instead of HTML
@@ -1389,8 +1245,17 @@ def show_enhanced_final_screen():
 
         st.markdown('</div>', unsafe_allow_html=True)
 
+        # Percentile among all completed games in this mode
+        if st.session_state.final_percentile is not None:
+            beaten = st.session_state.final_percentile
+            mode_name = {**get_game_modes(), 'daily': DAILY_MODE}.get(engine.game_mode, {}).get('name', engine.game_mode)
+            if beaten >= 50:
+                st.markdown(f"**🏅 Top {max(1, math.ceil(100 - beaten))}%** of {mode_name} games")
+            else:
+                st.markdown(f"You beat **{beaten:.0f}%** of {mode_name} games")
+
         # Performance Message
-        performance_msg = get_performance_message_enhanced(st.session_state.score, results)
+        performance_msg = get_performance_message_enhanced(engine.score, results)
         st.markdown(f'<div class="performance-message">{performance_msg}</div>', unsafe_allow_html=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
@@ -1413,14 +1278,30 @@ def show_enhanced_final_screen():
             st.session_state.screen = 'home'
             st.rerun()
 
+@timed('screen.leaderboard')
 def show_leaderboard_screen():
     """Enhanced leaderboard with rankings"""
     st.markdown("### 🏆 Global Leaderboard")
 
-    leaderboard = generate_leaderboard()
-
-    for i, player in enumerate(leaderboard, 1):
-        rank_icon = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+    period = st.radio("Period", list(LEADERBOARD_PERIODS), horizontal=True, label_visibility="collapsed")
+    window = LEADERBOARD_PERIODS[period]
+    leaderboard = generate_leaderboard(window)
+    if window is None:
+        board = get_leaderboard()
+        ranked = len(board) if board is not None else None
+    else:
+        periods = get_period_leaderboards()
+        ranked = periods.size(window) if periods is not None else None
+    if ranked is not None:
+        st.caption(f"{ranked:,} players ranked")
+
+    previous_rank = 0
+    for player in leaderboard:
+        i = player['rank']
+        if i is None or i > previous_rank + 1:
+            st.markdown('<div style="text-align: center; color: #999;">⋯</div>', unsafe_allow_html=True)
+        previous_rank = i or previous_rank
+        rank_icon = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}." if i else "Unranked"
         player_class = "background: linear-gradient(135deg, #ffd700, #ffed4a);" if player['name'] == 'You' else ""
 
         st.markdown(f"""
@@ -1443,12 +1324,13 @@ def show_leaderboard_screen():
         st.session_state.screen = 'home'
         st.rerun()
 
+@timed('screen.achievements')
 def show_achievements_screen():
     """Comprehensive achievements display"""
     st.markdown("### 🏅 Achievements")
 
-    profile = st.session_state.player_profile
-    unlocked = profile['achievements_unlocked']
+    profile = get_engine().profile
+    unlocked = profile.achievements_unlocked
 
     # Progress summary
     st.markdown(f"**Progress: {len(unlocked)}/{len(ACHIEVEMENTS)} achievements unlocked**")
@@ -1481,37 +1363,18 @@ def show_achievements_screen():
         st.session_state.screen = 'home'
         st.rerun()
 
+@timed('screen.shop')
 def show_shop_screen():
     """Power-up shop with coin system"""
     st.markdown("### 🛒 Power-up Shop")
 
-    profile = st.session_state.player_profile
-    st.markdown(f"**Your Coins: 💰 {profile['coins']}**")
+    engine = get_engine()
+    profile = engine.profile
+    st.markdown(f"**Your Coins: 💰 {profile.coins}**")
 
     # Power-up packages
-    shop_items = {
-        'power_pack_small': {
-            'name': 'Starter Pack',
-            'desc': '2 Time Freeze + 1 Double Points',
-            'cost': 5,
-            'items': {'time_freeze': 2, 'double_points': 1}
-        },
-        'power_pack_medium': {
-            'name': 'Pro Pack', 
-            'desc': '3 Letter Reveals + 2 Word Banks',
-            'cost': 8,
-            'items': {'letter_reveal': 3, 'word_bank': 2}
-        },
-        'power_pack_large': {
-            'name': 'Ultimate Pack',
-            'desc': 'All power-ups bundle',
-            'cost': 12,
-            'items': {'time_freeze': 2, 'double_points': 2, 'letter_reveal': 3, 'word_bank': 2, 'shuffle_master': 5}
-        }
-    }
-
-    for item_id, item_info in shop_items.items():
-        can_afford = profile['coins'] >= item_info['cost']
+    for item_id, item_info in SHOP_ITEMS.items():
+        can_afford = profile.coins >= item_info['cost']
 
         st.markdown(f"""
         <div style="background: {'white' if can_afford else '#f8f9fa'}; border: 2px solid {'#4CAF50' if can_afford else '#e9ecef'}; border-radius: 10px; padding: 20px; margin: 15px 0;">
@@ -1533,13 +1396,10 @@ def show_shop_screen():
         if can_afford:
             if st.button(f"Buy {item_info['name']}", key=f"buy_{item_id}", type="primary", use_container_width=True):
                 # Purchase item
-                profile['coins'] -= item_info['cost']
-                for power_id, amount in item_info['items'].items():
-                    profile['power_ups'][power_id] = profile['power_ups'].get(power_id, 0) + amount
-                st.success(f"✅ Purchased {item_info['name']}!")
+                show_events(engine.purchase(item_id))
                 st.rerun()
         else:
-            st.button(f"Need {item_info['cost'] - profile['coins']} more coins", disabled=True, use_container_width=True)
+            st.button(f"Need {item_info['cost'] - profile.coins} more coins", disabled=True, use_container_width=True)
 
     st.markdown("---")
     st.markdown("#### 💰 Earn More Coins")
@@ -1548,8 +1408,7 @@ def show_shop_screen():
     with col1:
         if st.button("📺 Watch Ad (+3 coins)", use_container_width=True):
             show_rewarded_ad("coins")
-            profile['coins'] += 3
-            st.success("🎁 Earned 3 coins!")
+            show_events(engine.earn_coins(3))
             st.rerun()
 
     with col2:
@@ -1564,33 +1423,84 @@ def show_shop_screen():
         st.session_state.screen = 'home'
         st.rerun()
 
-def generate_fake_words(real_word, count):
-    """Generate fake words for word bank power-up"""
-    # Simple fake word generation
-    letters = list(real_word)
-    fakes = []
-
-    for _ in range(count):
-        fake_letters = letters.copy()
-        # Add/remove/change letters slightly
-        if len(fake_letters) > 4:
-            fake_letters.pop(random.randint(0, len(fake_letters)-1))
-        if len(fake_letters) < 8:
-            fake_letters.insert(random.randint(0, len(fake_letters)), random.choice('AEIOU'))
-
-        random.shuffle(fake_letters)
-        fake_word = ''.join(fake_letters)
-        if fake_word != real_word and fake_word not in fakes:
-            fakes.append(fake_word)
-        else:
-            fakes.append(''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=len(real_word))))
+@st.cache_resource(max_entries=1)
+def load_analytics(modified):
+    """Parse the analytics summaries; cached until ``modified`` (their mtime) changes"""
+    return analytics.load_summaries(ANALYTICS_DIR)
 
-    return fakes
+def get_analytics():
+    """(daily rows, session rows) from the latest `analytics.py run`, or None before the first"""
+    try:
+        modified = os.path.getmtime(os.path.join(ANALYTICS_DIR, "sessions.tsv"))
+    except OSError:
+        return None
+    return load_analytics(modified)
+
+@timed('screen.analytics')
+def show_analytics_screen():
+    """Dashboard over the pre-aggregated daily metrics; never reads the event log itself"""
+    st.markdown("### 📈 Analytics")
+    summaries = get_analytics()
+    if summaries is None:
+        st.info("No analytics yet. Run `python analytics.py run events/ -o analytics/`.")
+        daily, sessions = [], []
+    else:
+        daily, sessions = summaries
+
+    col1, col2 = st.columns(2)
+    with col1:
+        mode = st.selectbox("Game mode", ["All"] + sorted({row['mode'] for row in daily}))
+    with col2:
+        difficulty = st.selectbox("Difficulty", ["All"] + sorted({row['difficulty'] for row in daily}))
+    by_day = {}
+    for row in daily:
+        if mode in ("All", row['mode']) and difficulty in ("All", row['difficulty']):
+            totals = by_day.setdefault(row['day'], dict.fromkeys(analytics.COUNTERS, 0))
+            for name in analytics.COUNTERS:
+                totals[name] += row[name]
+    overall = {name: sum(totals[name] for totals in by_day.values()) for name in analytics.COUNTERS}
+
+    def rate(numerator, denominator):
+        return numerator / denominator if denominator else 0.0
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Game Completion", f"{rate(overall['games_completed'], overall['games_started']) * 100:.1f}%")
+    col2.metric("Rewarded Ads / Banner Slots", f"{rate(overall['rewarded_ads'], overall['ad_slots_rendered']) * 100:.2f}%",
+                help="Banner slots rendered, not impressions: a slot may never scroll into view")
+    col3.metric("Hints per Round", f"{rate(overall['hints'] + overall['free_hints'], overall['rounds']):.2f}")
+    if sessions:
+        col4.metric("Median Session", f"{sessions[-1]['median_seconds'] / 60:.1f} min", help=f"On {sessions[-1]['day']}")
+
+    if by_day:
+        days = sorted(by_day)
+        st.markdown("#### Per day")
+        st.line_chart({
+            "day": days,
+            "completion rate": [rate(by_day[d]['games_completed'], by_day[d]['games_started']) for d in days],
+            "solve rate": [rate(by_day[d]['solved'], by_day[d]['rounds']) for d in days],
+        }, x="day")
+        st.markdown("#### Hint usage")
+        st.bar_chart({"hint": list(analytics.HINT_TYPES),
+                      "uses": [overall[f"hint_{hint}"] for hint in analytics.HINT_TYPES]}, x="hint")
+        st.table([{"day": d, "games": by_day[d]['games_started'], "completed": by_day[d]['games_completed'],
+                   "rounds": by_day[d]['rounds'], "solved": by_day[d]['solved'], "skipped": by_day[d]['skipped'],
+                   "timed out": by_day[d]['timed_out'], "hints": by_day[d]['hints'],
+                   "banner slots": by_day[d]['ad_slots_rendered'], "rewarded ads": by_day[d]['rewarded_ads']}
+                  for d in reversed(days)])
+    if sessions:
+        st.markdown("#### Sessions")
+        st.table([{"day": row['day'], "sessions": row['sessions'], "players": row['players'],
+                   "median min": f"{row['median_seconds'] / 60:.1f}", "mean min": f"{row['mean_seconds'] / 60:.1f}",
+                   "p90 min": f"{row['p90_seconds'] / 60:.1f}"} for row in reversed(sessions)])
+
+    if st.button("🏠 Back to Home", use_container_width=True):
+        st.session_state.screen = 'home'
+        st.rerun()
 
 def get_performance_message_enhanced(score, results):
     """Enhanced performance feedback"""
-    accuracy = sum(1 for r in results if r['correct']) / len(results)
-    avg_time = sum(r['time'] for r in results) / len(results)
+    accuracy = results.accuracy()
+    avg_time = results.average_time()
 
     if accuracy == 1.0:
         return "🏆 Perfect Game! You're a true word master!"
@@ -1605,79 +1515,122 @@ def get_performance_message_enhanced(score, results):
 
 def share_score():
     """Social sharing functionality"""
-    profile = st.session_state.player_profile
-    score_text = f"I just scored {st.session_state.score} points in Word Scramble Mini Pro! 🎯 Level {profile['level']} with {len(profile['achievements_unlocked'])} achievements! Can you beat my score?"
+    engine = get_engine()
+    profile = engine.profile
+    score_text = f"I just scored {engine.score} points in Word Scramble Mini Pro! 🎯 Level {profile.level} with {len(profile.achievements_unlocked)} achievements! Can you beat my score?"
 
     st.info(f"Share this: {score_text}")
-    unlock_achievement('social_butterfly')
+    show_events(engine.share_score())
 
 def show_statistics_modal():
     """Display detailed player statistics"""
-    profile = st.session_state.player_profile
-    stats = profile['statistics']
+    profile = get_engine().profile
+    stats = profile.statistics
 
     with st.expander("📊 Detailed Statistics", expanded=True):
         col1, col2 = st.columns(2)
 
         with col1:
-            st.metric("Games Played", stats['games_played'])
-            st.metric("Words Solved", stats['words_correct'])
-            st.metric("Accuracy", f"{(stats['words_correct']/max(1, stats['words_total'])*100):.1f}%")
-            st.metric("Perfect Games", stats['perfect_games'])
+            st.metric("Games Played", stats.games_played)
+            st.metric("Words Solved", stats.words_correct)
+            st.metric("Accuracy", f"{stats.accuracy * 100:.1f}%")
+            st.metric("Perfect Games", stats.perfect_games)
+            st.metric("Skill Rating", f"{profile.rating:.0f}")
 
         with col2:
-            st.metric("Current Streak", profile['current_streak'])
-            st.metric("Best Streak", profile['best_streak'])
-            st.metric("Fastest Solve", f"{stats['fastest_solve']:.1f}s" if stats['fastest_solve'] != float('inf') else "N/A")
-            st.metric("Hints Used", stats['hints_used'])
+            st.metric("Current Streak", profile.current_streak)
+            st.metric("Best Streak", profile.best_streak)
+            st.metric("Fastest Solve", f"{stats.fastest_solve:.1f}s" if stats.fastest_solve != float('inf') else "N/A")
+            st.metric("Hints Used", stats.hints_used)
 
 def show_settings_modal():
     """Game settings and preferences"""
-    profile = st.session_state.player_profile
-    prefs = profile['preferences']
+    profile = get_engine().profile
+    prefs = profile.preferences
 
     with st.expander("⚙️ Game Settings", expanded=True):
         # Difficulty preference
         difficulty = st.selectbox(
             "Preferred Difficulty",
             ['easy', 'medium', 'hard'],
-            index=['easy', 'medium', 'hard'].index(prefs['difficulty'])
+            index=['easy', 'medium', 'hard'].index(prefs.difficulty)
         )
-        prefs['difficulty'] = difficulty
+        prefs.difficulty = difficulty
 
         # Auto-difficulty
-        auto_diff = st.checkbox("Auto-adjust difficulty", value=prefs['auto_difficulty'])
-        prefs['auto_difficulty'] = auto_diff
+        auto_diff = st.checkbox("Auto-adjust difficulty", value=prefs.auto_difficulty)
+        prefs.auto_difficulty = auto_diff
 
         # Sound (placeholder)
-        sound = st.checkbox("Sound Effects", value=prefs['sound_enabled'])
-        prefs['sound_enabled'] = sound
+        sound = st.checkbox("Sound Effects", value=prefs.sound_enabled)
+        prefs.sound_enabled = sound
 
         if st.button("Save Settings"):
+            save_player_profile()
             st.success("Settings saved!")
 
 def reset_game():
     """Reset game state for new game"""
     st.session_state.screen = 'home'
-    st.session_state.current_round = 1
-    st.session_state.score = 0
-    st.session_state.current_word = ''
-    st.session_state.scrambled_word = ''
-    st.session_state.round_start_time = None
-    st.session_state.hint_used = False
-    st.session_state.hints_available = {'category': True, 'definition': True, 'shuffle': True, 'reveal': True}
-    st.session_state.feedback_message = ''
-    st.session_state.feedback_type = 'info'
-    st.session_state.awaiting_next_round = False
-    st.session_state.game_complete = False
-    st.session_state.round_results = []
-    st.session_state.active_power_ups = {}
-    st.session_state.round_multiplier = 1
-    st.session_state.time_freeze_remaining = 0
-    st.session_state.letters_revealed = []
-    st.session_state.word_bank_shown = False
-    st.session_state.current_hint_text = ''
-    st.session_state.show_hint = False
+    st.session_state.final_percentile = None
+    get_engine().reset_game()
+
+@st.cache_resource
+def start_metrics_exporters():
+    """Start the metrics file writer / HTTP endpoint once per process"""
+    return metrics.start_exporters()
+
+def count_messages(ctx, counts):
+    """Wrap this run's enqueue so each delta and new element sent to the browser is counted"""
+    enqueue = ctx._enqueue
+
+    def counting_enqueue(msg):
+        if msg.HasField('delta'):
+            counts[0] += 1
+            if msg.delta.HasField('new_element'):
+                counts[1] += 1
+        enqueue(msg)
+    ctx._enqueue = counting_enqueue
+    return enqueue
+
+def instrumented_main():
+    """main() with rerun metrics: its trigger, latency and the deltas/elements it sent"""
+    start_metrics_exporters()
+    if 'initialized' not in st.session_state:
+        trigger = 'session_start'
+    else:
+        trigger = st.session_state.pop('metrics_trigger', 'interaction')
+    metrics.count_rerun(trigger)
+
+    ctx = get_script_run_ctx()
+    counts = [0, 0]
+    enqueue = count_messages(ctx, counts)
+    start = time.perf_counter()
+    try:
+        main()
+    except RerunException:
+        st.session_state.metrics_trigger = 'st_rerun'
+        raise
+    finally:
+        metrics.REGISTRY.observe("word_scramble_section_seconds", time.perf_counter() - start, section='main')
+        ctx._enqueue = enqueue
+        metrics.observe_rerun_messages(*counts)
+    if METRICS_OVERLAY:
+        show_metrics_overlay()
+
+def show_metrics_overlay():
+    """Dev-only panel summarising this process's rerun metrics"""
+    summary = metrics.summary()
+    with st.expander("🛠️ Rerun metrics (this process)"):
+        last = summary['last_rerun']
+        st.caption(f"Last full rerun: {last['deltas']} deltas, {last['elements']} elements · "
+                   "reruns by trigger: " + ", ".join(f"{t} {n}" for t, n in summary['reruns'].items()))
+        st.table([{"section": row['section'], "calls": row['count'], "p50 ms": f"{row['p50'] * 1e3:.2f}",
+                   "p95 ms": f"{row['p95'] * 1e3:.2f}", "last ms": f"{row['last'] * 1e3:.2f}"}
+                  for row in summary['sections']])
 
 if __name__ == "__main__":
-    main()
+    if metrics.ENABLED:
+        instrumented_main()
+    else:
+        main()
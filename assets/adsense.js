@@ -0,0 +1,48 @@
+// Page-level ad runtime, installed once into the top-level document.
+// Adds the AdSense verification meta tag, loads adsbygoogle.js at most once,
+// and fills each ad slot only when it scrolls into view. Slots are rendered
+// as <ins class="ws-ad" data-ws-lazy> and promoted to "adsbygoogle" when
+// visible, so push({}) always fills the slot that was just revealed.
+(function () {
+  if (window.wsAds) return;
+  var clientId = document.currentScript.dataset.client;
+
+  if (!document.querySelector('meta[name="google-adsense-account"]')) {
+    var meta = document.createElement('meta');
+    meta.name = 'google-adsense-account';
+    meta.content = clientId;
+    document.head.appendChild(meta);
+  }
+
+  var libraryRequested = false;
+  function loadLibrary() {
+    if (libraryRequested) return;
+    libraryRequested = true;
+    var lib = document.createElement('script');
+    lib.async = true;
+    lib.crossOrigin = 'anonymous';
+    lib.src = 'https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=' + clientId;
+    document.head.appendChild(lib);
+  }
+
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (!entry.isIntersecting) return;
+      observer.unobserve(entry.target);
+      loadLibrary();
+      entry.target.classList.add('adsbygoogle');
+      (window.adsbygoogle = window.adsbygoogle || []).push({});
+    });
+  }, {rootMargin: '200px'});
+
+  function scan() {
+    document.querySelectorAll('ins.ws-ad[data-ws-lazy]:not([data-ws-observed])').forEach(function (slot) {
+      slot.setAttribute('data-ws-observed', '1');
+      observer.observe(slot);
+    });
+  }
+
+  new MutationObserver(scan).observe(document.body, {childList: true, subtree: true});
+  scan();
+  window.wsAds = {scan: scan};
+})();
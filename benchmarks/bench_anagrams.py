@@ -0,0 +1,48 @@
+"""Build time and lookup latency of the anagram signature index.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_anagrams [--words 500000]
+"""
+
+import argparse
+import itertools
+import random
+import time
+import timeit
+
+from anagrams import AnagramIndex, signature
+from benchmarks.synthetic import synthetic_words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    words = synthetic_words(args.words)
+    # Seed real anagram classes: every tenth word also appears reversed and rotated
+    words += [w[::-1] for w in words[::10]] + [w[1:] + w[0] for w in words[::10]]
+
+    start = time.perf_counter()
+    index = AnagramIndex(words)
+    build = time.perf_counter() - start
+    print(f"build: {len(words)} words -> {len(index)} signatures in {build:.2f} s")
+
+    rng = random.Random(1)
+    answers = rng.sample(words, 1000)
+    hits = [(index.anagrams(a)[-1], a) for a in answers]
+    misses = [(a[::-1] + 'Q', a) for a in answers]
+
+    for label, pairs in (("valid anagram", hits), ("rejected guess", misses)):
+        it = itertools.cycle(pairs)
+        elapsed = timeit.timeit(lambda: index.is_valid_answer(*next(it)), number=args.number)
+        print(f"is_valid_answer ({label}): {elapsed / args.number * 1e9:.0f} ns/call")
+
+    scan = timeit.timeit(lambda: [w for w in words if signature(w) == signature(answers[0])], number=1)
+    print(f"linear scan reference: {scan * 1e3:.0f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
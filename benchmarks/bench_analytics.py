@@ -0,0 +1,178 @@
+"""Throughput and correctness of the event log analytics job.
+
+Simulates players over several days through two EventLog writers (two
+worker processes, some players served by both), with small files so the
+logs span many shards. Runs analytics.aggregate over them and compares
+daily.tsv and sessions.tsv with a straightforward computation that holds
+every event in memory, then reports events per second for each worker
+count.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_analytics [--players 2000] [--days 7] [--workers 1 4]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import analytics
+from event_log import EventLog, read_events
+
+MODES = ('classic', 'speed', 'marathon')
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def simulate(directory, players, days, rng):
+    """Write event logs; returns the number of events"""
+    clock = Clock()
+    logs = [EventLog(directory, max_bytes=64 * 2**10, flush_interval=0, clock=clock) for _ in range(2)]
+    start = 1_790_000_000.0
+    sessions = []
+    for player in range(players):
+        for day in range(days):
+            for _ in range(rng.randint(0, 3)):
+                sessions.append((start + day * 86400 + rng.uniform(0, 86000), f"player{player}"))
+    sessions.sort()
+
+    events = 0
+    for t, player in sessions:
+        log = logs[hash(player) % 2] if rng.random() < 0.9 else logs[rng.randrange(2)]
+        mode = rng.choice(MODES)
+        emit = log.emit
+        for game in range(rng.randint(1, 3)):
+            rounds = 5
+            started = t
+            for round_number in range(1, rounds + 1):
+                difficulty = rng.choice(DIFFICULTIES)
+                if round_number == 1:
+                    game_difficulty = difficulty
+                clock.now = t
+                emit('round_start', player, mode, difficulty, 'WORD', '', '', round_number)
+                emit('ad_slot_rendered', player, mode, difficulty, '', '', '', 'top')
+                events += 2
+                if rng.random() < 0.3:
+                    emit('hint', player, mode, difficulty, 'WORD', '', '', rng.choice(analytics.HINT_TYPES))
+                    events += 1
+                if rng.random() < 0.05:
+                    emit('ad_view', player, mode, difficulty, '', '', '', 'rewarded:hint')
+                    emit('hint', player, mode, difficulty, 'WORD', '', '', 'reveal:free')
+                    events += 2
+                t += rng.uniform(3, 40)
+                clock.now = t
+                outcome = rng.random()
+                if outcome < 0.7:
+                    emit('guess', player, mode, difficulty, 'WORD', 12.5, 0, 1)
+                elif outcome < 0.8:
+                    emit('guess', player, mode, difficulty, 'WORD', 12.5, 0, 0)
+                elif outcome < 0.9:
+                    emit('skip', player, mode, difficulty, 'WORD', 12.5, 0)
+                else:
+                    emit('time_up', player, mode, difficulty, 'WORD', 60, 0)
+                events += 1
+                if rng.random() < 0.1 and round_number < rounds:
+                    break  # Abandoned game
+            else:
+                emit('game_complete', player, mode, game_difficulty, 'WORD', t - started, '', 120)
+                events += 1
+            t += rng.uniform(5, 120)
+        if len(log._buffer) > 10_000:
+            log.flush()
+    for log in logs:
+        log.close()
+    return events
+
+
+def reference(paths):
+    """analytics' counters and sessions computed with every event in memory"""
+    events = [event for path in paths for event in read_events(path)]
+    counters = {}
+    by_player = {}
+    for t, kind, player, mode, difficulty, _, seconds, _, detail in events:
+        t = float(t)
+        # A game counts as completed on the day it started
+        day = int((t - float(seconds)) // analytics.DAY) if kind == 'game_complete' else int(t // analytics.DAY)
+        row = counters.setdefault((day, mode, difficulty), dict.fromkeys(analytics.COUNTERS, 0))
+        by_player.setdefault(player, []).append(t)
+        if kind == 'round_start' and detail == '1':
+            row['games_started'] += 1
+        elif kind == 'game_complete':
+            row['games_completed'] += 1
+        elif kind in ('guess', 'skip', 'time_up'):
+            row['rounds'] += 1
+            row['solved'] += kind == 'guess' and detail == '1'
+            row['skipped'] += kind == 'skip'
+            row['timed_out'] += kind == 'time_up'
+        elif kind == 'hint':
+            hint = detail.split(':')[0]
+            row['free_hints' if detail.endswith(':free') else 'hints'] += 1
+            row[f"hint_{hint}"] += 1
+        elif kind == 'ad_slot_rendered':
+            row['ad_slots_rendered'] += 1
+        elif kind == 'ad_view':
+            row['rewarded_ads'] += 1
+
+    sessions = {}
+    for player, times in by_player.items():
+        times.sort()
+        start = end = times[0]
+        for t in times[1:]:
+            if t - end > analytics.SESSION_GAP:
+                sessions.setdefault(int(start // analytics.DAY), []).append((player, end - start))
+                start = t
+            end = t
+        sessions.setdefault(int(start // analytics.DAY), []).append((player, end - start))
+    return {key: [row[name] for name in analytics.COUNTERS] for key, row in counters.items()}, sessions, len(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        logs = os.path.join(directory, "events")
+        start = time.perf_counter()
+        events = simulate(logs, args.players, args.days, rng)
+        paths = analytics.event_files([logs])
+        print(f"logs: {events} events in {len(paths)} files, written in {time.perf_counter() - start:.1f} s")
+
+        counters, sessions, read = reference(paths)
+        out = os.path.join(directory, "expected")
+        analytics.write_summaries(counters, sessions, out)
+        for workers in sorted(set(args.workers)):
+            summary = os.path.join(directory, f"analytics-{workers}")
+            start = time.perf_counter()
+            _, malformed, _, _ = analytics.aggregate([logs], summary, workers=workers)
+            elapsed = time.perf_counter() - start
+            if malformed:
+                raise SystemExit(f"{malformed} malformed lines in freshly written logs")
+            same = all(open(os.path.join(summary, name)).read() == open(os.path.join(out, name)).read()
+                       for name in ("daily.tsv", "sessions.tsv"))
+            print(f"workers {workers:>2}: {elapsed:6.2f} s  {read / elapsed / 1e6:5.2f} M events/s  "
+                  f"matches in-memory reference: {same}")
+            if not same:
+                raise SystemExit(1)
+
+        daily, day_sessions = analytics.load_summaries(summary)
+        over = [row for row in daily if row['games_completed'] > row['games_started']]
+        if over:
+            raise SystemExit(f"more games completed than started: {over[0]}")
+        print(f"summaries: {len(daily)} daily rows, {len(day_sessions)} session days, "
+              f"{sum(os.path.getsize(os.path.join(summary, n)) for n in os.listdir(summary)) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
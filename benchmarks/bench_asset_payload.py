@@ -0,0 +1,57 @@
+"""Per-rerun websocket payload with inline vs static (content-hashed) assets.
+
+Counts the serialized ForwardMsg bytes Streamlit produces for one rerun of
+each screen, using AppTest to drive app.py headlessly.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_asset_payload
+"""
+
+import os
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+SCREENS = ['home', 'mode_select', 'playing', 'shop', 'achievements', 'leaderboard']
+
+_last_payload = [0]
+_original_run = LocalScriptRunner.run
+
+
+def _measuring_run(self, *args, **kwargs):
+    tree = _original_run(self, *args, **kwargs)
+    _last_payload[0] = sum(msg.ByteSize() for msg in self.forward_msgs())
+    return tree
+
+
+def measure(mode):
+    os.environ["WORD_SCRAMBLE_ASSET_MODE"] = mode
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    sizes = {}
+    for screen in SCREENS:
+        if screen == 'playing':
+            at.session_state.screen = 'mode_select'
+            at.run()
+            next(b for b in at.button if b.label.startswith("Play Classic")).click()
+        else:
+            at.session_state.screen = screen
+        at.run()
+        at.run()  # measure a steady-state rerun of this screen
+        sizes[screen] = _last_payload[0]
+    return sizes
+
+
+def main():
+    LocalScriptRunner.run = _measuring_run
+    inline = measure("inline")
+    static = measure("static")
+    print(f"{'screen':<14}{'inline':>12}{'static':>12}{'saved':>10}")
+    for screen in SCREENS:
+        saved = 1 - static[screen] / inline[screen]
+        print(f"{screen:<14}{inline[screen]:>10} B{static[screen]:>10} B{saved:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Throughput and accuracy of the offline difficulty calibration.
+
+Writes synthetic round logs (three plain files and one gzip file) for
+words with a hidden hardness that lowers their solve rate and raises their
+solve time, then runs calibration.calibrate over them. Checks that
+splitting plain files into small byte ranges gives the same table as
+reading them whole, and that the calibrated percentiles rank words in the
+order of their hidden hardness. Reports rounds per second for each worker
+count and the peak memory of the worker processes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_calibration [--rounds 2000000] [--workers 1 4]
+"""
+
+import argparse
+import gzip
+import os
+import random
+import resource
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_words
+from calibration import DifficultyTable, calibrate
+
+
+def write_logs(directory, words, rounds, rng):
+    """Round logs for ``rounds`` rounds; returns their paths"""
+    hardness = {word: rng.random() for word in words}
+    paths = [os.path.join(directory, f"rounds-{i}.tsv") for i in range(3)] + [
+        os.path.join(directory, "rounds-3.tsv.gz")]
+    per_file = rounds // len(paths)
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as out:
+            lines = []
+            for _ in range(per_file):
+                word = rng.choice(words)
+                h = hardness[word]
+                solved = rng.random() < 0.95 - 0.6 * h
+                seconds = max(0.5, rng.gauss(5 + 40 * h, 4))
+                lines.append(f"{word}\t{seconds:.1f}\t{int(solved)}\t{int(rng.random() < h) + int(rng.random() < h)}\n")
+                if len(lines) == 100_000:
+                    out.writelines(lines)
+                    lines = []
+            out.writelines(lines)
+    return paths, hardness, per_file * len(paths)
+
+
+def rank_correlation(xs, ys):
+    """Spearman correlation (no ties expected)"""
+    def ranks(values):
+        order = sorted(range(len(values)), key=values.__getitem__)
+        result = [0] * len(values)
+        for rank, i in enumerate(order):
+            result[i] = rank
+        return result
+    rx, ry = ranks(xs), ranks(ys)
+    n = len(xs)
+    return 1 - 6 * sum((a - b) ** 2 for a, b in zip(rx, ry)) / (n * (n * n - 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2_000_000)
+    parser.add_argument("--words", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = synthetic_words(args.words)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        paths, hardness, rounds = write_logs(directory, words, args.rounds, rng)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"logs: {rounds} rounds, {size / 2**20:.0f} MB on disk, written in {time.perf_counter() - start:.1f} s")
+
+        whole = os.path.join(directory, "whole.tsv")
+        chunked = os.path.join(directory, "chunked.tsv")
+        calibrate(paths, whole, workers=1)
+        calibrate(paths, chunked, workers=1, chunk_bytes=2**20 + 7)
+        with open(whole, 'rb') as a, open(chunked, 'rb') as b:
+            same = a.read() == b.read()
+        print(f"1 MB byte ranges give the same table as whole files: {same}")
+        if not same:
+            raise SystemExit(1)
+
+        table = DifficultyTable(whole)
+        calibrated = [word for word in words if word in table]
+        correlation = rank_correlation([table.percentile(w) for w in calibrated], [hardness[w] for w in calibrated])
+        print(f"calibrated {len(table)}/{len(words)} words; rank correlation with hidden hardness {correlation:.3f}")
+
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            calibrate(paths, whole, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"workers {workers:>2}: {elapsed:6.2f} s  {rounds / elapsed / 1e6:5.2f} M rounds/s")
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        print(f"peak worker RSS: {peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
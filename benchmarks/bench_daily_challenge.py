@@ -0,0 +1,82 @@
+"""Cost of building the daily challenge, and of a midnight rush for it.
+
+Times build_daily_challenge on a large synthetic lexicon and checks that
+building the same day twice gives identical puzzles. Then opens the
+challenge from many AppTest sessions of app.py in one process and counts
+how many builds ran: st.cache_resource shares the first session's result
+with every other one (and its per-key lock makes sessions that miss at the
+same moment wait for that one build rather than start their own).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_daily_challenge [--words 500000] [--sessions 20]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+import daily
+from anagrams import AnagramIndex
+from benchmarks.load_test import APP_PATH
+from benchmarks.synthetic import synthetic_database
+from daily import build_daily_challenge
+from similar_words import SimilarWords
+from word_index import WordIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    words = WordIndex.from_database(synthetic_database(args.words))
+    anagrams = AnagramIndex(words)
+    similar = SimilarWords(anagrams, words)
+
+    start = time.perf_counter()
+    challenge = build_daily_challenge("2026-01-01", words, anagrams, similar)
+    elapsed = time.perf_counter() - start
+    same = challenge == build_daily_challenge("2026-01-01", words, anagrams, similar)
+    other = build_daily_challenge("2026-01-02", words, anagrams, similar)
+    print(f"build: {elapsed * 1e3:.1f} ms for {len(words)} words; rebuilt identically: {same}; "
+          f"next day shares {len({p.word for p in challenge.puzzles} & {p.word for p in other.puzzles})} words")
+    if not same:
+        raise SystemExit(1)
+
+    # Sessions of the real app: every one opens the challenge, one build serves them all
+    builds = []
+
+    def counting_build(day, *args, **kwargs):
+        builds.append(day)
+        return build_daily_challenge(day, *args, **kwargs)
+
+    daily.build_daily_challenge = counting_build  # app.py imports it afresh on every rerun
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["WORD_SCRAMBLE_PROFILE_DB"] = os.path.join(directory, "profiles.db")
+        os.environ["WORD_SCRAMBLE_EVENT_LOG"] = ""
+        waits = []
+        words_seen = set()
+        for _ in range(args.sessions):
+            at = AppTest.from_file(APP_PATH, default_timeout=60).run()
+            next(b for b in at.button if "Start Game" in b.label).click().run()
+            t = time.perf_counter()
+            next(b for b in at.button if "Daily Challenge" in b.label).click().run()
+            waits.append(time.perf_counter() - t)
+            if at.exception:
+                raise SystemExit(at.exception)
+            words_seen.add(at.session_state.engine.current_word)
+    print(f"{args.sessions} app sessions: {len(builds)} build(s) of {builds[0]}, all shown the same first word: "
+          f"{len(words_seen) == 1}; opening the challenge p50 {statistics.median(waits) * 1e3:.0f} ms, "
+          f"max {max(waits) * 1e3:.0f} ms")
+    if len(builds) != 1 or len(words_seen) != 1:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
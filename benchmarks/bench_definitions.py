@@ -0,0 +1,62 @@
+"""Per-call cost of get_word_definition lookups, before and after the store.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_definitions [--entries 500000]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import timeit
+
+from app import WORD_DEFINITIONS
+from benchmarks.synthetic import synthetic_words
+from definitions import DefinitionStore, build_definitions
+
+
+def legacy_lookup_factory():
+    """Recreate the old function that rebuilt the definition dict literal per call"""
+    items = ", ".join(f"{k!r}: {v!r}" for k, v in WORD_DEFINITIONS.items())
+    namespace = {}
+    exec(f"def legacy(word):\n    definitions = {{{items}}}\n    return definitions.get(word)", namespace)
+    return namespace["legacy"]
+
+
+def per_call(fn, words, number):
+    it = itertools.cycle(words)
+    return min(timeit.repeat(lambda: fn(next(it)), number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    words = synthetic_words(args.entries)
+    path = os.path.join(tempfile.mkdtemp(), "definitions.tsv")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.writelines(build_definitions(f"{w}\tDefinition of {w.lower()}\n" for w in words))
+
+    timer = timeit.default_timer
+    start = timer()
+    store = DefinitionStore(path)
+    load = timer() - start
+
+    rng = random.Random(0)
+    builtin_words = list(WORD_DEFINITIONS)
+    hot = rng.sample(words, 500)
+    cold = rng.sample(words, 20_000)
+
+    print(f"store load: {len(store)} entries in {load * 1e3:.0f} ms")
+    print(f"before: dict literal rebuilt per call  {per_call(legacy_lookup_factory(), builtin_words, args.number):8.0f} ns/call")
+    print(f"after:  module-level WORD_DEFINITIONS  {per_call(WORD_DEFINITIONS.get, builtin_words, args.number):8.0f} ns/call")
+    print(f"after:  store, uncached bisect         {per_call(store._lookup, cold, args.number // 10):8.0f} ns/call")
+    print(f"after:  store, LRU hit                 {per_call(store.lookup, hot, args.number):8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
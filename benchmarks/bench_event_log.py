@@ -0,0 +1,96 @@
+"""Cost of emitting gameplay events, and what the writer makes of them.
+
+Times EventLog.emit from several threads while the background writer
+drains, compresses and rotates, against appending the same tuple to a
+plain list for reference. Then checks that every event reached a
+completed gzip file in order, that rotation kept files near ``max_bytes``
+and that no ``.part`` file is left after close, and that calibration.py
+reads the round-ending events back.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_event_log [--events 1000000] [--threads 4]
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import threading
+import time
+
+from calibration import calibrate
+from event_log import EventLog, read_events
+
+KINDS = ('round_start', 'hint', 'guess', 'power_up', 'skip', 'time_up')
+
+
+def emit_events(log, count, thread_id):
+    emit = log.emit
+    for i in range(count):
+        kind = KINDS[i % len(KINDS)]
+        emit(kind, f"player{thread_id}", 'classic', 'medium', f"WORD{i % 500}", 12.5, i % 3, i % 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--max-bytes", type=int, default=2**20)
+    args = parser.parse_args()
+    per_thread = args.events // args.threads
+
+    reference = []
+    start = time.perf_counter()
+    for i in range(per_thread):
+        reference.append((time.time(), KINDS[i % len(KINDS)], "player0", 'classic', 'medium', f"WORD{i % 500}",
+                          12.5, i % 3, i % 2))
+    list_ns = (time.perf_counter() - start) / per_thread * 1e9
+    del reference
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = EventLog(directory, max_bytes=args.max_bytes)
+        threads = [threading.Thread(target=emit_events, args=(log, per_thread, t)) for t in range(args.threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        total = per_thread * args.threads
+        print(f"emit: {elapsed / total * 1e9:.0f} ns/event across {args.threads} threads "
+              f"({total / elapsed / 1e3:.0f}k events/s while the writer runs; list.append of the same tuple "
+              f"{list_ns:.0f} ns), {log.pending_count()} still queued, {log.dropped} dropped")
+
+        start = time.perf_counter()
+        log.close()
+        print(f"close: drained and finished in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        paths = sorted(glob.glob(os.path.join(directory, "*.tsv.gz")))
+        parts = glob.glob(os.path.join(directory, "*.part"))
+        sizes = [os.path.getsize(path) for path in paths]
+        read = 0
+        last_seen = {}
+        in_order = True
+        for path in paths:
+            for event in read_events(path):
+                read += 1
+                player, word = event[2], int(event[5][4:])
+                in_order &= (last_seen.get(player, -1) + 1) % 500 == word
+                last_seen[player] = word
+        print(f"files: {len(paths)} ({max(sizes) / 2**10:.0f} KB largest, {sum(sizes) / total:.1f} bytes/event), "
+              f"{len(parts)} .part left; read back {read}/{total} events, per-player order kept: {in_order}")
+        if read != total or parts or not in_order:
+            raise SystemExit(1)
+
+        output = os.path.join(directory, "difficulty.tsv")
+        rounds, malformed, words = calibrate(paths, output, workers=1)
+        print(f"calibration read {rounds} rounds ({malformed} malformed) and rated {words} words")
+        expected = args.threads * sum(KINDS[i % len(KINDS)] in ('guess', 'skip', 'time_up')
+                                      for i in range(per_thread))
+        if rounds != expected or malformed:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
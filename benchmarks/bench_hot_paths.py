@@ -0,0 +1,168 @@
+"""Per-round hot paths of the game, timed headlessly and compared with a saved baseline.
+
+Times GameEngine word selection (by band and by rating), scrambling, each
+hint type, word-bank distractors, scoring, guess processing and XP/level
+bookkeeping on the built-in WORD_DATABASE and on a large synthetic lexicon. Each case reports
+ns per call and its cost relative to a fixed reference workload timed
+alongside it ("x ref"). The baseline file stores the relative costs, so
+the comparison holds up on a noisy or differently sized machine; cases
+slower than the baseline by more than --threshold are flagged and make the
+run exit non-zero.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_hot_paths                   # compare with benchmarks/baseline_hot_paths.json
+    python -m benchmarks.bench_hot_paths --save-baseline   # record a new baseline on this machine
+
+Relative costs still shift somewhat between Python versions and CPUs, so
+re-record the baseline when either changes. Outside a Streamlit runtime every
+st.cache_resource call misses and shows a spinner, so the definition store is
+resolved once here and the hint timings exclude Streamlit's cache lookup.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+
+import app
+from anagrams import AnagramIndex
+from app import WORD_DATABASE, get_word_definition
+from benchmarks.synthetic import synthetic_database
+from engine import GameEngine
+from ratings import WordRatings
+from scramble import scramble_word
+from similar_words import SimilarWords
+from word_index import WordIndex
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_hot_paths.json")
+HINT_TYPES = ('category', 'definition', 'shuffle', 'reveal')
+
+
+def new_engine(words, anagrams, seed=0, word_ratings=None):
+    engine = GameEngine(words, anagram_index=anagrams, define=get_word_definition, rng=random.Random(seed),
+                        similar_words=SimilarWords(anagrams, words), word_ratings=word_ratings)
+    engine.profile.statistics.words_total = 10
+    engine.profile.statistics.words_correct = 6  # Medium words under auto difficulty
+    engine.start_game('classic')
+    return engine
+
+
+def cases(engine, rated_engine):
+    """(name, callable) pairs timed against one engine, and one matching words by rating"""
+    word = engine.current_word
+    rng = random.Random(1)
+    yield "select_word", engine.select_word
+    yield "select_word[rated]", rated_engine.select_word
+    yield "scramble_word", lambda: scramble_word(word, rng)
+    for hint_type in HINT_TYPES:
+        yield f"hint[{hint_type}]", lambda hint_type=hint_type: engine.hint(hint_type)
+    yield "word_bank", engine.word_bank
+    yield "calculate_score", lambda: engine.calculate_score(12.5, 'medium', 1)
+    yield "process_guess[correct]", lambda: engine.process_guess(word)
+    yield "process_guess[wrong]", lambda: engine.process_guess("WRONGWORD")
+    yield "level_info", engine.level_info
+    yield "add_xp", lambda: engine.add_xp(25)
+
+
+def reference_workload(data=tuple(random.Random(0).sample(range(1000), 12))):
+    """Fixed pure-Python work that every case is measured against"""
+    counts = {}
+    for value in sorted(data):
+        counts[value % 7] = counts.get(value % 7, 0) + 1
+    return counts
+
+
+def _calls_for(timer, min_time):
+    number, elapsed = timer.autorange()
+    return max(1, int(number * min_time / elapsed))
+
+
+def time_case(func, min_time, repeat):
+    """Best ns per call, and the median cost relative to reference_workload, over ``repeat`` paired runs.
+
+    Case and reference runs alternate, so a slower or busier machine scales
+    both and the relative cost stays comparable with the baseline.
+    """
+    case, reference = timeit.Timer(func), timeit.Timer(reference_workload)
+    case_number, reference_number = _calls_for(case, min_time), _calls_for(reference, min_time)
+    times, ratios = [], []
+    for _ in range(repeat):
+        case_ns = case.timeit(case_number) / case_number * 1e9
+        reference_ns = reference.timeit(reference_number) / reference_number * 1e9
+        times.append(case_ns)
+        ratios.append(case_ns / reference_ns)
+    return min(times), statistics.median(ratios)
+
+
+def run(datasets, min_time, repeat):
+    results = {}
+    for label, database in datasets:
+        words = WordIndex.from_database(database)
+        anagrams = AnagramIndex(words)
+        rated_engine = new_engine(words, anagrams, word_ratings=WordRatings(words))
+        for name, func in cases(new_engine(words, anagrams), rated_engine):
+            results[f"{label}/{name}"] = time_case(func, min_time, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline; returns the names that regressed"""
+    regressed = []
+    print(f"{'case':<40} {'ns/call':>9} {'x ref':>7} {'baseline':>9} {'change':>8}")
+    for name, (ns, ratio) in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {ns:>9.0f} {ratio:>7.3f} {'-':>9} {'new':>8}")
+            continue
+        change = ratio / base - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        print(f"{name:<40} {ns:>9.0f} {ratio:>7.3f} {base:>9.3f} {change:>+7.0%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=200_000, help="size of the synthetic lexicon")
+    parser.add_argument("--min-time", type=float, default=0.01, help="seconds per timing repeat")
+    parser.add_argument("--repeat", type=int, default=25)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a case is flagged")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's timings as the baseline")
+    args = parser.parse_args()
+
+    definition_store = app.get_definition_store()
+    app.get_definition_store = lambda: definition_store
+    random.seed(0)
+    datasets = [("WORD_DATABASE", WORD_DATABASE), ("synthetic", synthetic_database(args.words))]
+    results = run(datasets, args.min_time, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        baseline = saved["results"]
+        print(f"baseline: {args.baseline} ({saved['python']}, {saved['machine']}, {saved['words']} synthetic words)")
+    regressed = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "words": args.words,
+                       "results": {name: round(ratio, 3) for name, (ns, ratio) in results.items()}}, f, indent=2)
+            f.write("\n")
+        print(f"saved baseline to {args.baseline}")
+    elif regressed:
+        print(f"{len(regressed)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
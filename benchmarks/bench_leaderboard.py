@@ -0,0 +1,139 @@
+"""Leaderboard update and query latency with a million synthetic players.
+
+Compares the ranked index against the old approach of sorting every player
+on each leaderboard view, and times loading/writing the SQLite table. The
+index is checked against a full sort before timing. The weekly window is
+timed with a week of games spread over the same players, including the
+worst single call while a day rolls out of the window, against recomputing
+the window from raw game history per view.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_leaderboard [--players 1000000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import timeit
+
+from leaderboard import EXPIRE_BATCH, Leaderboard, LeaderboardStore, WindowedLeaderboard
+
+
+def per_call(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def check(board, entries, rng):
+    order = sorted(entries, key=lambda p: (-entries[p][0], p))
+    assert [row['player_id'] for row in board.top(50)] == order[:50]
+    for player_id in rng.sample(order, 200):
+        rank = board.rank(player_id)
+        assert order[rank - 1] == player_id
+        assert [row['player_id'] for row in board.around(player_id, 2)] == order[max(0, rank - 3):rank + 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    players = [f"{i:032x}" for i in range(args.players)]
+    entries = {p: (int(rng.paretovariate(1.2) * 100), rng.randint(1, 40), rng.randint(1, 500)) for p in players}
+    rows = [(p, score, level, games) for p, (score, level, games) in entries.items()]
+
+    start = time.perf_counter()
+    board = Leaderboard(rows)
+    print(f"build: {len(board):,} players in {time.perf_counter() - start:.2f} s")
+
+    for _ in range(20_000):
+        player_id = rng.choice(players)
+        score, level, games = entries[player_id]
+        entries[player_id] = (score + rng.randint(0, 400), level, games + 1)
+        board.update(player_id, *entries[player_id])
+    check(board, entries, rng)
+    print("check: top/rank/around agree with a full sort")
+
+    def update():
+        player_id = rng.choice(players)
+        score, level, games = entries[player_id]
+        entries[player_id] = (score + rng.randint(0, 400), level, games + 1)
+        board.update(player_id, *entries[player_id])
+
+    me = rng.choice(players)
+    print(f"update (game complete)     {per_call(update, args.number):9.2f} us")
+    print(f"rank                       {per_call(lambda: board.rank(rng.choice(players)), args.number):9.2f} us")
+    print(f"top 10                     {per_call(lambda: board.top(10), args.number):9.2f} us")
+    print(f"around (rank +/- 2)        {per_call(lambda: board.around(me, 2), args.number):9.2f} us")
+    start = time.perf_counter()
+    sorted(entries.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    print(f"before: sort per view      {(time.perf_counter() - start) * 1e6:9.0f} us")
+
+    path = os.path.join(tempfile.mkdtemp(), "profiles.db")
+    store = LeaderboardStore(path)
+    start = time.perf_counter()
+    store._conn.execute("BEGIN")
+    store._conn.executemany("INSERT INTO leaderboard VALUES (?, ?, ?, ?, 0)", rows)
+    store._conn.execute("COMMIT")
+    print(f"sqlite: bulk insert        {time.perf_counter() - start:9.2f} s")
+    store.close()
+    start = time.perf_counter()
+    store = LeaderboardStore(path)
+    print(f"sqlite: load on startup    {time.perf_counter() - start:9.2f} s")
+    print(f"sqlite: update (write-through) {per_call(lambda: store.update(rng.choice(players), rng.randint(0, 10**6)), 2000):5.0f} us")
+    store.close()
+    windowed(players, rng, args.number)
+
+
+def windowed(players, rng, number):
+    days = 7
+    weekly = WindowedLeaderboard(days)
+    history = []
+    buckets = [dict() for _ in range(days + 1)]
+    start = time.perf_counter()
+    for day in range(days):
+        for player_id in rng.sample(players, len(players) // 10):
+            points = rng.randint(0, 400)
+            history.append((day, player_id, points))
+            score, games = buckets[day].get(player_id, (0, 0))
+            buckets[day][player_id] = (score + points, games + 1)
+            weekly.set(day, player_id, *buckets[day][player_id])
+    print(f"weekly: {len(history):,} games over {days} days, {len(weekly):,} players in "
+          f"{time.perf_counter() - start:.1f} s")
+
+    today = days - 1
+    sample = rng.sample(players, 20_000)
+
+    def record():
+        player_id = rng.choice(sample)
+        score, games = buckets[today].get(player_id, (0, 0))
+        buckets[today][player_id] = (score + rng.randint(0, 400), games + 1)
+        weekly.set(today, player_id, *buckets[today][player_id])
+
+    print(f"weekly: record game        {per_call(record, number):9.2f} us")
+    print(f"weekly: top 10             {per_call(lambda: weekly.top(10), number):9.2f} us")
+
+    start = time.perf_counter()
+    totals = {}
+    for day, player_id, points in history:
+        totals[player_id] = totals.get(player_id, 0) + points
+    sorted(totals.items(), key=lambda item: item[1], reverse=True)[:10]
+    print(f"before: recompute per view {(time.perf_counter() - start) * 1e6:9.0f} us")
+
+    # Day 0 leaves the window: every call drains at most EXPIRE_BATCH players of it
+    timings = []
+    weekly.advance(days)
+    while weekly._expiring:
+        start = time.perf_counter()
+        weekly.top(10)
+        timings.append(time.perf_counter() - start)
+    print(f"rollover: {len(buckets[0]):,} expired players drained over {len(timings)} calls of {EXPIRE_BATCH}, "
+          f"median {sorted(timings)[len(timings) // 2] * 1e3:.1f} ms, worst {max(timings) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Concurrent sessions writing player profiles through ProfileStore.
+
+Several worker processes share one SQLite database, as Streamlit workers
+behind a load balancer would. Each process runs many simulated sessions on
+a thread pool. Every session plays games of five rounds and mutates its
+profile a few times per round. Two strategies are compared:
+
+* write-behind: save() on every mutation, flush() at round boundaries
+* write-through: save() + flush() on every mutation
+
+Run from the repository root:
+
+    python -m benchmarks.bench_profile_store [--processes 4 --sessions 200]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from profile_store import ProfileStore
+
+ROUNDS = 5
+MUTATIONS_PER_ROUND = 4
+
+
+def play_session(store, player_id, games, write_through, latencies):
+    rng = random.Random(player_id)
+    profile = {'xp': 0, 'coins': 5, 'statistics': {'words_total': 0, 'words_correct': 0}, 'power_ups': {}}
+    for _ in range(games):
+        for _ in range(ROUNDS):
+            for _ in range(MUTATIONS_PER_ROUND):
+                profile['xp'] += rng.randint(10, 40)
+                profile['statistics']['words_total'] += 1
+                start = time.perf_counter()
+                store.save(player_id, profile)
+                if write_through:
+                    store.flush()
+                latencies.append(time.perf_counter() - start)
+            if not write_through:
+                start = time.perf_counter()
+                store.flush()
+                latencies.append(time.perf_counter() - start)
+
+
+def worker(args):
+    path, worker_id, sessions, games, threads, write_through = args
+    store = ProfileStore(path, flush_interval=0)
+    latencies = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for s in range(sessions):
+            pool.submit(play_session, store, f"w{worker_id}-s{s}", games, write_through, latencies)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed, latencies
+
+
+def run(label, processes, sessions, games, threads, write_through):
+    path = os.path.join(tempfile.mkdtemp(), "profiles.db")
+    ProfileStore(path, flush_interval=0).close()
+    jobs = [(path, w, sessions, games, threads, write_through) for w in range(processes)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(worker, jobs)
+    wall = time.perf_counter() - start
+
+    latencies = sorted(l for _, ls in results for l in ls)
+    mutations = processes * sessions * games * ROUNDS * MUTATIONS_PER_ROUND
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"{label:<14} {processes * sessions:>6} sessions  {mutations:>8} mutations  wall={wall:6.2f} s  "
+          f"{mutations / wall:>9.0f} mutations/s  call p50={statistics.median(latencies) * 1e6:7.0f} us  "
+          f"p99={p99 * 1e6:8.0f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per process")
+    parser.add_argument("--games", type=int, default=2, help="games per session")
+    parser.add_argument("--threads", type=int, default=8, help="script-runner threads per process")
+    args = parser.parse_args()
+
+    run("write-behind", args.processes, args.sessions, args.games, args.threads, write_through=False)
+    run("write-through", args.processes, args.sessions, args.games, args.threads, write_through=True)
+
+
+if __name__ == "__main__":
+    main()
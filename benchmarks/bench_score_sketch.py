@@ -0,0 +1,125 @@
+"""Accuracy and cost of the per-mode score sketches against exact percentiles.
+
+Synthetic completed-game scores for several modes are split into shards,
+one sketch per shard (as in separate worker processes), then merged. The
+merged sketch is checked against the sorted exact data for the documented
+bounds in score_sketch.py. Separate processes then write their shards through
+ScoreDistributions into one database, and the global view that a fresh
+process reads must match the in-memory merge exactly.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_score_sketch [--games 300000]
+
+Exits non-zero when any bound is violated.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import timeit
+from bisect import bisect_left, bisect_right
+
+from score_sketch import RELATIVE_ACCURACY, QuantileSketch, ScoreDistributions
+
+SHARDS = 4
+
+
+def synthetic_scores(mode, count, seed=0):
+    rng = random.Random(f"{mode}-{seed}")
+    if mode == 'classic':
+        return [0 if rng.random() < 0.05 else max(0, int(rng.gauss(120, 45))) for _ in range(count)]
+    if mode == 'speed':
+        return [int(rng.lognormvariate(4, 0.8)) for _ in range(count)]
+    # marathon: casual and strong players
+    return [int(rng.gauss(150, 60) if rng.random() < 0.7 else rng.gauss(600, 120)) for _ in range(count)]
+
+
+def check_bounds(sketch, data):
+    """Return (violations, max percentile error in points, max quantile relative error)"""
+    data = sorted(data)
+    n = len(data)
+    gamma = sketch.gamma
+    violations = 0
+    max_error = 0.0
+    probes = sorted(set(random.Random(1).sample(data, 2000)) | {0, 1, data[-1], data[-1] + 1})
+    for x in probes:
+        estimate = sketch.fraction_below(x)
+        low = bisect_right(data, x / gamma) / n if x > 0 else 0.0
+        high = bisect_left(data, x) / n
+        violations += not (low - 1e-12 <= estimate <= high + 1e-12)
+        max_error = max(max_error, abs(estimate - high) * 100)
+
+    max_relative = 0.0
+    for i in range(1, 100):
+        exact = data[int(i / 100 * (n - 1))]
+        estimate = sketch.quantile(i / 100)
+        if exact > 0:
+            relative = abs(estimate - exact) / exact
+            max_relative = max(max_relative, relative)
+            violations += relative > RELATIVE_ACCURACY + 1e-9
+        else:
+            violations += estimate != 0
+    return violations, max_error, max_relative
+
+
+def write_shard(args):
+    path, shards = args
+    store = ScoreDistributions(path, sync_interval=0.5)
+    for mode, scores in shards.items():
+        for score in scores:
+            store.record(mode, score)
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=300_000, help="games per mode")
+    args = parser.parse_args()
+
+    failures = 0
+    data = {mode: synthetic_scores(mode, args.games) for mode in ('classic', 'speed', 'marathon')}
+    merged = {}
+    for mode, scores in data.items():
+        shards = [QuantileSketch() for _ in range(SHARDS)]
+        for i, score in enumerate(scores):
+            shards[i % SHARDS].add(score)
+        sketch = shards[0]
+        for shard in shards[1:]:
+            sketch.merge(shard)
+        merged[mode] = sketch
+
+        violations, max_error, max_relative = check_bounds(sketch, scores)
+        failures += violations
+        print(f"{mode:<9} {len(scores):>8} games  {len(sketch.counts):>4} buckets  "
+              f"percentile error <= {max_error:.2f} pts  quantile error <= {max_relative * 100:.2f}%  "
+              f"{'ok' if not violations else f'{violations} BOUND VIOLATIONS'}")
+
+    sketch = QuantileSketch()
+    scores = data['classic']
+    probe = iter(scores * 2)
+    number = 200_000
+    print(f"add:            {min(timeit.repeat(lambda: sketch.add(next(probe)), number=number, repeat=3)) / number * 1e9:7.0f} ns")
+    sketch = merged['classic']
+    print(f"fraction_below: {min(timeit.repeat(lambda: sketch.fraction_below(137), number=2000, repeat=3)) / 2000 * 1e6:7.1f} us")
+
+    path = os.path.join(tempfile.mkdtemp(), "profiles.db")
+    jobs = [(path, {mode: scores[i::SHARDS] for mode, scores in data.items()}) for i in range(SHARDS)]
+    with multiprocessing.Pool(SHARDS) as pool:
+        pool.map(write_shard, jobs)
+    store = ScoreDistributions(path)
+    for mode, sketch in merged.items():
+        stored = store._sketches[mode]
+        same = stored.counts == sketch.counts and stored.zero_count == sketch.zero_count
+        failures += not same
+        print(f"{mode:<9} merged across {SHARDS} processes via SQLite: {'identical' if same else 'MISMATCH'}")
+    store.close()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Worst-case latency of scramble_word and scramble_batch.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scramble
+
+Exits non-zero when any case exceeds its latency budget.
+"""
+
+import random
+import sys
+import time
+
+from scramble import scramble_batch, scramble_word
+
+CASES = [
+    # (label, word, batch size, budget for one call in ms)
+    ("single letter", "A", 1, 5),
+    ("all same letter", "A" * 32, 1, 5),
+    ("two letters", "AB", 10, 5),
+    ("many repeats", "AAAAAAAAAAAAAAAB", 10, 5),
+    ("many repeats, full space", "AAAAAAAAAAAAAAAB", 100, 5),
+    ("mixed repeats", "MISSISSIPPI", 1000, 50),
+    ("long word", "ENTREPRENEURSHIP", 1, 5),
+    ("long word batch", "ENTREPRENEURSHIP", 10_000, 200),
+    ("very long word", "PNEUMONOULTRAMICROSCOPICSILICOVOLCANOCONIOSIS", 1000, 100),
+]
+
+
+def worst_case(fn, repeat):
+    worst = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        worst = max(worst, time.perf_counter() - start)
+    return worst * 1e3
+
+
+def main():
+    rng = random.Random(0)
+    failures = 0
+    for label, word, count, budget in CASES:
+        if count == 1:
+            worst = worst_case(lambda: scramble_word(word, rng), 2000)
+        else:
+            worst = worst_case(lambda: scramble_batch(word, count, rng), 20)
+        status = "ok" if worst <= budget else "SLOW"
+        failures += status != "ok"
+        print(f"{label:<26} len={len(word):>2} n={count:>6}  worst={worst:8.3f} ms  budget={budget:>4} ms  {status}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
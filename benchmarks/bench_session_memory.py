@@ -0,0 +1,96 @@
+"""Per-session bytes of the player profile and a marathon game's round results.
+
+Compares the old representation (nested profile dicts, one dict per round)
+with PlayerProfile and RoundLog using tracemalloc, and times serializing a
+profile for the profile store.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_session_memory [--sessions 2000 --rounds 20]
+"""
+
+import argparse
+import json
+import random
+import timeit
+import tracemalloc
+
+from player_state import PlayerProfile, RoundLog
+
+WORDS = ["ELEPHANT", "GIRAFFE", "PYTHON", "FOREST", "CHEMISTRY", "ALGORITHM", "CAT", "PLANET"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def legacy_profile():
+    return {
+        'level': 1, 'xp': 0, 'total_games': 0, 'total_words_solved': 0, 'total_score': 0,
+        'current_streak': 0, 'best_streak': 0, 'last_played': None, 'daily_streak': 0, 'coins': 5,
+        'power_ups': {'time_freeze': 1, 'double_points': 1, 'letter_reveal': 2},
+        'achievements_unlocked': [],
+        'statistics': {
+            'games_played': 0, 'words_correct': 0, 'words_total': 0, 'average_time': 0,
+            'fastest_solve': float('inf'), 'perfect_games': 0, 'hints_used': 0, 'power_ups_used': 0
+        },
+        'preferences': {'difficulty': 'medium', 'preferred_categories': [], 'auto_difficulty': True, 'sound_enabled': True}
+    }
+
+
+def legacy_session(rng, rounds):
+    profile = legacy_profile()
+    profile['xp'] = rng.randint(1000, 99999)
+    profile['total_score'] = rng.randint(1000, 99999)
+    profile['achievements_unlocked'] = ['first_game', 'streak_3']
+    results = []
+    for _ in range(rounds):
+        correct = rng.random() < 0.7
+        results.append({'word': rng.choice(WORDS), 'time': rng.uniform(2, 60), 'score': rng.randint(5, 400) if correct else 0,
+                        'difficulty': rng.choice(DIFFICULTIES), 'correct': correct})
+    return profile, results
+
+
+def compact_session(rng, rounds):
+    profile = PlayerProfile()
+    profile.xp = rng.randint(1000, 99999)
+    profile.total_score = rng.randint(1000, 99999)
+    profile.achievements_unlocked = ['first_game', 'streak_3']
+    results = RoundLog()
+    for _ in range(rounds):
+        correct = rng.random() < 0.7
+        results.append(rng.choice(WORDS), rng.uniform(2, 60), rng.randint(5, 400) if correct else 0,
+                       rng.choice(DIFFICULTIES), correct)
+    return profile, results
+
+
+def bytes_per_session(factory, sessions, rounds):
+    rng = random.Random(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [factory(rng, rounds) for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    legacy = bytes_per_session(legacy_session, args.sessions, args.rounds)
+    compact = bytes_per_session(compact_session, args.sessions, args.rounds)
+    print(f"{args.sessions} sessions, {args.rounds} rounds each")
+    print(f"before: dict profile + list of round dicts  {legacy:8.0f} bytes/session")
+    print(f"after:  PlayerProfile + RoundLog            {compact:8.0f} bytes/session  ({(1 - compact / legacy) * 100:.0f}% less)")
+
+    rng = random.Random(1)
+    legacy_profile_, _ = legacy_session(rng, 0)
+    profile, _ = compact_session(rng, 0)
+    assert PlayerProfile.from_json(profile.to_json()) == profile
+    number = 20_000
+    print(f"serialize: json.dumps(dict)         {min(timeit.repeat(lambda: json.dumps(legacy_profile_), number=number, repeat=5)) / number * 1e6:6.1f} us")
+    print(f"serialize: PlayerProfile.to_json  {min(timeit.repeat(profile.to_json, number=number, repeat=5)) / number * 1e6:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Query latency of word-bank distractor search on a large lexicon.
+
+Times SimilarWords.neighbours and .distractors for answers drawn from a
+synthetic lexicon in which every tenth word also has a one-letter variant
+(as real lexicons have plenty of), and reports how many answers found
+enough real look-alikes without falling back to their category. A linear
+scan computing letter_distance against every word is timed once for
+reference.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_similar_words [--words 500000]
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+
+from anagrams import AnagramIndex
+from benchmarks.synthetic import synthetic_database
+from similar_words import SimilarWords, letter_distance
+from word_index import WordIndex
+
+
+def with_variants(database, rng):
+    """Add a one-letter substitution of every tenth word to its category"""
+    for categories in database.values():
+        for words in categories.values():
+            variants = []
+            for word in words[::10]:
+                i = rng.randrange(len(word))
+                variants.append(word[:i] + rng.choice(string.ascii_uppercase) + word[i + 1:])
+            words.extend(variants)
+    return database
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    database = with_variants(synthetic_database(args.words), rng)
+    start = time.perf_counter()
+    words = WordIndex.from_database(database)
+    anagrams = AnagramIndex(words)
+    similar = SimilarWords(anagrams, words)
+    print(f"index: {len(words)} words, {len(anagrams)} signatures in {time.perf_counter() - start:.2f} s "
+          "(the anagram index the app already builds)")
+
+    queries = []
+    for _ in range(args.queries):
+        difficulty = rng.choice(words.difficulties())
+        queries.append((*words.pick(difficulty, rng=rng), difficulty))
+    for label, search in (("neighbours", lambda word, category, difficulty: similar.neighbours(word)),
+                          ("distractors(2)", lambda word, category, difficulty:
+                           similar.distractors(word, 2, rng, difficulty, category))):
+        times = []
+        found = 0
+        for word, category, difficulty in queries:
+            t = time.perf_counter()
+            result = search(word, category, difficulty)
+            times.append(time.perf_counter() - t)
+            found += len(result) >= 2
+        print(f"{label:<15} p50 {statistics.median(times) * 1e6:7.1f} us  p99 {percentile(times, 0.99) * 1e6:7.1f} us"
+              f"  max {max(times) * 1e6:7.1f} us  ({found}/{len(queries)} with 2+ words)")
+
+    near = sum(len(similar.neighbours(word)) >= 2 for word, _, _ in queries)
+    print(f"answers with 2+ neighbours within distance 2: {near}/{len(queries)}")
+
+    word = queries[0][0]
+    start = time.perf_counter()
+    sorted(words, key=lambda w: letter_distance(word, w))[:2]
+    print(f"linear scan reference: {(time.perf_counter() - start) * 1e3:.0f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Reruns and CPU per active player for the two round-timer modes.
+
+Drives app.py headlessly through Streamlit's AppTest. A "tick" is what the
+server does once per timer interval for one player in the middle of a round:
+
+* rerun mode: main() notices 2 s have passed and calls st.rerun(), so the
+  whole script executes twice every 2 s;
+* fragment mode: only show_round_timer() executes, every TIMER_INTERVAL.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_timer_modes [--ticks 50]
+"""
+
+import argparse
+import os
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def timer_region_script():
+    import time
+
+    import app
+
+    app.init_session_state()
+    engine = app.get_engine()
+    if not engine.round_start_time:
+        app.start_game('classic')
+        engine.round_start_time = time.time() + 3600
+    app.show_round_timer()
+
+
+def cpu_per_run(at, ticks, before_run=None):
+    start = time.process_time()
+    for _ in range(ticks):
+        if before_run:
+            before_run(at)
+        at.run()
+    return (time.process_time() - start) / ticks
+
+
+def age_last_update(at):
+    engine = at.session_state.engine
+    engine.last_update = time.time() - 2.0
+    engine.round_start_time = time.time()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ["WORD_SCRAMBLE_TIMER_MODE"] = "rerun"
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    at.session_state.screen = 'mode_select'
+    at.run()
+    next(b for b in at.button if b.label.startswith("Play Classic")).click()
+    at.run()
+    assert at.session_state.screen == 'playing'
+    rerun_tick = cpu_per_run(at, args.ticks, age_last_update)
+
+    region = AppTest.from_function(timer_region_script, default_timeout=30).run()
+    fragment_tick = cpu_per_run(region, args.ticks)
+
+    baseline = AppTest.from_function(lambda: None, default_timeout=30).run()
+    harness = cpu_per_run(baseline, args.ticks)
+
+    from app import TIMER_INTERVAL
+
+    rerun_minute = 60 / 2.0 * rerun_tick
+    fragment_minute = 60 / TIMER_INTERVAL * max(fragment_tick - harness, 0)
+    print(f"AppTest harness overhead per run: {harness * 1e3:7.2f} ms CPU (subtracted in fragment mode)")
+    print(f"rerun mode:    2 full script runs / 2 s   {rerun_tick * 1e3:7.2f} ms CPU per tick   "
+          f"{60:>3} full script runs/min   {rerun_minute * 1e3:8.1f} ms CPU per player-minute")
+    print(f"fragment mode: 1 timer region / {TIMER_INTERVAL:.0f} s       {(fragment_tick - harness) * 1e3:7.2f} ms CPU per tick   "
+          f"{0:>3} full script runs/min   {fragment_minute * 1e3:8.1f} ms CPU per player-minute")
+    print("component mode: no server ticks; one full run when the browser reports time-up or a freeze ending")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare dict-of-dict word selection against the flattened WordIndex.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_word_index [--words 1000000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+from app import WORD_DATABASE
+from benchmarks.synthetic import synthetic_database
+from lexicon import MappedLexicon, write_lexicon
+from word_index import WordIndex
+
+
+def legacy_pick(database, difficulty, preferred_categories):
+    """The per-round selection path used before WordIndex"""
+    categories = list(database[difficulty].keys())
+    if preferred_categories:
+        available_categories = [cat for cat in preferred_categories if cat in categories]
+        if available_categories:
+            categories = available_categories
+    category = random.choice(categories)
+    return random.choice(database[difficulty][category]), category
+
+
+def bench(label, database, preferred, number, mapped=False):
+    if mapped:
+        path = os.path.join(tempfile.mkdtemp(), 'lexicon.bin')
+        write_lexicon(((w, d, c, None) for d, cs in database.items() for c, ws in cs.items() for w in ws), path)
+        build = timeit.timeit(lambda: MappedLexicon(path), number=1)
+        index = MappedLexicon(path)
+    else:
+        build = timeit.timeit(lambda: WordIndex.from_database(database), number=1)
+        index = WordIndex.from_database(database)
+    legacy = min(timeit.repeat(lambda: legacy_pick(database, 'medium', preferred), number=number, repeat=5))
+    indexed = min(timeit.repeat(lambda: index.pick('medium', preferred), number=number, repeat=5))
+    print(f"{label:<28} words={len(index):>8}  build={build * 1e3:8.1f} ms  "
+          f"legacy={legacy / number * 1e9:7.0f} ns/pick  index={indexed / number * 1e9:7.0f} ns/pick  "
+          f"speedup={legacy / indexed:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=1_000_000)
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    large = synthetic_database(args.words)
+    bench("WORD_DATABASE", WORD_DATABASE, [], args.number)
+    bench("WORD_DATABASE + preferred", WORD_DATABASE, ['animals', 'nature'], args.number)
+    bench("synthetic", large, [], args.number)
+    bench("synthetic + preferred", large, ['cat_01', 'cat_02', 'cat_03'], args.number)
+    bench("synthetic, mmap lexicon", large, [], args.number, mapped=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Rating-matched word selection and rating updates on a large lexicon.
+
+Times WordRatings.pick (bisection over the rating-sorted index) against
+scanning every word's rating for the same target, WordRatings.record (one
+Elo update), the re-sort after a sync, and one sync of a minute's pending
+updates to SQLite.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_word_ratings [--words 500000]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+import timeit
+
+from benchmarks.synthetic import synthetic_database
+from ratings import MATCH_SPREAD, WordRatings, target_rating
+from word_index import WordIndex
+
+
+def scan_pick(ratings, target, rng):
+    """Reference: collect every word within MATCH_SPREAD of ``target`` by a full scan"""
+    matched = [i for i, rating in enumerate(ratings.ratings) if abs(rating - target) <= MATCH_SPREAD]
+    return matched[int(rng.random() * len(matched))] if matched else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--updates", type=int, default=20_000, help="rounds rated before the re-sort and sync")
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    words = WordIndex.from_database(synthetic_database(args.words))
+    start = time.perf_counter()
+    ratings = WordRatings(words)
+    print(f"build: {len(words)} words rated and sorted in {time.perf_counter() - start:.2f} s")
+
+    rng = random.Random(0)
+    # Spread the ratings out as play would, so matching is not just picking a band
+    for _ in range(args.updates):
+        player = rng.gauss(1500, 250)
+        ratings.record(rng.randrange(len(words)), player, float(rng.random() < 0.6))
+    start = time.perf_counter()
+    ratings.reindex()
+    print(f"re-sort after {args.updates} updates: {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    players = [rng.gauss(1500, 250) for _ in range(1000)]
+    targets = [target_rating(p) for p in players]
+    it = itertools.count()
+    elapsed = timeit.timeit(lambda: ratings.pick(targets[next(it) % 1000], rng), number=args.number)
+    print(f"pick (bisection):    {elapsed / args.number * 1e9:8.0f} ns/call")
+    elapsed = timeit.timeit(lambda: ratings.pick(targets[next(it) % 1000], rng, ("cat_03",)), number=args.number)
+    print(f"pick (preferred):    {elapsed / args.number * 1e9:8.0f} ns/call")
+    elapsed = timeit.timeit(lambda: ratings.record(next(it) % len(words), 1500.0, 1.0), number=args.number)
+    print(f"record (Elo update): {elapsed / args.number * 1e9:8.0f} ns/call")
+    elapsed = timeit.timeit(lambda: scan_pick(ratings, targets[0], rng), number=3) / 3
+    print(f"linear scan reference: {elapsed * 1e3:.0f} ms/call")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = WordRatings(words, os.path.join(tmp, "ratings.db"), sync_interval=0)
+        for _ in range(args.updates):
+            shared.record(rng.randrange(len(words)), 1500.0, float(rng.random() < 0.6))
+        start = time.perf_counter()
+        changed = shared.sync()
+        print(f"sync of {args.updates} updates: {changed} rows in {(time.perf_counter() - start) * 1e3:.0f} ms")
+        shared.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Many simultaneous players driving app.py through Streamlit's AppTest.
+
+Each simulated session is an AppTest of app.py, run on a thread pool inside
+a worker process like the sessions of one Streamlit server. AppTest swaps a
+process-wide mock runtime in and out around every run, so a worker executes
+one rerun at a time; CPU-bound reruns are serialized by the GIL in a real
+server too. --processes starts several workers sharing one database, as
+behind a load balancer.
+
+A session picks a game mode and plays its rounds: it guesses right or
+wrong, skips, and uses hints and power-ups. It also visits the shop and the
+leaderboard and buys power-up packs when it can afford one. Between clicks
+it pauses for an exponentially distributed time with mean --think seconds,
+like a player reading the screen.
+
+Every click is one AppTest run: the script rerun plus any st.rerun() it
+triggers. Its latency runs from the click, including any wait for reruns
+of other sessions in the same worker, to the end of the run. Latencies are
+reported per screen function rendered by the rerun, with total reruns per
+second.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test [--sessions 20 --think 0.5 --games 2 --processes 1]
+
+Profiles and leaderboards go to a temporary database unless
+WORD_SCRAMBLE_PROFILE_DB is already set.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+SCREEN_FUNCTIONS = {
+    'home': 'show_home_screen',
+    'mode_select': 'show_mode_selection_screen',
+    'playing': 'show_enhanced_game_screen',
+    'complete': 'show_enhanced_final_screen',
+    'leaderboard': 'show_leaderboard_screen',
+    'achievements': 'show_achievements_screen',
+    'shop': 'show_shop_screen',
+}
+MODE_BUTTONS = ["Play Classic Mode", "Play Speed Challenge", "Play Marathon Mode", "Play Category Challenge"]
+HINT_BUTTONS = ["📂 Category", "📖 Definition", "🔄 Re-scramble", "💡 Letter Reveal"]
+
+
+class Recorder:
+    """Rerun latencies per screen function, shared by all session threads"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = 0
+        self.games = 0
+        self._lock = threading.Lock()
+        # AppTest runs one script at a time per process
+        self.run_lock = threading.Lock()
+
+    def add(self, screen, seconds):
+        with self._lock:
+            self.latencies.setdefault(SCREEN_FUNCTIONS.get(screen, screen), []).append(seconds)
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def finished(self, games):
+        with self._lock:
+            self.games += games
+
+
+class Session:
+    """One simulated player"""
+
+    def __init__(self, recorder, rng, think, timeout):
+        self.recorder = recorder
+        self.rng = rng
+        self.think = think
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.games = 0
+
+    def run(self):
+        start = time.perf_counter()
+        with self.recorder.run_lock:
+            self.at.run()
+        elapsed = time.perf_counter() - start
+        if self.at.exception:
+            self.recorder.error()
+            raise RuntimeError(self.at.exception[0].message)
+        self.recorder.add(self.at.session_state.screen, elapsed)
+
+    def pause(self):
+        if self.think > 0:
+            time.sleep(self.rng.expovariate(1 / self.think))
+
+    def buttons(self, prefix):
+        return [b for b in self.at.button if b.label.startswith(prefix) and not b.disabled]
+
+    def click(self, prefix):
+        self.pause()
+        self.buttons(prefix)[0].click()
+        self.run()
+
+    def submit(self, guess=None, label="Submit Guess"):
+        self.pause()
+        if guess is not None:
+            self.at.text_input[0].input(guess)
+        next(b for b in self.at.button if b.label == label).click()
+        self.run()
+
+    def play(self, games):
+        self.run()
+        while self.games < games:
+            self.step()
+
+    def step(self):
+        screen = self.at.session_state.screen
+        rng = self.rng
+        if screen == 'home':
+            choice = rng.random()
+            if choice < 0.15:
+                self.click("🏆 Leaderboard")
+            elif choice < 0.3:
+                self.click("🛒 Power-up Shop")
+            else:
+                self.click("🎯 Start Game")
+        elif screen == 'mode_select':
+            self.click(rng.choice(MODE_BUTTONS))
+        elif screen == 'playing':
+            self.play_round()
+        elif screen == 'complete':
+            self.games += 1
+            self.click("🔄 Play Again" if rng.random() < 0.5 else "🏠 Home")
+        elif screen == 'shop':
+            packs = self.buttons("Buy ")
+            self.click(packs[0].label if packs else "🏠 Back to Home")
+        else:
+            self.click("🏠 Back to Home")
+
+    def play_round(self):
+        engine = self.at.session_state.engine
+        rng = self.rng
+        if engine.awaiting_next_round:
+            self.click("🎯 Next Round")
+            return
+        choice = rng.random()
+        hints = [label for label in HINT_BUTTONS if self.buttons(label)]
+        power_ups = [b.label for b in self.at.button if b.key and b.key.startswith("power_")]
+        if choice < 0.2 and hints:
+            self.click(rng.choice(hints))
+        elif choice < 0.3 and power_ups:
+            self.click(rng.choice(power_ups))
+        elif choice < 0.8:
+            self.submit(engine.current_word)
+        elif choice < 0.95:
+            self.submit("WRONG")
+        else:
+            self.submit(label="Skip Round")
+
+
+def run_session(session, games):
+    try:
+        session.play(games)
+    except Exception as e:
+        print(f"session failed: {e}")
+    session.recorder.finished(session.games)
+
+
+def worker(args):
+    """One worker process: ``sessions`` players on a thread pool; returns its latencies"""
+    first_seed, sessions, think, games, timeout = args
+    recorder = Recorder()
+    # Created here rather than on the pool threads, which have no script context
+    players = [Session(recorder, random.Random(seed), think, timeout)
+               for seed in range(first_seed, first_seed + sessions)]
+    with ThreadPoolExecutor(sessions) as pool:
+        for session in players:
+            pool.submit(run_session, session, games)
+    return recorder.latencies, recorder.errors, recorder.games
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def report(latencies, errors, games, elapsed):
+    total = sum(len(v) for v in latencies.values())
+    print(f"{'screen':<30} {'reruns':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for screen, values in sorted(latencies.items(), key=lambda item: -len(item[1])):
+        print(f"{screen:<30} {len(values):>7} {statistics.median(values) * 1e3:>8.1f} "
+              f"{percentile(values, 0.9) * 1e3:>8.1f} {percentile(values, 0.99) * 1e3:>8.1f} "
+              f"{max(values) * 1e3:>8.1f}")
+    print(f"{total} reruns and {games} games in {elapsed:.1f} s: {total / elapsed:.1f} reruns/s, "
+          f"{errors} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="simultaneous players")
+    parser.add_argument("--think", type=float, default=0.5, help="mean seconds between a player's clicks")
+    parser.add_argument("--games", type=int, default=2, help="games each player completes")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes the sessions are spread over")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed for one rerun")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if "WORD_SCRAMBLE_PROFILE_DB" not in os.environ:
+        os.environ["WORD_SCRAMBLE_PROFILE_DB"] = os.path.join(tempfile.mkdtemp(), "profiles.db")
+    per_worker = [args.sessions // args.processes + (i < args.sessions % args.processes) for i in range(args.processes)]
+    jobs = [(args.seed + sum(per_worker[:i]), n, args.think, args.games, args.timeout)
+            for i, n in enumerate(per_worker) if n]
+
+    start = time.perf_counter()
+    if len(jobs) == 1:
+        results = [worker(jobs[0])]
+    else:
+        with multiprocessing.Pool(len(jobs)) as pool:
+            results = pool.map(worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    latencies = {}
+    for worker_latencies, _, _ in results:
+        for screen, values in worker_latencies.items():
+            latencies.setdefault(screen, []).extend(values)
+    report(latencies, sum(r[1] for r in results), sum(r[2] for r in results), elapsed)
+
+if __name__ == "__main__":
+    main()
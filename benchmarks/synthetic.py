@@ -0,0 +1,25 @@
+"""Deterministic synthetic lexicons for benchmarks."""
+
+import random
+import string
+
+DIFFICULTY_LENGTHS = {"easy": (3, 5), "medium": (6, 8), "hard": (9, 16)}
+
+
+def synthetic_words(count, seed=0):
+    """Return ``count`` distinct upper-case pseudo-words"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 16))))
+    return sorted(words)
+
+
+def synthetic_database(count, categories_per_difficulty=25, seed=0):
+    """Return a WORD_DATABASE-shaped dict holding roughly ``count`` words"""
+    rng = random.Random(seed)
+    database = {d: {f"cat_{i:02d}": [] for i in range(categories_per_difficulty)} for d in DIFFICULTY_LENGTHS}
+    for word in synthetic_words(count, seed):
+        difficulty = next(d for d, (lo, hi) in DIFFICULTY_LENGTHS.items() if lo <= len(word) <= hi)
+        database[difficulty][f"cat_{rng.randrange(categories_per_difficulty):02d}"].append(word)
+    return database
@@ -0,0 +1,266 @@
+"""Word difficulty calibrated from recorded round outcomes.
+
+Round logs hold one round per line, ``WORD<TAB>seconds<TAB>solved<TAB>hints``
+(solved is 1 or 0), in plain or gzip-compressed files. The app's gameplay
+event logs (see event_log.py) can be read too: their guess, skip and
+time_up events are rounds, and every other event is passed over. Build a
+difficulty table from any number of logs with::
+
+    python calibration.py run events/*.tsv.gz -o difficulty.tsv [--workers 8]
+
+The run is a two-pass aggregation that never holds the raw rounds in
+memory. Plain files are split into byte ranges of CHUNK_BYTES and gzip
+files are read whole, one task per worker process. Each task counts rounds
+per word into PARTITIONS hash partitions and spills them to disk. Each
+partition is then merged in a worker of its own, so peak memory is bounded
+by one chunk's distinct words and one partition's words, not by the input.
+
+Words seen in at least MIN_ROUNDS rounds are ranked by hardness, a blend
+of their (smoothed) failure rate and median solve time. The table records
+each word's percentile in that ranking (0 = easiest) and the band it falls
+in. DifficultyTable loads it at startup; the game scales score multipliers
+and initial word ratings by the percentile.
+"""
+
+import argparse
+import gzip
+import multiprocessing
+import os
+import pickle
+import tempfile
+import zlib
+
+from event_log import FIELDS
+
+CHUNK_BYTES = 64 * 2**20
+PARTITIONS = 16
+MIN_ROUNDS = 20
+# Smoothing toward the overall solve rate, in rounds
+PRIOR_ROUNDS = 10
+SOLVE_WEIGHT = 0.7
+TIME_WEIGHT = 0.3
+# Median solve times at or beyond this many seconds count as slowest
+TIME_SCALE = 60.0
+TIME_BUCKETS_PER_SECOND = 2
+ROUND_END_EVENTS = (b'guess', b'skip', b'time_up')
+BANDS = (('easy', 1 / 3), ('medium', 2 / 3), ('hard', 1.0))
+HEADER = "word\trounds\tsolve_rate\tmedian_seconds\tmean_hints\tpercentile\tdifficulty\n"
+
+
+def plan_tasks(paths, chunk_bytes=CHUNK_BYTES):
+    """(path, start, end) byte ranges; gzip files are one task each (end None)"""
+    tasks = []
+    for path in paths:
+        if path.endswith('.gz'):
+            tasks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_bytes):
+            tasks.append((path, start, min(start + chunk_bytes, size)))
+    return tasks
+
+
+def _lines(path, start, end):
+    """Lines starting in [start, end); a line straddling ``start`` belongs to the previous range"""
+    if end is None:
+        with gzip.open(path, 'rb') as fh:
+            yield from fh
+        return
+    with open(path, 'rb') as fh:
+        if start:
+            fh.seek(start - 1)
+            fh.readline()  # Finish the line the previous range ended in
+        pos = fh.tell()
+        while pos < end:
+            line = fh.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line
+
+
+def _partition(word):
+    return zlib.crc32(word) % PARTITIONS
+
+
+def count_rounds(task, spill_dir):
+    """Map step: per-word counts for one task, spilled to one file per partition.
+
+    Returns (spill paths, rounds counted, malformed lines skipped).
+    Per word: [rounds, solved, hints, {solve-time bucket: solved rounds}].
+    """
+    path, start, end = task
+    counts = {}
+    rounds = malformed = 0
+    for line in _lines(path, start, end):
+        fields = line.split(b'\t')
+        try:
+            if len(fields) == len(FIELDS):
+                _, kind, _, _, _, word, seconds, hints, detail = fields
+                if kind not in ROUND_END_EVENTS:
+                    continue
+                solved = kind == b'guess' and detail.strip() == b'1'
+            else:
+                word, seconds, solved, hints = fields
+                solved = solved == b'1'
+            hints = int(hints)  # Tolerates the trailing newline
+            bucket = int(float(seconds) * TIME_BUCKETS_PER_SECOND) if solved else None
+        except ValueError:
+            malformed += 1
+            continue
+        entry = counts.get(word)
+        if entry is None:
+            entry = counts[word] = [0, 0, 0, {}]
+        entry[0] += 1
+        entry[2] += hints
+        if bucket is not None:
+            entry[1] += 1
+            buckets = entry[3]
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        rounds += 1
+
+    partitions = [{} for _ in range(PARTITIONS)]
+    for word, entry in counts.items():
+        partitions[_partition(word)][word] = entry
+    fd, prefix = tempfile.mkstemp(dir=spill_dir)
+    os.close(fd)
+    spills = []
+    for p, partition in enumerate(partitions):
+        if partition:
+            spill = f"{prefix}.{p}"
+            with open(spill, 'wb') as fh:
+                pickle.dump(partition, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            spills.append((p, spill))
+    os.remove(prefix)
+    return spills, rounds, malformed
+
+
+def _median_seconds(buckets, solved):
+    """Median solve time from bucket counts, at the centre of its bucket"""
+    if not solved:
+        return None
+    middle = (solved - 1) / 2
+    seen = 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket]
+        if seen > middle:
+            return (bucket + 0.5) / TIME_BUCKETS_PER_SECOND
+    return None
+
+
+def merge_partition(spills):
+    """Reduce step: merge one partition's spills into (word, rounds, solved, hints, median) rows"""
+    merged = {}
+    for spill in spills:
+        with open(spill, 'rb') as fh:
+            partition = pickle.load(fh)
+        os.remove(spill)
+        for word, (rounds, solved, hints, buckets) in partition.items():
+            entry = merged.get(word)
+            if entry is None:
+                merged[word] = [rounds, solved, hints, buckets]
+                continue
+            entry[0] += rounds
+            entry[1] += solved
+            entry[2] += hints
+            for bucket, count in buckets.items():
+                entry[3][bucket] = entry[3].get(bucket, 0) + count
+    return [(word.decode('utf-8'), rounds, solved, hints, _median_seconds(buckets, solved))
+            for word, (rounds, solved, hints, buckets) in merged.items()]
+
+
+def rank_words(rows, min_rounds=MIN_ROUNDS):
+    """Table rows for words with enough rounds, sorted by word, with hardness percentile and band"""
+    total_rounds = sum(row[1] for row in rows)
+    overall = sum(row[2] for row in rows) / total_rounds if total_rounds else 0.5
+    scored = []
+    for word, rounds, solved, hints, median in rows:
+        if rounds < min_rounds:
+            continue
+        solve_rate = (solved + PRIOR_ROUNDS * overall) / (rounds + PRIOR_ROUNDS)
+        slowness = 1.0 if median is None else min(1.0, median / TIME_SCALE)
+        hardness = SOLVE_WEIGHT * (1 - solve_rate) + TIME_WEIGHT * slowness
+        scored.append((hardness, word, rounds, solved / rounds, median, hints / rounds))
+
+    scored.sort()
+    last = max(1, len(scored) - 1)
+    table = []
+    for rank, (_, word, rounds, solve_rate, median, mean_hints) in enumerate(scored):
+        percentile = rank / last
+        band = next(name for name, upper in BANDS if percentile <= upper)
+        table.append((word, rounds, solve_rate, median, mean_hints, percentile, band))
+    table.sort()
+    return table
+
+
+def calibrate(paths, output, workers=None, chunk_bytes=CHUNK_BYTES, min_rounds=MIN_ROUNDS):
+    """Run the whole pipeline; returns (rounds read, malformed lines, words written)"""
+    tasks = plan_tasks(paths, chunk_bytes)
+    by_partition = [[] for _ in range(PARTITIONS)]
+    rounds = malformed = 0
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output))) as spill_dir, \
+            multiprocessing.Pool(workers) as pool:
+        for spills, task_rounds, task_malformed in pool.starmap(count_rounds, [(t, spill_dir) for t in tasks]):
+            for p, spill in spills:
+                by_partition[p].append(spill)
+            rounds += task_rounds
+            malformed += task_malformed
+        rows = [row for partition in pool.map(merge_partition, by_partition) for row in partition]
+
+    table = rank_words(rows, min_rounds)
+    tmp = f"{output}.tmp"
+    with open(tmp, 'w', encoding='utf-8', newline='\n') as out:
+        out.write(HEADER)
+        for word, word_rounds, solve_rate, median, mean_hints, percentile, band in table:
+            median_text = '' if median is None else f"{median:.2f}"
+            out.write(f"{word}\t{word_rounds}\t{solve_rate:.4f}\t{median_text}\t{mean_hints:.3f}\t"
+                      f"{percentile:.4f}\t{band}\n")
+    os.replace(tmp, output)
+    return rounds, malformed, len(table)
+
+
+class DifficultyTable:
+    """Calibrated hardness percentile (0 easiest .. 1 hardest) by word"""
+
+    def __init__(self, path):
+        self.path = path
+        self._percentiles = {}
+        self._bands = {}
+        with open(path, encoding='utf-8') as fh:
+            if fh.readline() != HEADER:
+                raise ValueError(f"{path}: not a difficulty table")
+            for line in fh:
+                fields = line.rstrip('\n').split('\t')
+                self._percentiles[fields[0]] = float(fields[5])
+                self._bands[fields[0]] = fields[6]
+
+    def __len__(self):
+        return len(self._percentiles)
+
+    def __contains__(self, word):
+        return word in self._percentiles
+
+    def percentile(self, word):
+        """The word's hardness percentile, or None for uncalibrated words"""
+        return self._percentiles.get(word)
+
+    def band(self, word):
+        return self._bands.get(word)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate word difficulty from round logs")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="aggregate round logs into a difficulty table")
+    run.add_argument('logs', nargs='+', help="round or event log files (.gz for gzip)")
+    run.add_argument('-o', '--output', default='difficulty.tsv')
+    run.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    run.add_argument('--min-rounds', type=int, default=MIN_ROUNDS)
+    args = parser.parse_args(argv)
+
+    rounds, malformed, words = calibrate(args.logs, args.output, args.workers, min_rounds=args.min_rounds)
+    print(f"Read {rounds} rounds ({malformed} malformed lines skipped); wrote {words} words to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
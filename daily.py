@@ -0,0 +1,66 @@
+"""The daily challenge: the same puzzles for every player on a given UTC day.
+
+``build_daily_challenge`` derives the day's words, scrambles, hint texts
+and word-bank options from a generator seeded with the date alone, so
+every process that builds it for the same day and lexicon gets the same
+puzzles. It plays the rounds on a throwaway GameEngine to do so, which
+keeps word selection, scrambling, hints and distractors identical to a
+normal game's. The app builds it once per process per day and shares it
+between sessions; GameEngine.start_daily_challenge plays it.
+"""
+
+import random
+import time
+from typing import NamedTuple
+
+from engine import DAILY_MODE, HINT_TYPES, GameEngine
+
+# Difficulty of each round, easing in
+DAILY_DIFFICULTIES = ('easy', 'easy', 'medium', 'medium', 'hard')
+# Draws per round before a word already in the challenge is accepted again
+MAX_ATTEMPTS = 20
+
+
+class DailyPuzzle(NamedTuple):
+    word: str
+    word_id: int
+    category: str
+    difficulty: str
+    scrambled: str
+    hints: dict
+    word_bank: tuple
+
+
+class DailyChallenge(NamedTuple):
+    day: str
+    puzzles: tuple
+
+
+def challenge_day(now=None):
+    """The challenge's day (UTC, ISO format) at ``now``, by default the current time"""
+    return time.strftime('%Y-%m-%d', time.gmtime(time.time() if now is None else now))
+
+
+def build_daily_challenge(day, word_index, anagram_index=None, similar_words=None, define=None,
+                          difficulties=DAILY_DIFFICULTIES):
+    """The puzzles for ``day``; deterministic for a given day and lexicon"""
+    rng = random.Random(f"daily-challenge:{day}")
+    engine = GameEngine(word_index, anagram_index=anagram_index, similar_words=similar_words, define=define,
+                        rng=rng)
+    preferences = engine.profile.preferences
+    preferences.auto_difficulty = False
+    engine.time_per_round = DAILY_MODE['time_per_round']
+
+    puzzles = []
+    seen = set()
+    for difficulty in difficulties:
+        preferences.difficulty = difficulty
+        for _ in range(MAX_ATTEMPTS):
+            engine.start_new_round()
+            if engine.current_word not in seen:
+                break
+        seen.add(engine.current_word)
+        puzzles.append(DailyPuzzle(
+            engine.current_word, engine.current_word_id, engine.current_category, engine.current_difficulty,
+            engine.scrambled_word, {hint: engine.hint(hint) for hint in HINT_TYPES}, tuple(engine.word_bank())))
+    return DailyChallenge(day, tuple(puzzles))
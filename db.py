@@ -0,0 +1,41 @@
+"""SQLite connections and write transactions shared by the persistent stores.
+
+Every store opens its database with ``connect``: WAL mode so readers never
+block the writer, autocommit so transactions are explicit, and a long busy
+timeout for other processes' writes. Writes go through ``transaction``.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+BUSY_TIMEOUT = 30
+
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=BUSY_TIMEOUT)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextmanager
+def transaction(conn, on_error=None):
+    """Run the block in a BEGIN IMMEDIATE transaction and commit it.
+
+    If anything fails, including BEGIN itself on a busy or locked database,
+    ``on_error`` is called first (to put buffered writes back for the next
+    attempt), then the transaction is rolled back if one is open, and the
+    error is re-raised.
+    """
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        try:
+            if on_error is not None:
+                on_error()
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+        raise
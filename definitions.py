@@ -0,0 +1,95 @@
+"""Memory-mapped word definition store with an LRU cache in front.
+
+The store reads a UTF-8 file of ``WORD<TAB>definition`` lines sorted by word.
+Loading only records line offsets; lookups bisect over them and decode a
+single line. Produce a sorted file from any tab-separated list with::
+
+    python definitions.py build raw_definitions.tsv -o definitions.tsv
+"""
+
+import argparse
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+CACHE_SIZE = 4096
+
+
+class DefinitionStore:
+    """Indexed, read-only view of a sorted definitions file"""
+
+    def __init__(self, path, cache_size=CACHE_SIZE):
+        self.path = path
+        with open(path, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size:
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._mmap = b''
+
+        starts = array('Q')
+        data = self._mmap
+        pos = 0
+        while pos < len(data):
+            end = data.find(b'\n', pos)
+            if end == -1:
+                end = len(data)
+            if end > pos:
+                starts.append(pos)
+            pos = end + 1
+        self._starts = starts
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _key_at(self, i):
+        data = self._mmap
+        start = self._starts[i]
+        return data[start:data.find(b'\t', start)]
+
+    def _lookup(self, word):
+        key = word.encode('utf-8')
+        i = bisect_left(range(len(self._starts)), key, key=self._key_at)
+        if i == len(self._starts) or self._key_at(i) != key:
+            return None
+        data = self._mmap
+        start = self._starts[i] + len(key) + 1
+        end = data.find(b'\n', start)
+        return str(data[start:end if end != -1 else len(data)], 'utf-8').rstrip('\r')
+
+
+def build_definitions(lines):
+    """Normalise ``WORD<TAB>definition`` lines into sorted, de-duplicated output"""
+    entries = {}
+    for line in lines:
+        word, sep, definition = line.rstrip('\r\n').partition('\t')
+        word = word.strip().upper()
+        if sep and word and definition.strip():
+            entries.setdefault(word, definition.strip())
+    for word in sorted(entries, key=lambda w: w.encode('utf-8')):
+        yield f"{word}\t{entries[word]}\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a sorted definitions file for DefinitionStore")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="sort and normalise a tab-separated definitions list")
+    build.add_argument('source')
+    build.add_argument('-o', '--output', default='definitions.tsv')
+    args = parser.parse_args(argv)
+
+    # Workers may have the old file mapped; replace it rather than truncating it under them
+    tmp = f"{args.output}.tmp"
+    with open(args.source, encoding='utf-8') as src, open(tmp, 'w', encoding='utf-8', newline='\n') as out:
+        count = 0
+        for line in build_definitions(src):
+            out.write(line)
+            count += 1
+    os.replace(tmp, args.output)
+    print(f"Wrote {count} definitions to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,806 @@
+"""Word Scramble game rules, independent of Streamlit.
+
+GameEngine owns one player's profile and the state of their current game.
+Its methods mutate that state and return a list of Event tuples (level-ups,
+achievements, power-up and round outcomes) for the caller to render, so the
+same engine runs inside a Streamlit session, a benchmark or another frontend.
+"""
+
+import random
+import time
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from metrics import timed
+from player_state import PlayerProfile, RoundLog
+from ratings import target_rating
+from scramble import scramble_word
+
+# Game configuration
+GAME_CONFIG = {
+    "base_rounds": 5,
+    "base_time_per_round": 60,
+    "base_points_per_correct": 10,
+    "time_bonus_multiplier": 0.1,
+    "xp_per_game": 50,
+    "xp_per_correct": 25,
+    "level_up_base_xp": 500,
+    "daily_streak_bonus": 1.2,
+    "achievement_xp_bonus": 100
+}
+
+# Achievement definitions
+ACHIEVEMENTS = {
+    "first_game": {"name": "Getting Started", "desc": "Complete your first game", "xp": 100, "icon": "🎮"},
+    "perfect_game": {"name": "Perfectionist", "desc": "Get all words correct in one game", "xp": 200, "icon": "🎯"},
+    "speed_demon": {"name": "Speed Demon", "desc": "Solve a word in under 10 seconds", "xp": 150, "icon": "⚡"},
+    "streak_3": {"name": "Hot Streak", "desc": "Get 3 words correct in a row", "xp": 100, "icon": "🔥"},
+    "streak_7": {"name": "Daily Warrior", "desc": "Play for 7 consecutive days", "xp": 300, "icon": "🗡️"},
+    "word_master": {"name": "Word Master", "desc": "Solve 100 words total", "xp": 500, "icon": "📚"},
+    "hint_less": {"name": "No Help Needed", "desc": "Complete a game without using hints", "xp": 250, "icon": "🧠"},
+    "power_user": {"name": "Power User", "desc": "Use 10 power-ups in total", "xp": 200, "icon": "⭐"},
+    "social_butterfly": {"name": "Social Butterfly", "desc": "Share your score", "xp": 150, "icon": "📱"},
+    "level_10": {"name": "Rising Star", "desc": "Reach level 10", "xp": 400, "icon": "🌟"},
+    "category_master": {"name": "Category Expert", "desc": "Complete all categories", "xp": 600, "icon": "🏆"}
+}
+
+# Power-up definitions
+POWER_UPS = {
+    "time_freeze": {"name": "Time Freeze", "desc": "Pause timer for 10 seconds", "cost": 2, "icon": "⏰", "duration": 10},
+    "double_points": {"name": "Double Points", "desc": "2x points for this round", "cost": 3, "icon": "💰", "multiplier": 2},
+    "letter_reveal": {"name": "Letter Reveal", "desc": "Show 2 random letters", "cost": 2, "icon": "💡", "count": 2},
+    "word_bank": {"name": "Word Bank", "desc": "Show 3 possible answers", "cost": 4, "icon": "📝", "options": 3},
+    "shuffle_master": {"name": "Shuffle Master", "desc": "Re-scramble optimally", "cost": 1, "icon": "🔄", "uses": 1}
+}
+
+# Available game modes
+GAME_MODES = {
+    'classic': {
+        'name': 'Classic Mode',
+        'desc': 'Traditional 5-round word scramble',
+        'rounds': 5,
+        'time_per_round': 60,
+        'icon': '🎯'
+    },
+    'speed': {
+        'name': 'Speed Challenge',
+        'desc': '10 rounds, 30 seconds each',
+        'rounds': 10,
+        'time_per_round': 30,
+        'icon': '⚡'
+    },
+    'marathon': {
+        'name': 'Marathon Mode',
+        'desc': '20 rounds with increasing difficulty',
+        'rounds': 20,
+        'time_per_round': 45,
+        'icon': '🏃'
+    },
+    'themed': {
+        'name': 'Category Challenge',
+        'desc': 'Focus on specific word categories',
+        'rounds': 8,
+        'time_per_round': 50,
+        'icon': '📚'
+    }
+}
+
+# The daily challenge (daily.py): one set of puzzles per day, shared by every player
+DAILY_MODE = {
+    'name': 'Daily Challenge',
+    'desc': "Today's 5 words, the same for everyone",
+    'time_per_round': 60,
+    'icon': '📅'
+}
+
+# Power-up packages sold for coins
+SHOP_ITEMS = {
+    'power_pack_small': {
+        'name': 'Starter Pack',
+        'desc': '2 Time Freeze + 1 Double Points',
+        'cost': 5,
+        'items': {'time_freeze': 2, 'double_points': 1}
+    },
+    'power_pack_medium': {
+        'name': 'Pro Pack',
+        'desc': '3 Letter Reveals + 2 Word Banks',
+        'cost': 8,
+        'items': {'letter_reveal': 3, 'word_bank': 2}
+    },
+    'power_pack_large': {
+        'name': 'Ultimate Pack',
+        'desc': 'All power-ups bundle',
+        'cost': 12,
+        'items': {'time_freeze': 2, 'double_points': 2, 'letter_reveal': 3, 'word_bank': 2, 'shuffle_master': 5}
+    }
+}
+
+DIFFICULTY_MULTIPLIERS = {'easy': 1.0, 'medium': 1.5, 'hard': 2.0}
+DIFFICULTY_XP = {'easy': 15, 'medium': 25, 'hard': 40}
+HINT_TYPES = ('category', 'definition', 'shuffle', 'reveal')
+SKIP_GUESS = "__SKIP__"
+
+
+def _new_hints():
+    return dict.fromkeys(HINT_TYPES, True)
+
+
+class Event(NamedTuple):
+    """Something the player should be told about, or a frontend may record.
+
+    ``kind`` is one of: level_up, achievement, power_up, hint, correct,
+    incorrect, time_up, game_complete, purchase, reward, daily_streak.
+    """
+    kind: str
+    message: str = ''
+    data: dict | None = None
+
+
+class GameEngine:
+    """One player's profile and current game.
+
+    ``word_index`` picks words (see word_index.WordIndex); ``anagram_index``
+    optionally accepts anagrams of the answer; ``similar_words`` (see
+    similar_words.SimilarWords) supplies real-word distractors for the word
+    bank; ``word_ratings`` (see ratings.WordRatings) matches words to the
+    player's rating under auto difficulty and is updated after every round;
+    ``difficulty_table`` (see calibration.DifficultyTable) scales the score
+    multiplier of calibrated words by how hard players found them;
+    ``event_log`` (see event_log.EventLog) records rounds, guesses, hints,
+    power-ups, purchases and completed games under ``player_id``;
+    ``define(word, category)`` returns definition-hint text. ``rng`` and ``clock`` default to the
+    ``random`` module and ``time.time``.
+    """
+
+    def __init__(self, word_index, anagram_index=None, define=None, profile=None, rng=random, clock=time.time,
+                 similar_words=None, word_ratings=None, difficulty_table=None, event_log=None, player_id=''):
+        self.word_index = word_index
+        self.anagram_index = anagram_index
+        self.similar_words = similar_words
+        self.word_ratings = word_ratings
+        self.difficulty_table = difficulty_table
+        self.event_log = event_log
+        self.player_id = player_id
+        self.define = define
+        self.profile = profile if profile is not None else PlayerProfile()
+        self.rng = rng
+        self.clock = clock
+
+        self.game_mode = 'classic'
+        self.total_rounds = GAME_CONFIG['base_rounds']
+        self.time_per_round = GAME_CONFIG['base_time_per_round']
+        self._start_session()
+
+    def _start_session(self):
+        self.current_category = ''
+        self.current_difficulty = 'medium'
+        self.last_update = self.clock()
+        self.reset_game()
+
+    def reset_game(self):
+        """Clear the current game, keeping the profile and the selected mode"""
+        self.current_round = 1
+        self.score = 0
+        self.game_start_time = None
+        self.game_difficulty = ''
+        self.daily_challenge = None
+        self.daily_ranked = True
+        self.current_word = ''
+        self.current_word_id = None
+        self.scrambled_word = ''
+        self.round_start_time = None
+        self.hint_used = False
+        self.hints_available = _new_hints()
+        self.feedback_message = ''
+        self.feedback_type = 'info'
+        self.awaiting_next_round = False
+        self.game_complete = False
+        self.round_results = RoundLog()
+        self.active_power_ups = {}
+        self.round_multiplier = 1
+        self.time_freeze_remaining = 0
+        self.freeze_until = 0
+        self.letters_revealed = []
+        self.word_bank_shown = False
+        self.word_bank_options = []
+        self.current_hint_text = ''
+        self.show_hint = False
+
+    # Progression
+
+    def level_info(self):
+        """Calculate level progression info"""
+        current_level = self.profile.level
+        current_xp = self.profile.xp
+
+        # Calculate XP needed for current level
+        xp_for_current_level = GAME_CONFIG['level_up_base_xp'] * (current_level - 1) * 1.5
+        xp_for_next_level = GAME_CONFIG['level_up_base_xp'] * current_level * 1.5
+
+        xp_progress = current_xp - xp_for_current_level
+        xp_needed = xp_for_next_level - xp_for_current_level
+
+        progress_percentage = min(100, (xp_progress / xp_needed) * 100) if xp_needed > 0 else 100
+
+        return {
+            'current_level': current_level,
+            'xp_progress': xp_progress,
+            'xp_needed': xp_needed,
+            'progress_percentage': progress_percentage,
+            'next_level': current_level + 1
+        }
+
+    def add_xp(self, amount, reason=""):
+        """Add XP and handle level ups"""
+        profile = self.profile
+        profile.xp += amount
+        events = []
+
+        # Check for level up
+        if self.level_info()['progress_percentage'] >= 100:
+            profile.level += 1
+            profile.coins += profile.level * 2  # Coins reward for leveling
+            events.append(Event('level_up', f"🎉 Level Up! You're now level {profile.level}! Earned {profile.level * 2} coins!",
+                                {'level': profile.level, 'coins': profile.level * 2, 'reason': reason}))
+
+            # Check for level-based achievements
+            if profile.level == 10:
+                events += self.unlock_achievement('level_10')
+        return events
+
+    def unlock_achievement(self, achievement_id):
+        """Unlock an achievement and add rewards"""
+        if achievement_id in self.profile.achievements_unlocked:
+            return []
+        achievement = ACHIEVEMENTS[achievement_id]
+        self.profile.achievements_unlocked.append(achievement_id)
+        events = self.add_xp(achievement['xp'], f"Achievement: {achievement['name']}")
+        events.append(Event('achievement', f"🏆 Achievement Unlocked: {achievement['icon']} {achievement['name']}!",
+                            {'achievement': achievement_id}))
+        return events
+
+    # Rounds
+
+    @timed('select_word')
+    def select_word(self):
+        """Intelligent word selection based on player performance and preferences"""
+        preferences = self.profile.preferences
+        word_index = self.word_index
+
+        if preferences.auto_difficulty and self.word_ratings is not None:
+            # Words the player should solve about TARGET_SUCCESS of the time
+            word_id = self.word_ratings.pick(target_rating(self.profile.rating), self.rng,
+                                             preferences.preferred_categories)
+            difficulty, category = word_index.group_key(word_id)
+            self.current_word_id = word_id
+            self.current_difficulty = difficulty
+            self.current_category = category
+            return word_index.words[word_id], category, difficulty
+
+        if preferences.auto_difficulty:
+            # Without word ratings, bands follow lifetime accuracy
+            accuracy = self.profile.statistics.accuracy
+
+            if accuracy < 0.4:
+                difficulty = 'easy'
+            elif accuracy > 0.8:
+                difficulty = 'hard'
+            else:
+                difficulty = 'medium'
+        else:
+            difficulty = preferences.difficulty
+        difficulty = word_index.band(difficulty)
+
+        # Select category and word from the precomputed index
+        word_id, category = word_index.pick_id(difficulty, preferences.preferred_categories, self.rng)
+
+        self.current_word_id = word_id
+        self.current_difficulty = difficulty
+        self.current_category = category
+        return word_index.words[word_id], category, difficulty
+
+    def start_game(self, mode_id):
+        """Apply a game mode's settings and start its first round"""
+        mode = GAME_MODES[mode_id]
+        self.game_mode = mode_id
+        self.total_rounds = mode['rounds']
+        self.time_per_round = mode['time_per_round']
+        self.game_start_time = self.clock()
+        self.daily_challenge = None
+        return self.start_new_round()
+
+    def start_daily_challenge(self, challenge):
+        """Start the first round of a daily challenge (see daily.build_daily_challenge).
+
+        Each day's challenge is played once: when the player has already
+        completed it nothing starts and ``daily_challenge`` stays None. One
+        started earlier that day and left unfinished, its answers already
+        seen, can be played again but is not ranked.
+        """
+        profile = self.profile
+        if profile.last_played == challenge.day:
+            return []
+        self.daily_ranked = profile.daily_started != challenge.day
+        profile.daily_started = challenge.day
+        self.game_mode = 'daily'
+        self.total_rounds = len(challenge.puzzles)
+        self.time_per_round = DAILY_MODE['time_per_round']
+        self.game_start_time = self.clock()
+        self.daily_challenge = challenge
+        return self.start_new_round()
+
+    def daily_puzzle(self):
+        """The current round's puzzle in a daily challenge, else None"""
+        if self.daily_challenge is None:
+            return None
+        return self.daily_challenge.puzzles[self.current_round - 1]
+
+    @property
+    def current_anagram_count(self):
+        """Valid answers for the current word (at least 1), looked up only when asked"""
+        if self.anagram_index is None or not self.current_word:
+            return 1
+        return max(1, self.anagram_index.anagram_count(self.current_word))
+
+    def start_new_round(self):
+        """Initialize a new game round"""
+        puzzle = self.daily_puzzle()
+        if puzzle is None:
+            word, category, difficulty = self.select_word()
+            scrambled = scramble_word(word, self.rng)
+        else:
+            word, category, difficulty, scrambled = puzzle.word, puzzle.category, puzzle.difficulty, puzzle.scrambled
+            self.current_word_id = puzzle.word_id
+
+        self.current_word = word
+        self.scrambled_word = scrambled
+        self.current_category = category
+        self.current_difficulty = difficulty
+        self.round_start_time = self.clock()
+        self.hint_used = False
+        self.hints_available = _new_hints()
+        self.feedback_message = ''
+        self.feedback_type = 'info'
+        self.awaiting_next_round = False
+        self.last_update = self.clock()
+
+        # Reset round-specific power-up effects
+        self.round_multiplier = 1
+        self.letters_revealed = []
+        self.word_bank_shown = False
+        self.word_bank_options = []
+
+        # Reset hint display state
+        self.current_hint_text = ''
+        self.show_hint = False
+        if self.current_round == 1:
+            self.game_difficulty = self.current_difficulty
+        self.log_event('round_start', detail=self.current_round)
+        return []
+
+    def log_event(self, kind, seconds='', hints='', detail='', difficulty=None):
+        """Record an event about the current round, if an event log is attached"""
+        if self.event_log is not None:
+            self.event_log.emit(kind, self.player_id, self.game_mode,
+                                self.current_difficulty if difficulty is None else difficulty, self.current_word,
+                                seconds, hints, detail)
+
+    def round_hints_used(self):
+        """Hint types used this round"""
+        return len([h for h in self.hints_available.values() if not h])
+
+    def difficulty_multiplier(self, difficulty, word=None):
+        """The band's multiplier, or one between easy and hard from the word's calibrated percentile"""
+        if word is not None and self.difficulty_table is not None:
+            percentile = self.difficulty_table.percentile(word)
+            if percentile is not None:
+                easy, hard = DIFFICULTY_MULTIPLIERS['easy'], DIFFICULTY_MULTIPLIERS['hard']
+                return easy + percentile * (hard - easy)
+        return DIFFICULTY_MULTIPLIERS[difficulty]
+
+    def calculate_score(self, time_taken, difficulty, hints_used, word=None):
+        """Advanced scoring system with multiple factors"""
+        base_points = GAME_CONFIG['base_points_per_correct']
+
+        # Difficulty multiplier
+        difficulty_bonus = base_points * self.difficulty_multiplier(difficulty, word)
+
+        # Time bonus
+        time_remaining = max(0, self.time_per_round - time_taken)
+        time_bonus = int(time_remaining * GAME_CONFIG['time_bonus_multiplier'])
+
+        # Hint penalty
+        hint_penalty = hints_used * 2
+
+        # Round multiplier (power-ups)
+        multiplier = self.round_multiplier
+
+        # Streak bonus
+        streak_bonus = min(self.profile.current_streak * 2, 20)
+
+        total_score = int((difficulty_bonus + time_bonus + streak_bonus - hint_penalty) * multiplier)
+
+        return max(5, total_score)  # Minimum 5 points
+
+    def is_correct(self, guess):
+        """The target word or any valid anagram of it"""
+        return guess == self.current_word or (
+            self.anagram_index is not None and self.anagram_index.is_valid_answer(guess, self.current_word))
+
+    def process_guess(self, user_guess):
+        """Score a guess (SKIP_GUESS skips the round) and end the round"""
+        current_word = self.current_word
+        profile = self.profile
+        elapsed_time = self.clock() - self.round_start_time
+
+        if self.is_correct(user_guess):
+            hints_used = self.round_hints_used()
+
+            round_score = self.calculate_score(elapsed_time, self.current_difficulty, hints_used, current_word)
+            self.score += round_score
+
+            # Update player statistics
+            profile.statistics.words_correct += 1
+            profile.statistics.words_total += 1
+            profile.current_streak += 1
+            profile.best_streak = max(profile.best_streak, profile.current_streak)
+
+            if elapsed_time < profile.statistics.fastest_solve:
+                profile.statistics.fastest_solve = elapsed_time
+            self.rate_round(1.0)
+            self.log_event('guess', elapsed_time, hints_used, 1)
+
+            # Store round result
+            self.round_results.append(current_word, elapsed_time, round_score, self.current_difficulty, True)
+
+            if user_guess == current_word:
+                self.feedback_message = f"🎉 Correct! '{current_word}' is right! +{round_score} points!"
+            else:
+                self.feedback_message = f"🎉 Correct! '{user_guess}' is a valid anagram of '{current_word}'! +{round_score} points!"
+            self.feedback_type = 'success'
+            self.awaiting_next_round = True
+            events = [Event('correct', self.feedback_message, {
+                'word': current_word, 'guess': user_guess, 'points': round_score,
+                'time': elapsed_time, 'hints_used': hints_used, 'difficulty': self.current_difficulty})]
+
+            # Check achievements
+            if elapsed_time < 10:
+                events += self.unlock_achievement('speed_demon')
+            if profile.current_streak >= 3:
+                events += self.unlock_achievement('streak_3')
+            if hints_used == 0 and self.current_round == self.total_rounds:
+                events += self.unlock_achievement('hint_less')
+
+            # XP reward
+            events += self.add_xp(DIFFICULTY_XP[self.current_difficulty], "Correct answer")
+            return events
+
+        # Incorrect guess or skip
+        profile.statistics.words_total += 1
+        profile.current_streak = 0
+        self.rate_round(0.0)
+        if self.event_log is not None:
+            skipped = user_guess == SKIP_GUESS
+            self.log_event('skip' if skipped else 'guess', elapsed_time, self.round_hints_used(), '' if skipped else 0)
+
+        self.round_results.append(current_word, elapsed_time, 0, self.current_difficulty, False)
+
+        self.feedback_message = f"❌ '{user_guess}' is incorrect. The word was '{current_word}'"
+        self.feedback_type = 'error'
+        self.awaiting_next_round = True
+        return [Event('incorrect', self.feedback_message, {
+            'word': current_word, 'guess': user_guess, 'skipped': user_guess == SKIP_GUESS,
+            'time': elapsed_time, 'difficulty': self.current_difficulty})]
+
+    def rate_round(self, outcome):
+        """Update the player's and the word's ratings for a solved (1) or failed (0) round"""
+        if self.word_ratings is not None and self.current_word_id is not None:
+            profile = self.profile
+            profile.rating = self.word_ratings.record(self.current_word_id, profile.rating, outcome,
+                                                      profile.statistics.words_total)
+
+    def tick(self):
+        """Advance the freeze countdown and end the round if time ran out"""
+        current_time = self.clock()
+        step = current_time - self.last_update
+        self.last_update = current_time
+
+        # Handle time freeze
+        if self.time_freeze_remaining > 0:
+            self.time_freeze_remaining = max(0, self.time_freeze_remaining - step)
+            return []
+
+        elapsed = current_time - self.round_start_time
+        if elapsed >= self.time_per_round and not self.awaiting_next_round:
+            return self.expire_round()
+        return []
+
+    def end_freeze(self):
+        """A time freeze ran out (reported by a client-side timer)"""
+        self.time_freeze_remaining = 0
+        self.last_update = self.clock()
+        return []
+
+    def expire_round(self):
+        """End the current round as timed out"""
+        self.feedback_message = f"⏰ Time's up! The word was '{self.current_word}'"
+        self.feedback_type = 'error'
+        self.awaiting_next_round = True
+
+        # Record as incorrect
+        self.profile.statistics.words_total += 1
+        self.profile.current_streak = 0
+        self.rate_round(0.0)
+        if self.event_log is not None:
+            self.log_event('time_up', self.time_per_round, self.round_hints_used())
+        return [Event('time_up', self.feedback_message, {'word': self.current_word, 'difficulty': self.current_difficulty})]
+
+    def next_round(self):
+        """Start the next round, or finish the game after the last one"""
+        self.current_round += 1
+        self.feedback_message = ''
+        self.awaiting_next_round = False
+
+        if self.current_round <= self.total_rounds:
+            return self.start_new_round()
+
+        # Game complete
+        profile = self.profile
+        events = []
+        if self.daily_challenge is not None and (not self.daily_ranked
+                                                 or profile.last_played == self.daily_challenge.day):
+            # Restarted, or completed again from another session on the same day: no totals, rewards or ranking
+            self.game_complete = True
+            events.append(Event('game_complete', data={'mode': self.game_mode, 'score': self.score,
+                                                       'perfect': False, 'ranked': False}))
+            return events
+        profile.total_games += 1
+        profile.total_score += self.score
+
+        # Check for perfect game
+        all_correct = self.round_results.all_correct()
+        if all_correct:
+            events += self.unlock_achievement('perfect_game')
+            profile.statistics.perfect_games += 1
+
+        # Check first game
+        if profile.total_games == 1:
+            events += self.unlock_achievement('first_game')
+
+        # Check word master (100 words)
+        if profile.statistics.words_correct >= 100:
+            events += self.unlock_achievement('word_master')
+
+        if self.daily_challenge is not None:
+            events += self.record_daily_streak(self.daily_challenge.day)
+
+        # Add game completion XP
+        events += self.add_xp(GAME_CONFIG['xp_per_game'], "Game completed")
+        self.game_complete = True
+        if self.game_start_time is not None:
+            # Logged under the difficulty the game started at, like its round 1 round_start
+            self.log_event('game_complete', self.clock() - self.game_start_time, detail=self.score,
+                           difficulty=self.game_difficulty)
+        events.append(Event('game_complete', data={'mode': self.game_mode, 'score': self.score, 'perfect': all_correct,
+                                                   'ranked': True}))
+        return events
+
+    def record_daily_streak(self, day):
+        """Count a completed daily challenge towards the run of consecutive days"""
+        profile = self.profile
+        if profile.last_played == day:
+            return []
+        yesterday = (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+        profile.daily_streak = profile.daily_streak + 1 if profile.last_played == yesterday else 1
+        profile.last_played = day
+        days = profile.daily_streak
+        events = [Event('daily_streak', f"📅 Daily streak: {days} day{'s' if days != 1 else ''}!",
+                        {'streak': days, 'day': day})]
+        if days >= 7:
+            events += self.unlock_achievement('streak_7')
+        return events
+
+    # Hints and power-ups
+
+    def hint(self, hint_type):
+        """Hint text of the given type for the current word"""
+        if self.daily_challenge is not None:
+            puzzle = self.daily_puzzle()
+            if hint_type in puzzle.hints:
+                return puzzle.hints[hint_type]
+        word = self.current_word
+        category = self.current_category
+
+        # Ensure we have valid word and category
+        if not word:
+            return "No word available for hint"
+        if not category:
+            category = "unknown"
+
+        try:
+            if hint_type == 'category':
+                return f"💡 Category: This is a {category.replace('_', ' ')}"
+            elif hint_type == 'definition':
+                if self.define is None:
+                    return f"💭 A word related to {category.replace('_', ' ')}"
+                return self.define(word, self.current_category)
+            elif hint_type == 'shuffle':
+                new_scramble = scramble_word(word, self.rng, avoid=(self.scrambled_word,))
+                return f"🔄 Try this arrangement: {new_scramble}"
+            elif hint_type == 'reveal':
+                return letter_reveal_hint(word)
+            else:
+                return "Hint type not available"
+        except Exception as e:
+            return f"Error generating hint: {str(e)}"
+
+    def use_hint(self, hint_type, free=False):
+        """Show a hint and mark its type used; free (ad-rewarded) hints are not counted"""
+        hint_text = self.hint(hint_type)
+        self.current_hint_text = f"🎁 Free hint: {hint_text}" if free else hint_text
+        self.show_hint = True
+        self.hints_available[hint_type] = False
+        if not free:
+            self.profile.statistics.hints_used += 1
+        self.log_event('hint', detail=f"{hint_type}:free" if free else hint_type)
+        return [Event('hint', data={'hint': hint_type, 'free': free, 'word': self.current_word})]
+
+    def use_free_hint(self):
+        """Grant a random hint type that has not been used this round"""
+        available_hints = [k for k, v in self.hints_available.items() if v]
+        if not available_hints:
+            return []
+        return self.use_hint(self.rng.choice(available_hints), free=True)
+
+    def word_bank(self):
+        """The answer and look-alike distractors in random order, chosen once when the word bank opens"""
+        puzzle = self.daily_puzzle()
+        if puzzle is not None:
+            return list(puzzle.word_bank)
+        word = self.current_word
+        count = POWER_UPS['word_bank']['options'] - 1
+        if self.similar_words is not None:
+            distractors = self.similar_words.distractors(word, count, self.rng, self.current_difficulty,
+                                                         self.current_category)
+        else:
+            distractors = []
+        if len(distractors) < count:
+            distractors += fake_words(word, count - len(distractors), self.rng)
+        options = [word] + distractors
+        self.rng.shuffle(options)
+        return options
+
+    def use_power_up(self, power_up_type):
+        """Activate power-up effects; returns no events when none is owned"""
+        power_ups = self.profile.power_ups
+        if power_ups.get(power_up_type, 0) <= 0:
+            return []
+        power_ups[power_up_type] -= 1
+        self.profile.statistics.power_ups_used += 1
+        self.log_event('power_up', detail=power_up_type)
+        message = ''
+
+        if power_up_type == 'time_freeze':
+            self.time_freeze_remaining = POWER_UPS['time_freeze']['duration']
+            self.freeze_until = self.clock() + POWER_UPS['time_freeze']['duration']
+            message = "⏰ Time frozen for 10 seconds!"
+        elif power_up_type == 'double_points':
+            self.round_multiplier = 2
+            message = "💰 Double points activated for this round!"
+        elif power_up_type == 'letter_reveal':
+            word = self.current_word
+            available_positions = [i for i in range(len(word)) if i not in self.letters_revealed]
+            if available_positions:
+                reveal_positions = self.rng.sample(available_positions, min(2, len(available_positions)))
+                self.letters_revealed.extend(reveal_positions)
+                message = f"💡 Letters revealed at positions: {[p+1 for p in reveal_positions]}"
+        elif power_up_type == 'word_bank':
+            self.word_bank_shown = True
+            self.word_bank_options = self.word_bank()
+            message = "📝 Word bank activated!"
+        elif power_up_type == 'shuffle_master':
+            self.scrambled_word = scramble_word(self.current_word, self.rng, avoid=(self.scrambled_word,))
+            message = "🔄 Word re-scrambled optimally!"
+
+        events = [Event('power_up', message, {'power_up': power_up_type, 'word': self.current_word})]
+
+        # Check achievement
+        if self.profile.statistics.power_ups_used >= 10:
+            events += self.unlock_achievement('power_user')
+        return events
+
+    # Coins and rewards
+
+    def purchase(self, item_id):
+        """Buy a shop package; returns no events when the player cannot afford it"""
+        item = SHOP_ITEMS[item_id]
+        if self.profile.coins < item['cost']:
+            return []
+        self.profile.coins -= item['cost']
+        for power_id, amount in item['items'].items():
+            self.profile.power_ups[power_id] = self.profile.power_ups.get(power_id, 0) + amount
+        self.log_event('purchase', detail=item_id)
+        return [Event('purchase', f"✅ Purchased {item['name']}!", {'item': item_id, 'cost': item['cost']})]
+
+    def earn_coins(self, amount):
+        self.profile.coins += amount
+        return [Event('reward', f"🎁 Earned {amount} coins!", {'coins': amount})]
+
+    def grant_random_power_up(self):
+        power_up = self.rng.choice(list(POWER_UPS.keys()))
+        self.profile.power_ups[power_up] = self.profile.power_ups.get(power_up, 0) + 1
+        return [Event('reward', f"🎁 Earned {POWER_UPS[power_up]['name']}!", {'power_up': power_up})]
+
+    def share_score(self):
+        return self.unlock_achievement('social_butterfly')
+
+    # Idle sessions
+
+    def shared_objects(self):
+        """Objects this engine uses but does not own; every session references the same ones"""
+        return (self.word_index, self.anagram_index, self.similar_words, self.word_ratings, self.difficulty_table,
+                self.event_log, self.daily_challenge, self.define, self.rng, self.clock)
+
+    def hibernate(self):
+        """Drop the profile and all game state, keeping the selected mode; returns the profile.
+
+        The caller persists the returned profile and hands it back to
+        ``resume`` when the player returns. Until then only ``profile``
+        (None) and the attributes in _KEPT_WHILE_HIBERNATING remain.
+        """
+        profile = self.profile
+        kept = {name: getattr(self, name) for name in _KEPT_WHILE_HIBERNATING}
+        self.__dict__.clear()
+        self.__dict__.update(kept)
+        self.profile = None
+        return profile
+
+    def resume(self, profile):
+        self.profile = profile if profile is not None else PlayerProfile()
+        self._start_session()
+
+
+_KEPT_WHILE_HIBERNATING = ('word_index', 'anagram_index', 'similar_words', 'word_ratings', 'difficulty_table',
+                           'event_log', 'daily_challenge', 'player_id', 'define', 'rng', 'clock', 'game_mode',
+                           'total_rounds', 'time_per_round')
+
+
+def fake_words(real_word, count, rng=random):
+    """Letter-mangled copies of ``real_word``, for when the lexicon has no look-alikes"""
+    letters = list(real_word)
+    real_letters = sorted(letters)
+    fakes = []
+
+    for _ in range(count):
+        fake_letters = letters.copy()
+        # Add/remove/change letters slightly
+        if len(fake_letters) > 4:
+            fake_letters.pop(rng.randint(0, len(fake_letters)-1))
+        if len(fake_letters) < 8:
+            fake_letters.insert(rng.randint(0, len(fake_letters)), rng.choice('AEIOU'))
+
+        rng.shuffle(fake_letters)
+        fake_word = ''.join(fake_letters)
+        if sorted(fake_letters) != real_letters and fake_word not in fakes:
+            fakes.append(fake_word)
+        else:
+            fakes.append(''.join(rng.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=len(real_word))))
+
+    return fakes
+
+
+def letter_reveal_hint(word):
+    """Smart letter reveal based on word length"""
+    if not word:
+        return "💡 No word available for letter reveal"
+
+    try:
+        if len(word) <= 4:
+            return f"💡 First letter: {word[0]}"
+        elif len(word) <= 7:
+            return f"💡 Letters: {word[0]}_{'_' * (len(word)-2)}{word[-1]}"
+        else:
+            mid = len(word) // 2
+            return f"💡 Letters: {word[0]}_{word[mid]}_{'_' * (len(word)-3)}{word[-1]}"
+    except Exception as e:
+        return f"💡 Error revealing letters: {str(e)}"
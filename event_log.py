@@ -0,0 +1,175 @@
+"""Append-only gameplay event log, buffered in memory and written in batches.
+
+``emit`` appends one tuple to a deque, which is safe without a lock and
+never waits on I/O; a background writer drains the deque every
+``flush_interval`` seconds (sooner once BATCH_SIZE events are waiting) and
+appends them as tab-separated lines to a gzip file. Each line holds the
+columns in FIELDS::
+
+    time  kind  player  mode  difficulty  word  seconds  hints  detail
+
+with empty strings for fields a kind does not use (seconds are written to
+two decimals; tabs and line breaks inside a field become spaces). Kinds and
+their detail:
+
+    round_start       round number
+    guess             1 solved, 0 wrong (seconds and hints used in the round)
+    skip, time_up     (seconds and hints used in the round)
+    hint              hint type, ``:free`` appended for ad-rewarded hints
+    power_up          power-up id
+    purchase          shop item id
+    ad_slot_rendered  banner slot (top, footer) shown on a new screen; not an impression
+    ad_view           rewarded:<reward>, for a rewarded ad watched
+    game_complete     final score (seconds: game duration; difficulty: the game's first round's)
+
+The active file is ``<name>.tsv.gz.part``; it is renamed to ``<name>.tsv.gz``
+once it reaches ``max_bytes`` compressed or has been open ``max_age``
+seconds, and at exit, so readers only ever see complete files. If the
+writer falls behind by ``max_buffered`` events, further events are counted
+in ``dropped`` instead of growing the buffer.
+"""
+
+import atexit
+import gzip
+import os
+import threading
+import time
+from collections import deque
+
+FIELDS = ('time', 'kind', 'player', 'mode', 'difficulty', 'word', 'seconds', 'hints', 'detail')
+_SEPARATORS = str.maketrans('\t\r\n', '   ')
+FLUSH_INTERVAL = 1.0
+BATCH_SIZE = 10_000
+MAX_BUFFERED = 1_000_000
+MAX_BYTES = 32 * 2**20
+MAX_AGE = 3600.0
+COMPRESS_LEVEL = 6
+
+
+class EventLog:
+    """Gameplay events written to rotated gzip files in ``directory``"""
+
+    def __init__(self, directory, max_bytes=MAX_BYTES, max_age=MAX_AGE, flush_interval=FLUSH_INTERVAL,
+                 max_buffered=MAX_BUFFERED, clock=time.time):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_buffered = max_buffered
+        self.clock = clock
+        self.written = 0
+        self.dropped = 0
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._write_lock = threading.Lock()
+        self._raw = self._gzip = self._path = None
+        self._opened_at = 0.0
+        self._sequence = 0
+
+        if flush_interval:
+            self._thread = threading.Thread(target=self._write_periodically, args=(flush_interval,),
+                                            name="event-log-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, kind, player='', mode='', difficulty='', word='', seconds='', hints='', detail=''):
+        """Queue one event; never blocks"""
+        buffer = self._buffer
+        if len(buffer) >= self.max_buffered:
+            self.dropped += 1
+            return
+        buffer.append((self.clock(), kind, player, mode, difficulty, word, seconds, hints, detail))
+        if len(buffer) == BATCH_SIZE:
+            self._wake.set()
+
+    def pending_count(self):
+        return len(self._buffer)
+
+    def flush(self):
+        """Write every queued event, BATCH_SIZE at a time; returns the number written"""
+        with self._write_lock:
+            buffer = self._buffer
+            count = len(buffer)
+            written = 0
+            while written < count:
+                batch = min(BATCH_SIZE, count - written)
+                records = [buffer.popleft() for _ in range(batch)]
+                lines = []
+                for t, kind, player, mode, difficulty, word, seconds, hints, detail in records:
+                    if seconds.__class__ is float:
+                        seconds = f"{seconds:.2f}"
+                    lines.append(f"{t:.3f}\t{kind}\t{player}\t{mode}\t{difficulty}\t{word}\t{seconds}\t{hints}\t"
+                                 f"{detail}\n")
+                text = ''.join(lines)
+                if text.count('\n') != batch or text.count('\t') != 8 * batch or '\r' in text:
+                    # A separator inside a field would split or forge lines; turn those into spaces
+                    text = ''.join(map(_clean_line, records))
+                if self._gzip is None:
+                    self._open()
+                self._gzip.write(text.encode('utf-8'))
+                written += batch
+                self.written += batch
+                self._rotate_if_due()
+            self._rotate_if_due()
+            return written
+
+    def _open(self):
+        now = self.clock()
+        self._sequence += 1
+        name = f"events-{time.strftime('%Y%m%d-%H%M%S', time.gmtime(now))}-{os.getpid()}-{self._sequence:04d}"
+        self._path = os.path.join(self.directory, f"{name}.tsv.gz")
+        self._raw = open(f"{self._path}.part", 'wb')
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=COMPRESS_LEVEL)
+        self._opened_at = now
+
+    def _rotate_if_due(self):
+        if self._gzip is not None and (self._raw.tell() >= self.max_bytes
+                                       or self.clock() - self._opened_at >= self.max_age):
+            self._finish()
+
+    def _finish(self):
+        """Complete the active file and make it visible to readers"""
+        self._gzip.close()
+        self._raw.close()
+        os.replace(f"{self._path}.part", self._path)
+        self._raw = self._gzip = None
+
+    def _write_periodically(self, interval):
+        while not self._closed.is_set():
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._closed.is_set():
+                break  # close() writes the rest
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Event log write failed, will retry: {e}")
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self.flush()
+        with self._write_lock:
+            if self._gzip is not None:
+                self._finish()
+
+
+def _clean_line(record):
+    """Format ``record`` as a log line with tabs and line breaks inside its fields turned into spaces"""
+    t, kind, player, mode, difficulty, word, seconds, hints, detail = record
+    if seconds.__class__ is float:
+        seconds = f"{seconds:.2f}"
+    fields = (kind, player, mode, difficulty, word, seconds, hints, detail)
+    return "\t".join([f"{t:.3f}", *(str(field).translate(_SEPARATORS) for field in fields)]) + "\n"
+
+
+def read_events(path):
+    """Yield the events in one completed log file as lists of strings, in FIELDS order"""
+    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) == len(FIELDS):
+                yield fields
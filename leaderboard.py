@@ -0,0 +1,472 @@
+"""Ranked leaderboards: an order-statistic index over player scores, persisted to SQLite.
+
+Players are ordered by ``(-score, player_id)`` in a blocked sorted list. Block
+lengths are kept in a Fenwick tree, so updates, rank lookups and positional
+reads cost a couple of bisections plus an O(log blocks) tree walk, and reading
+the top K or a player's neighbours touches only the rows returned.
+
+Daily and weekly boards sum per-day score buckets over a rolling window of
+UTC days and keep the window's totals in the same index; buckets that fall
+out of the window are subtracted a batch at a time.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+
+from db import connect, transaction
+
+# Target block length; blocks split at twice this size
+LOAD = 512
+SYNC_INTERVAL = 5.0
+# Rolling windows, in UTC days
+WINDOWS = {'daily': 1, 'weekly': 7}
+# Players subtracted from a window per call while an expired day bucket drains
+EXPIRE_BATCH = 500
+DAY_SECONDS = 86400
+
+
+def day_number(timestamp):
+    """UTC day a timestamp falls in"""
+    return int(timestamp // DAY_SECONDS)
+
+
+class RankedList:
+    """Sorted list of unique keys with O(log n) insert, remove, index and lookup by position"""
+
+    def __init__(self, keys=()):
+        keys = sorted(keys)
+        self._blocks = [keys[i:i + LOAD] for i in range(0, len(keys), LOAD)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+        self._build_tree()
+
+    def __len__(self):
+        return self._len
+
+    def _build_tree(self):
+        tree = [len(block) for block in self._blocks]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, block, delta):
+        tree = self._tree
+        while block < len(tree):
+            tree[block] += delta
+            block |= block + 1
+
+    def _prefix(self, block):
+        """Number of keys in blocks before ``block``"""
+        total = 0
+        tree = self._tree
+        while block > 0:
+            total += tree[block - 1]
+            block &= block - 1
+        return total
+
+    def _locate(self, pos):
+        """Map a position to (block, offset) by descending the Fenwick tree"""
+        tree = self._tree
+        block = 0
+        step = 1 << (len(tree).bit_length() - 1) if tree else 0
+        while step:
+            probe = block + step - 1
+            if probe < len(tree) and tree[probe] <= pos:
+                pos -= tree[probe]
+                block += step
+            step >>= 1
+        return block, pos
+
+    def add(self, key):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            self._build_tree()
+            return
+
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+            self._blocks[i].append(key)
+            self._maxes[i] = key
+        else:
+            insort(self._blocks[i], key)
+        self._len += 1
+
+        block = self._blocks[i]
+        if len(block) > 2 * LOAD:
+            self._blocks[i:i + 1] = [block[:LOAD], block[LOAD:]]
+            self._maxes[i:i + 1] = [block[LOAD - 1], block[-1]]
+            self._build_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def remove(self, key):
+        i = bisect_left(self._maxes, key)
+        block = self._blocks[i] if i < len(self._blocks) else ()
+        j = bisect_left(block, key)
+        if j == len(block) or block[j] != key:
+            raise ValueError(f"{key!r} not in list")
+        del block[j]
+        self._len -= 1
+
+        if block:
+            self._maxes[i] = block[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+            self._build_tree()
+
+    def index(self, key):
+        """Zero-based position of ``key``"""
+        i = bisect_left(self._maxes, key)
+        if i < len(self._blocks):
+            j = bisect_left(self._blocks[i], key)
+            if j < len(self._blocks[i]) and self._blocks[i][j] == key:
+                return self._prefix(i) + j
+        raise ValueError(f"{key!r} not in list")
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += self._len
+        if not 0 <= pos < self._len:
+            raise IndexError("RankedList index out of range")
+        block, offset = self._locate(pos)
+        return self._blocks[block][offset]
+
+    def islice(self, start, stop):
+        """Yield keys at positions ``start`` to ``stop`` (exclusive)"""
+        start = max(start, 0)
+        stop = min(stop, self._len)
+        if start >= stop:
+            return
+        block, offset = self._locate(start)
+        remaining = stop - start
+        while remaining:
+            chunk = self._blocks[block][offset:offset + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            block += 1
+            offset = 0
+
+
+class Leaderboard:
+    """In-memory ranking of players by score; ties rank by player id"""
+
+    def __init__(self, rows=()):
+        # player_id -> (score, level, games)
+        self._entries = {player_id: (score, level, games) for player_id, score, level, games in rows}
+        self._order = RankedList((-score, player_id) for player_id, (score, _, _) in self._entries.items())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, player_id):
+        return player_id in self._entries
+
+    def update(self, player_id, score, level=1, games=0):
+        """Insert or move a player; returns their new 1-based rank"""
+        previous = self._entries.get(player_id)
+        if previous is None or previous[0] != score:
+            if previous is not None:
+                self._order.remove((-previous[0], player_id))
+            self._order.add((-score, player_id))
+        self._entries[player_id] = (score, level, games)
+        return self.rank(player_id)
+
+    def remove(self, player_id):
+        score, _, _ = self._entries.pop(player_id)
+        self._order.remove((-score, player_id))
+
+    def rank(self, player_id):
+        """1-based rank, or None for a player with no recorded score"""
+        entry = self._entries.get(player_id)
+        if entry is None:
+            return None
+        return self._order.index((-entry[0], player_id)) + 1
+
+    def _rows(self, start, stop):
+        rows = []
+        for rank, (_, player_id) in enumerate(self._order.islice(start, stop), start + 1):
+            score, level, games = self._entries[player_id]
+            rows.append({'rank': rank, 'player_id': player_id, 'score': score, 'level': level, 'games': games})
+        return rows
+
+    def top(self, k=10):
+        return self._rows(0, k)
+
+    def around(self, player_id, radius=2):
+        """The player's row with up to ``radius`` neighbours on each side"""
+        rank = self.rank(player_id)
+        if rank is None:
+            return []
+        return self._rows(rank - 1 - radius, rank + radius)
+
+
+class LeaderboardStore(Leaderboard):
+    """Leaderboard loaded from and written through to a SQLite table.
+
+    Each worker process keeps its own in-memory index; ``sync`` pulls rows
+    other processes wrote since the last sync.
+    """
+
+    def __init__(self, path, sync_interval=SYNC_INTERVAL):
+        self.path = path
+        self.sync_interval = sync_interval
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leaderboard ("
+            " player_id TEXT PRIMARY KEY,"
+            " score INTEGER NOT NULL,"
+            " level INTEGER NOT NULL,"
+            " games INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS leaderboard_updated ON leaderboard (updated_at)")
+        self._lock = threading.RLock()
+
+        self._synced_at = time.time()
+        self._watermark = 0.0
+        rows = self._conn.execute("SELECT player_id, score, level, games, updated_at FROM leaderboard").fetchall()
+        for row in rows:
+            self._watermark = max(self._watermark, row[4])
+        super().__init__(row[:4] for row in rows)
+
+    def update(self, player_id, score, level=1, games=0):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO leaderboard (player_id, score, level, games, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(player_id) DO UPDATE SET score = excluded.score, level = excluded.level, "
+                "games = excluded.games, updated_at = excluded.updated_at",
+                (player_id, score, level, games, time.time())
+            )
+            return super().update(player_id, score, level, games)
+
+    def rank(self, player_id):
+        with self._lock:
+            return super().rank(player_id)
+
+    def _rows(self, start, stop):
+        with self._lock:
+            return super()._rows(start, stop)
+
+    def sync(self, force=False):
+        """Apply rows written by other processes; throttled to once per ``sync_interval``"""
+        now = time.time()
+        if not force and now - self._synced_at < self.sync_interval:
+            return 0
+        self._synced_at = now
+        with self._lock:
+            # Overlap by a second so rows committed with slightly older clocks are not missed
+            rows = self._conn.execute(
+                "SELECT player_id, score, level, games, updated_at FROM leaderboard WHERE updated_at >= ?",
+                (self._watermark - 1.0,)
+            ).fetchall()
+            for player_id, score, level, games, updated_at in rows:
+                super().update(player_id, score, level, games)
+                self._watermark = max(self._watermark, updated_at)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class WindowedLeaderboard:
+    """Scores summed over the last ``days`` UTC day buckets.
+
+    Each bucket maps player ids to their (score, games) for one day. When the
+    window moves, expired buckets are queued and subtracted from the running
+    totals at most EXPIRE_BATCH players per call, so a rollover never stalls
+    a single request.
+    """
+
+    def __init__(self, days):
+        self.days = days
+        self._buckets = {}
+        # player_id -> (score, games) summed over the window
+        self._totals = {}
+        self._levels = {}
+        self._board = Leaderboard()
+        self._today = None
+        self._expiring = deque()
+
+    def __len__(self):
+        return len(self._board)
+
+    def advance(self, today):
+        """Move the window to end at ``today``, queueing buckets that fall out of it"""
+        if self._today is not None and today <= self._today:
+            return
+        self._today = today
+        for day in sorted(d for d in self._buckets if d <= today - self.days):
+            self._expiring.append(iter(self._buckets.pop(day).items()))
+        self._drain()
+
+    def set(self, day, player_id, score, games, level=1):
+        """Record a player's absolute (score, games) for ``day``"""
+        self.advance(day)
+        if day <= self._today - self.days:
+            return
+        bucket = self._buckets.setdefault(day, {})
+        old_score, old_games = bucket.get(player_id, (0, 0))
+        bucket[player_id] = (score, games)
+        self._levels[player_id] = level
+        self._apply(player_id, score - old_score, games - old_games)
+        self._drain()
+
+    def _apply(self, player_id, score_delta, games_delta):
+        score, games = self._totals.get(player_id, (0, 0))
+        score += score_delta
+        games += games_delta
+        if games > 0:
+            self._totals[player_id] = (score, games)
+            self._board.update(player_id, score, self._levels.get(player_id, 1), games)
+        elif player_id in self._totals:
+            del self._totals[player_id]
+            self._levels.pop(player_id, None)
+            self._board.remove(player_id)
+
+    def _drain(self, budget=EXPIRE_BATCH):
+        while self._expiring and budget:
+            for player_id, (score, games) in self._expiring[0]:
+                self._apply(player_id, -score, -games)
+                budget -= 1
+                if not budget:
+                    break
+            else:
+                self._expiring.popleft()
+
+    def rank(self, player_id):
+        self._drain()
+        return self._board.rank(player_id)
+
+    def top(self, k=10):
+        self._drain()
+        return self._board.top(k)
+
+    def around(self, player_id, radius=2):
+        self._drain()
+        return self._board.around(player_id, radius)
+
+
+class PeriodLeaderboards:
+    """Rolling-window leaderboards (WINDOWS) over per-day score rows in SQLite.
+
+    Rows hold each player's running (score, games) for one UTC day, so
+    recording a game is a single upsert and every window is rebuilt from at
+    most ``max(WINDOWS.values())`` days of rows at startup.
+    """
+
+    def __init__(self, path, windows=WINDOWS, sync_interval=SYNC_INTERVAL, clock=time.time):
+        self.path = path
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._retain = max(windows.values())
+        self._windows = {name: WindowedLeaderboard(days) for name, days in windows.items()}
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leaderboard_days ("
+            " day INTEGER NOT NULL,"
+            " player_id TEXT NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " games INTEGER NOT NULL,"
+            " level INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (day, player_id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS leaderboard_days_updated ON leaderboard_days (updated_at)")
+        self._lock = threading.RLock()
+
+        self._today = None
+        self._synced_at = self._clock()
+        self._watermark = 0.0
+        with self._lock:
+            self._advance()
+            self._apply_rows(self._conn.execute(
+                "SELECT day, player_id, score, games, level, updated_at FROM leaderboard_days WHERE day > ?",
+                (self._today - self._retain,)
+            ).fetchall())
+
+    def _advance(self):
+        today = day_number(self._clock())
+        if today == self._today:
+            return
+        self._today = today
+        for window in self._windows.values():
+            window.advance(today)
+        self._conn.execute("DELETE FROM leaderboard_days WHERE day <= ?", (today - self._retain,))
+
+    def _apply_rows(self, rows):
+        for day, player_id, score, games, level, updated_at in rows:
+            for window in self._windows.values():
+                window.set(day, player_id, score, games, level)
+            self._watermark = max(self._watermark, updated_at)
+
+    def record(self, player_id, points, level=1):
+        """Add one completed game worth ``points`` to today's bucket"""
+        now = self._clock()
+        day = day_number(now)
+        with self._lock:
+            with transaction(self._conn):
+                self._conn.execute(
+                    "INSERT INTO leaderboard_days (day, player_id, score, games, level, updated_at) "
+                    "VALUES (?, ?, ?, 1, ?, ?) ON CONFLICT(day, player_id) DO UPDATE SET "
+                    "score = score + excluded.score, games = games + 1, level = excluded.level, "
+                    "updated_at = excluded.updated_at",
+                    (day, player_id, points, level, now)
+                )
+                # Re-read so increments made by other processes are not overwritten locally
+                score, games = self._conn.execute(
+                    "SELECT score, games FROM leaderboard_days WHERE day = ? AND player_id = ?", (day, player_id)
+                ).fetchone()
+            self._advance()
+            for window in self._windows.values():
+                window.set(day, player_id, score, games, level)
+
+    def sync(self, force=False):
+        """Apply rows written by other processes; throttled to once per ``sync_interval``"""
+        now = self._clock()
+        if not force and now - self._synced_at < self.sync_interval:
+            return 0
+        self._synced_at = now
+        with self._lock:
+            self._advance()
+            # Overlap by a second so rows committed with slightly older clocks are not missed
+            rows = self._conn.execute(
+                "SELECT day, player_id, score, games, level, updated_at FROM leaderboard_days "
+                "WHERE updated_at >= ? AND day > ?",
+                (self._watermark - 1.0, self._today - self._retain)
+            ).fetchall()
+            self._apply_rows(rows)
+        return len(rows)
+
+    def size(self, window):
+        with self._lock:
+            self._advance()
+            return len(self._windows[window])
+
+    def rank(self, window, player_id):
+        with self._lock:
+            self._advance()
+            return self._windows[window].rank(player_id)
+
+    def top(self, window, k=10):
+        with self._lock:
+            self._advance()
+            return self._windows[window].top(k)
+
+    def around(self, window, player_id, radius=2):
+        with self._lock:
+            self._advance()
+            return self._windows[window].around(player_id, radius)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,231 @@
+"""Compact on-disk lexicon format, memory-mapped read-only at runtime.
+
+Layout (native byte order, every section 8-byte aligned)::
+
+    header      MAGIC, version, flags, word_count, group_count, groups_size, blob_size
+    groups      UTF-8 JSON list of [difficulty, category] pairs
+    offsets     uint32[group_count + 1]  word-index boundaries of each group
+    word_ends   uint32[word_count + 1]   byte boundaries of each word in blob
+    frequency   float32[word_count]      only present when FLAG_FREQUENCY is set
+    blob        concatenated UTF-8 words, grouped and sorted within each group
+
+Because the file is mapped with ``ACCESS_READ`` every worker process reading
+it shares one page-cache copy. Build a lexicon from a plain word list with::
+
+    python lexicon.py build words.txt -o lexicon.bin
+
+Each input line is ``WORD [difficulty [category [frequency]]]``; a missing
+difficulty is inferred from word length and a missing category is
+``general``. Difficulties other than easy, medium and hard are rejected.
+Blank lines and lines starting with ``#`` are ignored.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from word_index import DIFFICULTIES, WordIndex
+
+MAGIC = b'WSLX'
+VERSION = 1
+FLAG_FREQUENCY = 0x1
+FLAG_BIG_ENDIAN = 0x2
+HEADER = struct.Struct('<4sHHIIII')
+DEFAULT_CATEGORY = 'general'
+
+
+class LexiconError(ValueError):
+    """Raised when a lexicon file is missing sections or has a bad header, or a word list names an unknown band"""
+
+
+def infer_difficulty(word):
+    """Difficulty band used when the word list does not name one"""
+    if len(word) <= 5:
+        return 'easy'
+    if len(word) <= 8:
+        return 'medium'
+    return 'hard'
+
+
+def _pad(size):
+    return -size % 8
+
+
+class MappedWords:
+    """Read-only sequence view decoding words straight from the mapped blob"""
+
+    def __init__(self, blob, word_ends):
+        self._blob = blob
+        self._ends = word_ends
+
+    def __len__(self):
+        return len(self._ends) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return str(self._blob[self._ends[i]:self._ends[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        blob = self._blob
+        ends = self._ends
+        for i in range(len(ends) - 1):
+            yield str(blob[ends[i]:ends[i + 1]], 'utf-8')
+
+
+class MappedLexicon(WordIndex):
+    """WordIndex whose words and offset tables live in a memory-mapped file"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size < HEADER.size:
+                raise LexiconError(f"{path}: truncated header")
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        view = memoryview(self._mmap)
+
+        magic, version, flags, word_count, group_count, groups_size, blob_size = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise LexiconError(f"{path}: not a version {VERSION} lexicon")
+        if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+            raise LexiconError(f"{path}: built on a machine with a different byte order")
+
+        pos = HEADER.size + _pad(HEADER.size)
+        try:
+            group_keys = tuple((difficulty, category)
+                               for difficulty, category in json.loads(bytes(view[pos:pos + groups_size])))
+            pos += groups_size + _pad(groups_size)
+            offsets = view[pos:pos + 4 * (group_count + 1)].cast('I')
+            pos += offsets.nbytes + _pad(offsets.nbytes)
+            word_ends = view[pos:pos + 4 * (word_count + 1)].cast('I')
+            pos += word_ends.nbytes + _pad(word_ends.nbytes)
+            if flags & FLAG_FREQUENCY:
+                self.frequencies = view[pos:pos + 4 * word_count].cast('f')
+                pos += self.frequencies.nbytes + _pad(self.frequencies.nbytes)
+            else:
+                self.frequencies = None
+        except (TypeError, ValueError) as e:
+            # Short sections fail to cast and a cut-off group list fails to parse
+            raise LexiconError(f"{path}: truncated or corrupt file ({e})") from e
+        blob = view[pos:pos + blob_size]
+        if (len(blob) != blob_size or len(group_keys) != group_count or len(offsets) != group_count + 1
+                or len(word_ends) != word_count + 1 or offsets[-1] != word_count or word_ends[-1] != blob_size):
+            raise LexiconError(f"{path}: truncated file")
+        if offsets[0] != 0 or any(offsets[g] > offsets[g + 1] for g in range(group_count)):
+            raise LexiconError(f"{path}: corrupt group offsets")
+        unknown = {difficulty for difficulty, _ in group_keys} - set(DIFFICULTIES)
+        if unknown:
+            raise LexiconError(f"{path}: unknown difficulties {', '.join(sorted(unknown))}")
+
+        super().__init__(MappedWords(blob, word_ends), group_keys, offsets)
+
+    def frequency(self, i):
+        """Frequency recorded for word ``i``, or None when the lexicon has none"""
+        return None if self.frequencies is None else self.frequencies[i]
+
+
+def write_lexicon(entries, path):
+    """Write ``(word, difficulty, category, frequency)`` entries to ``path``.
+
+    ``frequency`` may be None; the frequency section is only written when at
+    least one entry has one. Duplicate words within a group are dropped.
+    Returns the number of words written.
+    """
+    groups = {}
+    has_frequency = False
+    for word, difficulty, category, frequency in entries:
+        groups.setdefault((difficulty, category), {}).setdefault(word, frequency)
+        has_frequency = has_frequency or frequency is not None
+
+    group_keys = sorted(groups)
+    offsets = array('I', [0])
+    word_ends = array('I', [0])
+    frequencies = array('f')
+    blob = bytearray()
+    for key in group_keys:
+        for word, frequency in sorted(groups[key].items()):
+            blob += word.encode('utf-8')
+            word_ends.append(len(blob))
+            frequencies.append(frequency or 0.0)
+        offsets.append(len(word_ends) - 1)
+
+    groups_json = json.dumps([list(k) for k in group_keys], separators=(',', ':')).encode('utf-8')
+    flags = (FLAG_FREQUENCY if has_frequency else 0) | (FLAG_BIG_ENDIAN if sys.byteorder == 'big' else 0)
+    sections = [groups_json, offsets.tobytes(), word_ends.tobytes()]
+    if has_frequency:
+        sections.append(frequencies.tobytes())
+    sections.append(bytes(blob))
+
+    # Running workers may have the old file mapped: truncating it would kill them with SIGBUS, so the new
+    # file replaces it and they keep reading the old inode until they reopen
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as fh:
+        header = HEADER.pack(MAGIC, VERSION, flags, len(word_ends) - 1, len(group_keys), len(groups_json), len(blob))
+        fh.write(header + b'\0' * _pad(len(header)))
+        for section in sections:
+            fh.write(section + b'\0' * _pad(len(section)))
+    os.replace(tmp, path)
+    return len(word_ends) - 1
+
+
+def read_word_list(lines):
+    """Parse plain word-list lines into lexicon entries"""
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split()
+        word = fields[0].upper()
+        if not word.isalpha():
+            continue
+        difficulty = fields[1].lower() if len(fields) > 1 else infer_difficulty(word)
+        if difficulty not in DIFFICULTIES:
+            raise LexiconError(f"line {number}: unknown difficulty {fields[1]!r} for {word} "
+                               f"(expected {', '.join(DIFFICULTIES)})")
+        category = fields[2].lower() if len(fields) > 2 else DEFAULT_CATEGORY
+        try:
+            frequency = float(fields[3]) if len(fields) > 3 else None
+        except ValueError:
+            raise LexiconError(f"line {number}: frequency {fields[3]!r} for {word} is not a number") from None
+        yield word, difficulty, category, frequency
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect Word Scramble lexicon files")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="build a lexicon from a plain word list")
+    build.add_argument('word_list', help="input word list ('-' for stdin)")
+    build.add_argument('-o', '--output', default='lexicon.bin')
+    info = commands.add_parser('info', help="summarise an existing lexicon")
+    info.add_argument('lexicon')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        try:
+            if args.word_list == '-':
+                count = write_lexicon(read_word_list(sys.stdin), args.output)
+            else:
+                with open(args.word_list, encoding='utf-8') as fh:
+                    count = write_lexicon(read_word_list(fh), args.output)
+        except LexiconError as e:
+            sys.exit(f"{args.word_list}: {e}")
+        print(f"Wrote {count} words to {args.output}")
+        missing = [d for d in DIFFICULTIES if d not in MappedLexicon(args.output).difficulties()]
+        if missing:
+            print(f"Warning: no {', '.join(missing)} words; those rounds will use the nearest band")
+    else:
+        lexicon = MappedLexicon(args.lexicon)
+        print(f"{args.lexicon}: {len(lexicon)} words, frequencies {'yes' if lexicon.frequencies is not None else 'no'}")
+        for difficulty in lexicon.difficulties():
+            for category in lexicon.categories(difficulty):
+                print(f"  {difficulty:<8} {category:<20} {len(lexicon.group_words(difficulty, category))}")
+
+
+if __name__ == '__main__':
+    main()
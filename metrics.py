@@ -0,0 +1,249 @@
+"""Opt-in rerun instrumentation exported in the Prometheus text format.
+
+Disabled unless WORD_SCRAMBLE_METRICS is set (to anything but "0"). While
+disabled, ``timed`` hands back the undecorated function and every other
+helper returns at once, so instrumented code runs as before.
+
+Exporters, each optional:
+
+* WORD_SCRAMBLE_METRICS_FILE: rewrite this file every EXPORT_INTERVAL
+  seconds; "{pid}" in the path is replaced by the process id so several
+  workers can export side by side.
+* WORD_SCRAMBLE_METRICS_PORT: serve GET /metrics on 127.0.0.1:<port>.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("WORD_SCRAMBLE_METRICS", "") not in ("", "0")
+METRICS_FILE = os.environ.get("WORD_SCRAMBLE_METRICS_FILE")
+METRICS_PORT = os.environ.get("WORD_SCRAMBLE_METRICS_PORT")
+EXPORT_INTERVAL = 10.0
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COUNT_BUCKETS = (5, 10, 20, 40, 80, 160, 320, 640)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "word_scramble_section_seconds": ("histogram", "Time spent in main(), each screen and instrumented helpers",
+                                      SECONDS_BUCKETS),
+    "word_scramble_reruns_total": ("counter", "Script reruns by trigger", None),
+    "word_scramble_rerun_deltas": ("histogram", "Deltas (element, block and layout updates) sent per full rerun",
+                                   COUNT_BUCKETS),
+    "word_scramble_rerun_elements": ("histogram", "Elements sent per full rerun", COUNT_BUCKETS),
+    "word_scramble_sessions": ("gauge", "Registered sessions by state, as of the last memory sweep", None),
+    "word_scramble_session_state_bytes": ("gauge", "Measured state of all registered sessions", None),
+    "word_scramble_session_trims_total": ("counter", "Idle or over-cap sessions trimmed", None),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus exposes it"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'last')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+        self.count = 0
+        self.last = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+        self.last = value
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q):
+        """Estimate by linear interpolation inside the bucket holding the q-quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.bounds[-1]
+
+
+class Registry:
+    """Counters and histograms keyed by metric name and label values"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = Histogram(METRICS[name][2])
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._series[key] = value
+
+    def series(self, name):
+        """{labels dict as a tuple of pairs: value or Histogram} for one metric"""
+        with self._lock:
+            return {labels: value for (metric, labels), value in self._series.items() if metric == name}
+
+    def render(self):
+        """All series in the Prometheus text exposition format"""
+        lines = []
+        for name, (kind, help_text, _) in METRICS.items():
+            series = self.series(name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series.items()):
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {value}")
+                    continue
+                for bound, count in value.cumulative():
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {value.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+
+def timed(section):
+    """Decorator recording each call's duration under ``section``; a no-op while disabled"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.observe("word_scramble_section_seconds", time.perf_counter() - start, section=section)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorate
+
+
+def count_rerun(trigger):
+    if ENABLED:
+        REGISTRY.inc("word_scramble_reruns_total", trigger=trigger)
+
+
+def observe_rerun_messages(deltas, elements):
+    if ENABLED:
+        REGISTRY.observe("word_scramble_rerun_deltas", deltas)
+        REGISTRY.observe("word_scramble_rerun_elements", elements)
+
+
+def record_session_totals(totals):
+    """Publish SessionMemory.sweep() totals"""
+    if ENABLED:
+        REGISTRY.set("word_scramble_sessions", totals['sessions'] - totals['trimmed'], state="resident")
+        REGISTRY.set("word_scramble_sessions", totals['trimmed'], state="trimmed")
+        REGISTRY.set("word_scramble_session_state_bytes", totals['bytes'])
+        REGISTRY.set("word_scramble_session_trims_total", totals['trims'])
+
+
+def summary():
+    """Plain-data view of the registry for the in-app overlay"""
+    sections = [{'section': dict(labels)['section'], 'count': h.count, 'p50': h.quantile(0.5),
+                 'p95': h.quantile(0.95), 'last': h.last}
+                for labels, h in REGISTRY.series("word_scramble_section_seconds").items()]
+    sections.sort(key=lambda row: -row['p50'] * row['count'])
+    reruns = {dict(labels)['trigger']: count for labels, count in REGISTRY.series("word_scramble_reruns_total").items()}
+    last = {}
+    for name, key in (("word_scramble_rerun_deltas", 'deltas'), ("word_scramble_rerun_elements", 'elements')):
+        histogram = REGISTRY.series(name).get(())
+        last[key] = int(histogram.last) if histogram else 0
+    return {'sections': sections, 'reruns': dict(sorted(reruns.items())), 'last_rerun': last}
+
+
+def write_file(path):
+    """Atomically replace ``path`` with the current metrics"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_exporters(metrics_file=METRICS_FILE, port=METRICS_PORT, interval=EXPORT_INTERVAL):
+    """Start the configured file writer and HTTP endpoint; returns the HTTP server, if any"""
+    if not ENABLED:
+        return None
+    if metrics_file:
+        path = metrics_file.replace("{pid}", str(os.getpid()))
+
+        def export_loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    write_file(path)
+                except OSError as e:
+                    print(f"Metrics export to {path} failed: {e}")
+
+        threading.Thread(target=export_loop, name="metrics-file", daemon=True).start()
+    server = None
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+        except OSError as e:
+            print(f"Metrics endpoint unavailable on port {port}: {e}")
+        else:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
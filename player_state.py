@@ -0,0 +1,156 @@
+"""Compact, typed player profile and per-game round log.
+
+Profiles are slotted dataclasses rather than nested dicts, so each session
+holds fixed attribute slots instead of a hash table per level, and they
+serialize to the same JSON shape the profile store has always written.
+RoundLog keeps one typed array per column instead of a dict per round.
+"""
+
+import json
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import NamedTuple
+
+from ratings import INITIAL_PLAYER_RATING
+
+
+def _default_power_ups():
+    return {'time_freeze': 1, 'double_points': 1, 'letter_reveal': 2}
+
+
+@dataclass(slots=True)
+class PlayerStatistics:
+    games_played: int = 0
+    words_correct: int = 0
+    words_total: int = 0
+    average_time: float = 0
+    fastest_solve: float = float('inf')
+    perfect_games: int = 0
+    hints_used: int = 0
+    power_ups_used: int = 0
+
+    @property
+    def accuracy(self):
+        """Lifetime share of words solved"""
+        return self.words_correct / max(1, self.words_total)
+
+
+@dataclass(slots=True)
+class PlayerPreferences:
+    difficulty: str = 'medium'
+    preferred_categories: list = field(default_factory=list)
+    auto_difficulty: bool = True
+    sound_enabled: bool = True
+
+
+@dataclass(slots=True)
+class PlayerProfile:
+    level: int = 1
+    xp: int = 0
+    total_games: int = 0
+    total_words_solved: int = 0
+    total_score: int = 0
+    current_streak: int = 0
+    best_streak: int = 0
+    last_played: str | None = None  # Day of the last completed daily challenge (UTC, ISO)
+    daily_started: str | None = None  # Day of the last daily challenge started (UTC, ISO)
+    daily_streak: int = 0
+    coins: int = 5  # In-game currency
+    rating: float = INITIAL_PLAYER_RATING  # Elo skill, see ratings.py
+    power_ups: dict = field(default_factory=_default_power_ups)
+    achievements_unlocked: list = field(default_factory=list)
+    statistics: PlayerStatistics = field(default_factory=PlayerStatistics)
+    preferences: PlayerPreferences = field(default_factory=PlayerPreferences)
+
+    def to_dict(self):
+        """Plain, JSON-ready dict in the historical profile layout"""
+        data = {name: getattr(self, name) for name in _PROFILE_SCALARS}
+        data['power_ups'] = dict(self.power_ups)
+        data['achievements_unlocked'] = list(self.achievements_unlocked)
+        data['statistics'] = {name: getattr(self.statistics, name) for name in _STATISTICS_FIELDS}
+        preferences = {name: getattr(self.preferences, name) for name in _PREFERENCES_FIELDS}
+        preferences['preferred_categories'] = list(preferences['preferred_categories'])
+        data['preferences'] = preferences
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a profile from a saved dict; missing fields keep their defaults, unknown ones are dropped"""
+        profile = cls(**{k: v for k, v in data.items() if k in _PROFILE_SCALARS})
+        profile.power_ups.update(data.get('power_ups') or {})
+        profile.achievements_unlocked = list(data.get('achievements_unlocked') or [])
+        statistics = data.get('statistics') or {}
+        profile.statistics = PlayerStatistics(**{k: v for k, v in statistics.items() if k in _STATISTICS_FIELDS})
+        preferences = data.get('preferences') or {}
+        profile.preferences = PlayerPreferences(**{k: v for k, v in preferences.items() if k in _PREFERENCES_FIELDS})
+        return profile
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+_NESTED = ('power_ups', 'achievements_unlocked', 'statistics', 'preferences')
+_PROFILE_SCALARS = tuple(f.name for f in fields(PlayerProfile) if f.name not in _NESTED)
+_STATISTICS_FIELDS = tuple(f.name for f in fields(PlayerStatistics))
+_PREFERENCES_FIELDS = tuple(f.name for f in fields(PlayerPreferences))
+
+
+class RoundResult(NamedTuple):
+    word: str
+    time: float
+    score: int
+    difficulty: str
+    correct: bool
+
+
+class RoundLog:
+    """Results of the rounds played in the current game, stored column-wise"""
+
+    __slots__ = ('words', 'times', 'scores', 'difficulties', 'correct')
+
+    def __init__(self):
+        self.words = []
+        self.times = array('d')
+        self.scores = array('l')
+        self.difficulties = []
+        self.correct = bytearray()
+
+    def append(self, word, time, score, difficulty, correct):
+        self.words.append(word)
+        self.times.append(time)
+        self.scores.append(score)
+        self.difficulties.append(difficulty)
+        self.correct.append(bool(correct))
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, i):
+        return RoundResult(self.words[i], self.times[i], self.scores[i], self.difficulties[i], bool(self.correct[i]))
+
+    def __iter__(self):
+        for i in range(len(self.words)):
+            yield self[i]
+
+    def correct_count(self):
+        return sum(self.correct)
+
+    def all_correct(self):
+        return all(self.correct)
+
+    def accuracy(self):
+        return self.correct_count() / len(self) if self else 0.0
+
+    def average_time(self):
+        return sum(self.times) / len(self.times) if self.times else 0
+
+    def best_time(self):
+        return min(self.times) if self.times else 0
+
+    def to_list(self):
+        """Rounds as plain dicts, e.g. for logging"""
+        return [result._asdict() for result in self]
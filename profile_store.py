@@ -0,0 +1,107 @@
+"""Durable player profiles in SQLite (WAL mode) with write-behind batching."""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+
+from db import connect, transaction
+
+FLUSH_INTERVAL = 10.0
+
+
+class ProfileStore:
+    """Profiles keyed by player id.
+
+    ``save`` only records that a profile changed; the profile is serialized
+    and written together with every other pending profile by ``flush``, which
+    runs on round/game boundaries, from a background timer every
+    ``flush_interval`` seconds, and at interpreter exit. Profiles are stored
+    as ``encode(profile)`` text and returned as ``decode(text)``.
+    """
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, encode=json.dumps, decode=json.loads):
+        self.path = path
+        self._encode = encode
+        self._decode = decode
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " player_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._db_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending = {}
+        self._closed = threading.Event()
+
+        if flush_interval:
+            threading.Thread(target=self._flush_periodically, args=(flush_interval,),
+                             name="profile-store-flush", daemon=True).start()
+        atexit.register(self.close)
+
+    def load(self, player_id):
+        """Return the stored profile, or None for an unknown player"""
+        with self._pending_lock:
+            pending = self._pending.get(player_id)
+        if pending is not None:
+            return pending
+        with self._db_lock:
+            row = self._conn.execute("SELECT data FROM profiles WHERE player_id = ?", (player_id,)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def save(self, player_id, profile):
+        """Buffer ``profile`` for the next batched write"""
+        with self._pending_lock:
+            self._pending[player_id] = profile
+
+    def pending_count(self):
+        with self._pending_lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write every buffered profile in one transaction; returns the number written"""
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+
+        now = time.time()
+        rows = []
+        for player_id, profile in pending.items():
+            try:
+                rows.append((player_id, self._encode(profile), now))
+            except RuntimeError:
+                # Profile mutated mid-serialization by its session; retry on the next flush
+                self.save(player_id, profile)
+
+        def requeue():
+            # Profiles saved since the swap are newer than ours
+            with self._pending_lock:
+                for player_id, profile in pending.items():
+                    self._pending.setdefault(player_id, profile)
+
+        with self._db_lock, transaction(self._conn, on_error=requeue):
+            self._conn.executemany(
+                "INSERT INTO profiles (player_id, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(player_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                rows
+            )
+        return len(rows)
+
+    def _flush_periodically(self, interval):
+        while not self._closed.wait(interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Profile flush failed, will retry: {e}")
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
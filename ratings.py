@@ -0,0 +1,203 @@
+"""Elo skill ratings for players and words, and rating-matched word selection.
+
+A round is a match between the player and the word: solving it counts as a
+win for the player, a wrong guess, skip or time-up as a win for the word.
+Both ratings move by ``K * (outcome - expected)`` with the usual logistic
+expectation, so one update is O(1) whatever the history.
+
+Words start from the rating of their difficulty band (SEED_RATINGS), or,
+when a calibrated difficulty table is given, from the point between the
+easy and hard seeds that their hardness percentile puts them at.
+Selection aims at words the player is expected to solve with probability
+TARGET_SUCCESS: a rating-sorted copy of the word ratings is bisected for
+that target and a word is drawn from those within MATCH_SPREAD of it. The
+sorted copy is rebuilt after each sync, so it trails live ratings by at
+most ``sync_interval`` seconds.
+"""
+
+import atexit
+import math
+import random
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from db import connect, transaction
+
+SEED_RATINGS = {'easy': 1200.0, 'medium': 1500.0, 'hard': 1800.0}
+INITIAL_PLAYER_RATING = 1300.0
+# Players move faster until their rating has settled; words are played by everyone
+PROVISIONAL_ROUNDS = 30
+K_PROVISIONAL = 48.0
+K_PLAYER = 24.0
+K_WORD = 8.0
+TARGET_SUCCESS = 0.7
+MATCH_SPREAD = 50.0
+# Draws tried for a preferred category before taking any matched word
+PREFERRED_ATTEMPTS = 8
+SYNC_INTERVAL = 60.0
+
+
+def expected_success(player_rating, word_rating):
+    """Probability a player at ``player_rating`` solves a word at ``word_rating``"""
+    return 1.0 / (1.0 + 10 ** ((word_rating - player_rating) / 400.0))
+
+
+def target_rating(player_rating, success=TARGET_SUCCESS):
+    """Word rating the player solves with probability ``success``"""
+    return player_rating - 400.0 * math.log10(success / (1 - success))
+
+
+class WordRatings:
+    """Rating of every word in ``word_index``, by word position.
+
+    With a ``path``, rating changes are kept as pending deltas and added to
+    the word_ratings table every ``sync_interval`` seconds by a background
+    thread, which also loads the changes other processes wrote; without one
+    the ratings live in this process only. Either way the thread re-sorts
+    the words ``pick`` draws from on that interval once ratings have moved.
+    ``difficulty_table`` (see calibration.DifficultyTable) seeds the words
+    it covers.
+    """
+
+    def __init__(self, word_index, path=None, sync_interval=SYNC_INTERVAL, difficulty_table=None):
+        self.word_index = word_index
+        self._seed = array('d', bytes(8 * len(word_index)))
+        for group_id, (difficulty, _) in enumerate(word_index.group_keys):
+            seed = SEED_RATINGS.get(difficulty, SEED_RATINGS['medium'])
+            for i in range(word_index.offsets[group_id], word_index.offsets[group_id + 1]):
+                self._seed[i] = seed
+        if difficulty_table is not None:
+            easy, hard = SEED_RATINGS['easy'], SEED_RATINGS['hard']
+            for i, word in enumerate(word_index.words):
+                percentile = difficulty_table.percentile(word)
+                if percentile is not None:
+                    self._seed[i] = easy + percentile * (hard - easy)
+        self.ratings = array('d', self._seed)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._recorded = False
+        self._synced_at = 0.0
+        self._order = sorted(range(len(self.ratings)), key=self.ratings.__getitem__)
+        self._index = None
+        self._conn = None
+        self._closed = threading.Event()
+
+        if path is not None:
+            self._conn = connect(path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS word_ratings ("
+                " word_id INTEGER PRIMARY KEY,"
+                " word TEXT NOT NULL,"
+                " adjustment REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self.sync()
+            atexit.register(self.close)
+        self.reindex()
+        if sync_interval:
+            threading.Thread(target=self._sync_periodically, args=(sync_interval,),
+                             name="word-ratings-sync", daemon=True).start()
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def record(self, word_id, player_rating, outcome, rounds_played=PROVISIONAL_ROUNDS):
+        """Apply one round's result (1 solved, 0 not) to the word; returns the player's new rating"""
+        with self._lock:
+            word_rating = self.ratings[word_id]
+            surprise = outcome - expected_success(player_rating, word_rating)
+            self.ratings[word_id] = word_rating - K_WORD * surprise
+            self._recorded = True
+            if self._conn is not None:
+                self._pending[word_id] = self._pending.get(word_id, 0.0) - K_WORD * surprise
+        k = K_PROVISIONAL if rounds_played < PROVISIONAL_ROUNDS else K_PLAYER
+        return player_rating + k * surprise
+
+    def pick(self, target, rng=random, preferred_categories=None):
+        """Word id drawn from those rated within MATCH_SPREAD of ``target``.
+
+        When no word is that close, the spread is centred on the nearest
+        rated word instead. Preferred categories are honoured if one of a few
+        draws from the matched words belongs to one.
+        """
+        sorted_ratings, word_ids = self._index
+        pos = bisect_left(sorted_ratings, target)
+        lo = bisect_left(sorted_ratings, target - MATCH_SPREAD, hi=pos)
+        hi = bisect_right(sorted_ratings, target + MATCH_SPREAD, lo=pos)
+        if lo == hi:
+            below = sorted_ratings[pos - 1] if pos else None
+            above = sorted_ratings[pos] if pos < len(sorted_ratings) else None
+            nearest = above if below is None or (above is not None and above - target < target - below) else below
+            lo = bisect_left(sorted_ratings, nearest - MATCH_SPREAD)
+            hi = bisect_right(sorted_ratings, nearest + MATCH_SPREAD)
+
+        word_id = word_ids[lo + int(rng.random() * (hi - lo))]
+        if preferred_categories:
+            for _ in range(PREFERRED_ATTEMPTS):
+                if self.word_index.group_key(word_id)[1] in preferred_categories:
+                    break
+                word_id = word_ids[lo + int(rng.random() * (hi - lo))]
+        return word_id
+
+    def reindex(self):
+        """Re-sort words by their current rating; the previous order makes this close to linear"""
+        with self._lock:
+            ratings = array('d', self.ratings)
+        self._order.sort(key=ratings.__getitem__)
+        self._index = (array('d', (ratings[i] for i in self._order)), array('L', self._order))
+
+    def sync(self):
+        """Add pending deltas to the shared table and load every word's merged adjustment that changed"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        words = self.word_index.words
+        now = time.time()
+        since = self._synced_at
+        rows = [(word_id, words[word_id], delta, now) for word_id, delta in pending.items()]
+
+        def requeue():
+            with self._lock:
+                for word_id, delta in pending.items():
+                    self._pending[word_id] = self._pending.get(word_id, 0.0) + delta
+
+        with transaction(self._conn, on_error=requeue):
+            self._conn.executemany(
+                "INSERT INTO word_ratings (word_id, word, adjustment, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(word_id) DO UPDATE SET adjustment = adjustment + excluded.adjustment, "
+                "updated_at = excluded.updated_at",
+                rows
+            )
+            # Overlap the previous sync by a second: another process may commit rows stamped just before it
+            changed = self._conn.execute("SELECT word_id, word, adjustment FROM word_ratings WHERE updated_at >= ?",
+                                         (since - 1.0,)).fetchall()
+        self._synced_at = now
+
+        with self._lock:
+            for word_id, word, adjustment in changed:
+                # Ids written against a different lexicon build are ignored
+                if word_id < len(self.ratings) and words[word_id] == word:
+                    self.ratings[word_id] = self._seed[word_id] + adjustment + self._pending.get(word_id, 0.0)
+        return len(changed)
+
+    def _sync_periodically(self, interval):
+        while not self._closed.wait(interval):
+            try:
+                with self._lock:
+                    recorded, self._recorded = self._recorded, False
+                if self._conn is not None and self.sync():
+                    recorded = True
+                if recorded:
+                    self.reindex()
+            except sqlite3.Error as e:
+                print(f"Word rating sync failed, will retry: {e}")
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._conn is not None:
+            self.sync()
+            self._conn.close()
@@ -0,0 +1,199 @@
+"""Mergeable score distributions for percentile ranks ("top 7% of classic games").
+
+QuantileSketch is a log-bucketed histogram in the style of DDSketch: a value
+``x > 0`` is counted in bucket ``ceil(log(x) / log(gamma))`` with
+``gamma = (1 + alpha) / (1 - alpha)``. Memory depends only on the range of
+scores, not on how many games were recorded, and two sketches merge by
+adding bucket counts.
+
+Error bounds, for relative accuracy ``alpha`` (RELATIVE_ACCURACY):
+
+* ``quantile(q)`` is within a factor ``1 +/- alpha`` of the exact q-quantile.
+* ``fraction_below(x)`` lies between the exact fraction of values
+  ``<= x / gamma`` and the exact fraction of values ``< x``; only games
+  scoring within about ``2 * alpha`` of ``x`` can be misplaced.
+
+tests/test_score_sketch.py checks both bounds against exact percentiles on
+a small synthetic set, and benchmarks/bench_score_sketch.py at scale.
+"""
+
+import atexit
+import math
+import threading
+import time
+
+from db import connect, transaction
+
+RELATIVE_ACCURACY = 0.01
+# Lowest buckets are folded together beyond this many (scores far below the rest)
+MAX_BUCKETS = 2048
+SYNC_INTERVAL = 5.0
+# Bucket id used to persist the count of zero scores
+ZERO_BUCKET = -(2 ** 31)
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch over non-negative values"""
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY, max_buckets=MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.counts = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value, count=1):
+        if value <= 0:
+            self.zero_count += count
+        else:
+            key = self.key(value)
+            self.counts[key] = self.counts.get(key, 0) + count
+            if len(self.counts) > self.max_buckets:
+                self._collapse()
+        self.count += count
+
+    def merge(self, other):
+        """Add another sketch's counts into this one; both must share relative_accuracy"""
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.counts) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        keys = sorted(self.counts)
+        excess = keys[:len(keys) - self.max_buckets]
+        self.counts[keys[len(excess)]] += sum(self.counts.pop(k) for k in excess)
+
+    def fraction_below(self, value):
+        """Approximate fraction of recorded values strictly below ``value``"""
+        if not self.count or value <= 0:
+            return 0.0
+        key = self.key(value)
+        below = self.zero_count + sum(count for k, count in self.counts.items() if k < key)
+        return below / self.count
+
+    def quantile(self, q):
+        """Approximate value at quantile ``q`` (0..1), or None when empty"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen > rank:
+                # Midpoint (in relative terms) of the bucket (gamma**(key-1), gamma**key]
+                return 2 * self.gamma ** key / (1 + self.gamma)
+        return 2 * self.gamma ** max(self.counts) / (1 + self.gamma)
+
+    def buckets(self):
+        """(bucket, count) pairs, with the zero count under ZERO_BUCKET"""
+        if self.zero_count:
+            yield ZERO_BUCKET, self.zero_count
+        yield from self.counts.items()
+
+    def add_bucket(self, bucket, count):
+        if bucket == ZERO_BUCKET:
+            self.zero_count += count
+        else:
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += count
+
+
+class ScoreDistributions:
+    """One sketch of completed-game scores per game mode, shared across processes.
+
+    ``record`` counts a score locally and in a pending delta. ``sync`` adds
+    the pending deltas to the per-mode bucket counts in SQLite and reloads the
+    merged counts every process has written, at most once per ``sync_interval``.
+    """
+
+    def __init__(self, path, sync_interval=SYNC_INTERVAL, relative_accuracy=RELATIVE_ACCURACY):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.relative_accuracy = relative_accuracy
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_sketch ("
+            " mode TEXT NOT NULL,"
+            " bucket INTEGER NOT NULL,"
+            " count INTEGER NOT NULL,"
+            " PRIMARY KEY (mode, bucket))"
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        self._sketches = {}
+        self._pending = {}
+        self._synced_at = 0.0
+        self.sync(force=True)
+        atexit.register(self.close)
+
+    def _new_sketch(self):
+        return QuantileSketch(self.relative_accuracy)
+
+    def record(self, mode, score):
+        with self._lock:
+            self._sketches.setdefault(mode, self._new_sketch()).add(score)
+            self._pending.setdefault(mode, self._new_sketch()).add(score)
+
+    def fraction_below(self, mode, score):
+        """Approximate fraction of all recorded ``mode`` games scoring below ``score``"""
+        self.sync()
+        with self._lock:
+            sketch = self._sketches.get(mode)
+            return sketch.fraction_below(score) if sketch is not None else 0.0
+
+    def games(self, mode):
+        with self._lock:
+            sketch = self._sketches.get(mode)
+            return len(sketch) if sketch is not None else 0
+
+    def sync(self, force=False):
+        """Write pending counts and reload the global sketches; throttled to once per ``sync_interval``"""
+        now = time.time()
+        if not force and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            rows = [(mode, bucket, count) for mode, sketch in pending.items() for bucket, count in sketch.buckets()]
+
+            def requeue():
+                for mode, sketch in pending.items():
+                    self._pending.setdefault(mode, self._new_sketch()).merge(sketch)
+
+            with transaction(self._conn, on_error=requeue):
+                self._conn.executemany(
+                    "INSERT INTO score_sketch (mode, bucket, count) VALUES (?, ?, ?) "
+                    "ON CONFLICT(mode, bucket) DO UPDATE SET count = count + excluded.count",
+                    rows
+                )
+                merged = self._conn.execute("SELECT mode, bucket, count FROM score_sketch").fetchall()
+
+            sketches = {}
+            for mode, bucket, count in merged:
+                sketches.setdefault(mode, self._new_sketch()).add_bucket(bucket, count)
+            self._sketches = sketches
+
+    def close(self):
+        if self._closed:
+            return
+        try:
+            self.sync(force=True)
+        finally:
+            self._closed = True
+            with self._lock:
+                self._conn.close()
@@ -0,0 +1,148 @@
+"""Bounded word scrambling, single or in batches of distinct arrangements."""
+
+import math
+import random
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with streamlit, but keep the pure-Python path usable alone
+    np = None
+
+STRATEGIES = ('random', 'vowel_separate', 'reverse_chunks')
+MAX_ATTEMPTS = 8
+# Batches at least this large use the vectorized permutation path when numpy is available
+VECTORIZE_THRESHOLD = 64
+# Below this many distinct arrangements a batch enumerates them instead of sampling
+ENUMERATE_LIMIT = 5040
+
+
+def _arrange(letters, strategy, rng):
+    if strategy == 'random':
+        rng.shuffle(letters)
+    elif strategy == 'vowel_separate':
+        vowels = [l for l in letters if l.lower() in 'aeiou']
+        consonants = [l for l in letters if l.lower() not in 'aeiou']
+        rng.shuffle(vowels)
+        rng.shuffle(consonants)
+        letters = vowels + consonants
+    elif strategy == 'reverse_chunks':
+        mid = len(letters) // 2
+        letters = letters[mid:] + letters[:mid]
+        rng.shuffle(letters)
+    return ''.join(letters)
+
+
+def distinct_arrangements(word):
+    """Number of distinct orderings of the letters of ``word``"""
+    total = math.factorial(len(word))
+    for repeats in Counter(word).values():
+        total //= math.factorial(repeats)
+    return total
+
+
+def scramble_word(word, rng=random, avoid=()):
+    """Advanced word scrambling with multiple algorithms.
+
+    Returns an arrangement different from ``word`` (and from anything in
+    ``avoid`` when possible) after at most MAX_ATTEMPTS shuffles, falling back
+    to a rotation. Words with fewer than two distinct letters have no other
+    arrangement and are returned unchanged.
+    """
+    if len(set(word)) < 2:
+        return word
+
+    for _ in range(MAX_ATTEMPTS):
+        scrambled = _arrange(list(word), rng.choice(STRATEGIES), rng)
+        if scrambled != word and scrambled not in avoid:
+            return scrambled
+
+    # Rotating a word with two or more distinct letters always changes it
+    for shift in range(1, len(word)):
+        rotated = word[shift:] + word[:shift]
+        if rotated != word and rotated not in avoid:
+            return rotated
+    return word[1:] + word[:1]
+
+
+def _next_permutation(letters):
+    """Advance ``letters`` to the next lexicographic permutation in place"""
+    i = len(letters) - 2
+    while i >= 0 and letters[i] >= letters[i + 1]:
+        i -= 1
+    if i < 0:
+        letters.reverse()
+        return
+    j = len(letters) - 1
+    while letters[j] <= letters[i]:
+        j -= 1
+    letters[i], letters[j] = letters[j], letters[i]
+    letters[i + 1:] = reversed(letters[i + 1:])
+
+
+def _successors(word, count, seen):
+    """Yield up to ``count`` unseen arrangements following ``word`` lexicographically"""
+    letters = list(word)
+    while count > 0:
+        _next_permutation(letters)
+        candidate = ''.join(letters)
+        if candidate == word:
+            return
+        if candidate not in seen:
+            seen.add(candidate)
+            count -= 1
+            yield candidate
+
+
+def _sample_python(word, count, rng):
+    letters = list(word)
+    out = []
+    for _ in range(count):
+        rng.shuffle(letters)
+        out.append(''.join(letters))
+    return out
+
+
+def _sample_numpy(word, count, rng):
+    generator = np.random.default_rng(rng.getrandbits(64))
+    order = np.argsort(generator.random((count, len(word))), axis=1)
+    encoded = word.encode('utf-32-le')
+    letters = np.frombuffer(encoded, dtype=np.uint32)
+    raw = letters[order].tobytes()
+    width = len(encoded)
+    return [raw[i:i + width].decode('utf-32-le') for i in range(0, len(raw), width)]
+
+
+def scramble_batch(word, count, rng=random):
+    """Return up to ``count`` distinct scrambles of ``word``, none equal to it.
+
+    Fewer than ``count`` are returned only when the word does not have that
+    many other arrangements. Small arrangement spaces are enumerated; larger
+    ones are sampled (vectorized for big batches) with a bounded number of
+    rounds, then topped up with lexicographic successors.
+    """
+    available = distinct_arrangements(word) - 1
+    count = min(count, available)
+    if count <= 0:
+        return []
+
+    if available <= ENUMERATE_LIMIT or available < 2 * count:
+        # Enumeration starts from the sorted letters so every arrangement is reached
+        start = ''.join(sorted(word))
+        pool = [start] + list(_successors(start, available, {start}))
+        pool.remove(word)
+        return rng.sample(pool, count)
+
+    seen = {word}
+    result = []
+    sample = _sample_numpy if np is not None and count >= VECTORIZE_THRESHOLD else _sample_python
+    for _ in range(MAX_ATTEMPTS):
+        for candidate in sample(word, count - len(result), rng):
+            if candidate not in seen:
+                seen.add(candidate)
+                result.append(candidate)
+        if len(result) == count:
+            return result
+
+    result.extend(_successors(word, count - len(result), seen))
+    return result
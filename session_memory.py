@@ -0,0 +1,193 @@
+"""Per-session memory accounting with idle trimming and a process-wide cap.
+
+Sessions register the object that holds their state (a GameEngine in the
+app). A background sweep measures each one with ``measure(state)``; a
+session idle for longer than ``idle_seconds`` is handed to
+``trim(player_id, state)``, which persists and drops what can be reloaded.
+If the measured total still exceeds ``cap_bytes``, the least recently used
+sessions idle for at least ``grace_seconds`` are trimmed too. ``touch``
+reports whether a returning session was trimmed so the caller can
+rehydrate it.
+
+``trim`` runs on the sweep thread under the same lock as ``touch``, and
+never for a session touched within ``grace_seconds``. A session that
+touches before each use of its state, and uses it for less than that
+grace period, is therefore never trimmed while its own thread holds it.
+
+States are held through weak references, so sessions Streamlit has closed
+drop out of the totals on the next sweep.
+"""
+
+import sys
+import threading
+import time
+import weakref
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+
+IDLE_SECONDS = 900.0
+GRACE_SECONDS = 60.0
+SWEEP_INTERVAL = 30.0
+
+_OPAQUE = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, weakref.ref)
+_slot_names = {}
+
+
+def _slots(cls):
+    names = _slot_names.get(cls)
+    if names is None:
+        names = []
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get('__slots__', ())
+            names.extend((slots,) if isinstance(slots, str) else slots)
+        names = _slot_names[cls] = tuple(name for name in names if name not in ('__dict__', '__weakref__'))
+    return names
+
+
+def deep_size(obj, exclude=()):
+    """Bytes reachable from ``obj`` (sys.getsizeof summed over the object graph).
+
+    Objects in ``exclude``, and anything reachable only through them, are
+    not counted; neither are modules, classes and functions.
+    """
+    seen = {id(o) for o in exclude}
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if o is None or o is True or o is False or isinstance(o, _OPAQUE):
+            continue
+        if type(o) is int and -5 <= o <= 256:
+            continue  # Cached small ints
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            if o is not getattr(obj, '__dict__', None):
+                stack.extend(o.keys())  # Attribute names are interned and shared
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, bytearray, int, float)):
+            attributes = getattr(o, '__dict__', None)
+            if attributes is not None:
+                stack.append(attributes)
+            for name in _slots(type(o)):
+                value = getattr(o, name, None)
+                if value is not None:
+                    stack.append(value)
+    return size
+
+
+class _Session:
+    __slots__ = ('state', 'player_id', 'last_seen', 'size', 'trimmed')
+
+    def __init__(self, state, player_id, now):
+        self.state = weakref.ref(state)
+        self.player_id = player_id
+        self.last_seen = now
+        self.size = 0
+        self.trimmed = False
+
+
+class SessionMemory:
+    """Registered sessions keyed by Streamlit session id.
+
+    ``after_sweep(totals)`` runs after every sweep, e.g. to flush the
+    profiles ``trim`` buffered. Pass ``sweep_interval=0`` to sweep only
+    when ``sweep`` is called.
+    """
+
+    def __init__(self, measure, trim, cap_bytes, idle_seconds=IDLE_SECONDS, grace_seconds=GRACE_SECONDS,
+                 sweep_interval=SWEEP_INTERVAL, after_sweep=None, clock=time.monotonic):
+        self.measure = measure
+        self.trim = trim
+        self.cap_bytes = cap_bytes
+        self.idle_seconds = idle_seconds
+        self.grace_seconds = grace_seconds
+        self.after_sweep = after_sweep
+        self.clock = clock
+        self.trims = 0
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._closed = threading.Event()
+
+        if sweep_interval:
+            threading.Thread(target=self._sweep_periodically, args=(sweep_interval,),
+                             name="session-memory-sweep", daemon=True).start()
+
+    def register(self, session_id, state, player_id):
+        with self._lock:
+            self._sessions[session_id] = _Session(state, player_id, self.clock())
+
+    def touch(self, session_id):
+        """Mark the session active; True once after it was trimmed, so the caller rehydrates it"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            session.last_seen = self.clock()
+            if not session.trimmed:
+                return False
+            session.trimmed = False
+            return True
+
+    def sweep(self):
+        """Measure every session, trim idle ones and then enforce the cap; returns the totals"""
+        with self._lock:
+            now = self.clock()
+            live = []
+            for session_id, session in list(self._sessions.items()):
+                state = session.state()
+                if state is None:
+                    del self._sessions[session_id]
+                    continue
+                self._measure(session, state)
+                live.append((session, state))
+
+            total = sum(session.size for session, _ in live)
+            # Idle sessions first, then least recently used until under the cap
+            live.sort(key=lambda item: item[0].last_seen)
+            for session, state in live:
+                idle = now - session.last_seen
+                if session.trimmed or idle < self.grace_seconds:
+                    continue
+                if idle < self.idle_seconds and total <= self.cap_bytes:
+                    break
+                before = session.size
+                self.trim(session.player_id, state)
+                session.trimmed = True
+                self.trims += 1
+                self._measure(session, state)
+                total -= before - session.size
+            totals = self._totals(live, total)
+        if self.after_sweep is not None:
+            self.after_sweep(totals)
+        return totals
+
+    def _measure(self, session, state):
+        try:
+            session.size = self.measure(state)
+        except RuntimeError:
+            pass  # State changed size mid-measurement; keep the previous figure
+
+    def _totals(self, live, total):
+        trimmed = sum(1 for session, _ in live if session.trimmed)
+        return {'sessions': len(live), 'trimmed': trimmed, 'bytes': total, 'cap_bytes': self.cap_bytes,
+                'trims': self.trims}
+
+    def totals(self):
+        """Aggregate figures from the last measurements"""
+        with self._lock:
+            live = [(session, None) for session in self._sessions.values()]
+            return self._totals(live, sum(session.size for session, _ in live))
+
+    def _sweep_periodically(self, interval):
+        while not self._closed.wait(interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Session memory sweep failed: {e}")
+
+    def close(self):
+        self._closed.set()
@@ -0,0 +1,93 @@
+"""Real lexicon words that look like an answer, for word-bank distractors.
+
+Two words are ``letter_distance`` apart when that many letters must be
+added or removed to turn one's letters into the other's (the size of the
+multiset symmetric difference): one letter inserted or dropped is 1, one
+letter swapped for another is 2. Words within distance 2 are found by
+editing the answer's sorted-letter signature and looking every edit up in
+the AnagramIndex, so the search costs O(26 * word length) dict lookups and
+needs no index beyond the one that already validates guesses.
+"""
+
+import random
+from bisect import bisect_left
+from collections import Counter
+from string import ascii_uppercase
+
+from anagrams import signature
+
+# Words drawn from the answer's category when too few near neighbours exist
+FALLBACK_SAMPLE = 200
+
+
+def letter_distance(a, b):
+    """Letters to add or remove to turn the letters of ``a`` into those of ``b``"""
+    overlap = sum((Counter(a) & Counter(b)).values())
+    return len(a) + len(b) - 2 * overlap
+
+
+class SimilarWords:
+    """Near neighbours of a word over ``anagram_index``'s signatures.
+
+    ``word_index`` supplies same-category words, ranked by letter distance,
+    when the lexicon has too few words within distance 2 of an answer.
+    """
+
+    def __init__(self, anagram_index, word_index, alphabet=ascii_uppercase):
+        self.anagram_index = anagram_index
+        self.word_index = word_index
+        self.alphabet = alphabet
+
+    def neighbours(self, word):
+        """Lexicon words within distance 2 of ``word``, nearest first; anagrams are excluded"""
+        key = signature(word)
+        lookup = self.anagram_index.words_with_signature
+        distinct = sorted(set(key))
+        found = []
+        seen = {key}
+
+        def add(edited, distance):
+            if edited not in seen:
+                seen.add(edited)
+                found.extend((distance, w) for w in lookup(edited))
+
+        removed = {}
+        for letter in distinct:
+            i = key.index(letter)
+            removed[letter] = shorter = key[:i] + key[i + 1:]
+            add(shorter, 1)
+        for letter in self.alphabet:
+            add(_insert(key, letter), 1)
+        for old in distinct:
+            for letter in self.alphabet:
+                if letter != old:
+                    add(_insert(removed[old], letter), 2)
+        found.sort()
+        return [w for _, w in found]
+
+    def distractors(self, word, count, rng=random, difficulty=None, category=None):
+        """``count`` real words resembling ``word``, none of them a valid answer for it.
+
+        Picks at random among the nearest neighbours, then tops up from the
+        answer's (difficulty, category) group ranked by letter distance.
+        """
+        neighbours = self.neighbours(word)
+        picked = []
+        if neighbours:
+            nearest = neighbours[:count * 3]
+            picked = rng.sample(nearest, min(count, len(nearest)))
+        if len(picked) < count and difficulty is not None and category in self.word_index.categories(difficulty):
+            key = signature(word)
+            group = self.word_index.group_words(difficulty, category)
+            if len(group) > FALLBACK_SAMPLE:
+                group = rng.sample(group, FALLBACK_SAMPLE)
+            candidates = sorted({w for w in group if w not in picked and signature(w) != key},
+                                key=lambda w: (letter_distance(word, w), w))
+            picked += candidates[:count - len(picked)]
+        return picked
+
+
+def _insert(key, letter):
+    """``key`` with ``letter`` added, still in sorted order"""
+    i = bisect_left(key, letter)
+    return key[:i] + letter + key[i:]
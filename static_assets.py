@@ -0,0 +1,59 @@
+"""Content-hashed copies of static assets for long-lived browser caching."""
+
+import hashlib
+import os
+import re
+import tempfile
+
+HASH_LENGTH = 12
+# Published files are read by static servers that may run as another user
+FILE_MODE = 0o644
+_HASHED_NAME = re.compile(r'^(?P<stem>.+)\.[0-9a-f]{%d}(?P<ext>\.[^.]+)$' % HASH_LENGTH)
+
+
+def hashed_name(name, content):
+    """``app.css`` -> ``app.<first HASH_LENGTH hex digits of sha256>.css``"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def build_assets(source_dir, output_dir):
+    """Publish every file in ``source_dir`` to ``output_dir`` under its hashed name.
+
+    Files are written atomically, so several worker processes may build the
+    same assets concurrently. Stale hashed copies of the same assets are
+    removed. Returns ``{source name: hashed name}``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {}
+    for name in sorted(os.listdir(source_dir)):
+        path = os.path.join(source_dir, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, 'rb') as fh:
+            content = fh.read()
+        target = hashed_name(name, content)
+        manifest[name] = target
+        target_path = os.path.join(output_dir, target)
+        if not os.path.exists(target_path):
+            fd, tmp_path = tempfile.mkstemp(dir=output_dir)
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(content)
+            os.chmod(tmp_path, FILE_MODE)  # mkstemp creates files readable by their owner only
+            os.replace(tmp_path, target_path)
+        else:
+            try:
+                if os.stat(target_path).st_mode & 0o777 != FILE_MODE:
+                    os.chmod(target_path, FILE_MODE)  # Published by an earlier build with mkstemp's 0600
+            except OSError:
+                pass  # Removed meanwhile, or owned by another user who can fix it
+
+    current = set(manifest.values())
+    for name in os.listdir(output_dir):
+        match = _HASHED_NAME.match(name)
+        if match and name not in current and match['stem'] + match['ext'] in manifest:
+            try:
+                os.remove(os.path.join(output_dir, name))
+            except FileNotFoundError:
+                pass
+    return manifest
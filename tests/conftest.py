@@ -0,0 +1,4 @@
+import sys
+
+# The game logic must run without Streamlit: any import of it from the code under test raises ImportError
+sys.modules['streamlit'] = None
@@ -0,0 +1,32 @@
+"""Word lists, fakes and engine setup shared by the tests."""
+
+import random
+
+from anagrams import AnagramIndex
+from engine import GameEngine
+from word_index import WordIndex
+
+DATABASE = {
+    "easy": {"stops": ["STOP", "POTS"]},
+    "medium": {"nature": ["FOREST", "GARDEN"]},
+    "hard": {"science": ["CHEMISTRY", "ASTRONOMY"]},
+}
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def new_engine(seed=0, profile=None):
+    words = WordIndex.from_database(DATABASE)
+    clock = FakeClock()
+    engine = GameEngine(words, anagram_index=AnagramIndex(words), define=lambda word, category: f"def {word}",
+                        profile=profile, rng=random.Random(seed), clock=clock)
+    return engine, clock
@@ -0,0 +1,30 @@
+"""Analytics aggregation over hand-written event log lines."""
+
+import gzip
+
+import analytics
+
+T = 1_790_000_000.0
+
+
+def write_log(path, lines):
+    with gzip.open(path, 'wt', encoding='utf-8') as fh:
+        fh.writelines(lines)
+
+
+def test_malformed_lines_are_counted_and_skipped(tmp_path):
+    path = tmp_path / "events.tsv.gz"
+    write_log(path, [
+        f"{T:.3f}\tround_start\tp1\tclassic\teasy\tCAT\t\t\t1\n",
+        "garbage\n",
+        "not-a-time\tguess\tp1\tclassic\teasy\tCAT\t3.00\t0\t1\n",
+        f"{T + 50:.3f}\tgame_complete\tp1\tclassic\teasy\t\tlong\t\t100\n",
+        f"{T + 60:.3f}\tad_view\tp1\tclassic\teasy\t\t\t\trewarded:hint\n",
+    ])
+    counters, sessions, malformed = analytics.aggregate_file(str(path))
+    assert malformed == 3
+    (row,) = counters.values()
+    assert row[analytics.COUNTERS.index('games_started')] == 1
+    assert row[analytics.COUNTERS.index('games_completed')] == 0
+    assert row[analytics.COUNTERS.index('rewarded_ads')] == 1
+    assert sessions == {'p1': [[T, T + 60]]}
@@ -0,0 +1,15 @@
+"""Rebuilding the definitions file leaves stores that mapped it readable."""
+
+from definitions import DefinitionStore, main
+
+
+def test_rebuild_leaves_mapped_store_readable(tmp_path):
+    source, output = tmp_path / "source.tsv", tmp_path / "definitions.tsv"
+    source.write_text("cat\ta small pet\ncattle\tfarm animals\n")
+    main(['build', str(source), '-o', str(output)])
+    store = DefinitionStore(str(output))
+
+    source.write_text("dog\ta loyal pet\n")
+    main(['build', str(source), '-o', str(output)])
+    assert store.lookup("CATTLE") == "farm animals", "the old mapping still reads the old file"
+    assert DefinitionStore(str(output)).lookup("DOG") == "a loyal pet"
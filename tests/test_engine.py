@@ -0,0 +1,414 @@
+"""GameEngine behaviour, checked without Streamlit installed or imported.
+
+Plays scripted rounds against a fake clock and a seeded RNG and compares
+scores, streaks, achievements, level-ups, power-ups, time-ups and game
+completion with the rules the Streamlit app has always applied.
+"""
+
+import random
+import sys
+import time
+
+from anagrams import AnagramIndex
+from daily import build_daily_challenge
+from engine import GAME_CONFIG, SKIP_GUESS, GameEngine
+from player_state import PlayerProfile
+from ratings import WordRatings
+from similar_words import SimilarWords
+from tests.helpers import DATABASE, FakeClock, new_engine
+from word_index import WordIndex
+
+
+def kinds(events):
+    return [event.kind for event in events]
+
+
+def expected_score(engine, elapsed, difficulty, hints_used, multiplier=1):
+    difficulty_bonus = GAME_CONFIG['base_points_per_correct'] * {'easy': 1.0, 'medium': 1.5, 'hard': 2.0}[difficulty]
+    time_bonus = int(max(0, engine.time_per_round - elapsed) * GAME_CONFIG['time_bonus_multiplier'])
+    streak_bonus = min(engine.profile.current_streak * 2, 20)
+    return max(5, int((difficulty_bonus + time_bonus + streak_bonus - hints_used * 2) * multiplier))
+
+
+def test_correct_guess_and_streak():
+    engine, clock = new_engine()
+    engine.start_game('classic')
+    # A new profile has no answers yet, so auto difficulty starts on easy
+    assert engine.current_difficulty == 'easy' and engine.current_word in ("STOP", "POTS")
+    assert sorted(engine.scrambled_word) == sorted(engine.current_word)
+
+    clock.advance(5)
+    score = expected_score(engine, 5, 'easy', 0)
+    events = engine.process_guess(engine.current_word)
+    assert kinds(events) == ['correct', 'achievement'], kinds(events)  # speed_demon
+    assert engine.score == score == 15, (engine.score, score)
+    assert engine.profile.current_streak == 1 and engine.awaiting_next_round
+    assert engine.profile.xp == 150 + 15
+    assert engine.profile.statistics.fastest_solve == 5
+
+    for _ in range(2):
+        engine.next_round()
+        clock.advance(20)
+        engine.process_guess(engine.current_word)
+    assert 'streak_3' in engine.profile.achievements_unlocked
+    assert engine.profile.best_streak == 3
+
+
+def test_anagram_and_hints():
+    engine, clock = new_engine(seed=3)
+    engine.profile.preferences.auto_difficulty = False
+    engine.profile.preferences.difficulty = 'easy'
+    engine.start_game('classic')
+
+    events = engine.use_hint('category')
+    assert kinds(events) == ['hint'] and engine.show_hint
+    assert engine.current_hint_text == "💡 Category: This is a stops"
+    assert engine.profile.statistics.hints_used == 1
+    engine.use_free_hint()
+    assert engine.profile.statistics.hints_used == 1, "ad-rewarded hints are free"
+    assert engine.current_hint_text.startswith("🎁 Free hint: ")
+    assert engine.hint('definition') == f"def {engine.current_word}"
+
+    other = "POTS" if engine.current_word == "STOP" else "STOP"
+    assert engine.current_anagram_count == 2
+    clock.advance(30)
+    score = expected_score(engine, 30, 'easy', 2)
+    events = engine.process_guess(other)
+    assert events[0].kind == 'correct' and "valid anagram" in events[0].message
+    assert engine.score == score
+
+
+def test_wrong_skip_and_time_up():
+    engine, clock = new_engine()
+    engine.start_game('speed')
+    assert engine.total_rounds == 10 and engine.time_per_round == 30
+    engine.profile.current_streak = 4
+
+    events = engine.process_guess("WRONG")
+    assert kinds(events) == ['incorrect'] and engine.profile.current_streak == 0
+    engine.next_round()
+    events = engine.process_guess(SKIP_GUESS)
+    assert events[0].data['skipped'] and engine.round_results[-1].score == 0
+
+    engine.next_round()
+    clock.advance(29)
+    assert engine.tick() == []
+    clock.advance(1)
+    events = engine.tick()
+    assert kinds(events) == ['time_up'] and engine.awaiting_next_round
+    assert engine.tick() == [], "an expired round only times out once"
+    assert engine.profile.statistics.words_total == 3
+
+
+def test_power_ups():
+    engine, clock = new_engine()
+    engine.start_game('classic')
+    assert engine.use_power_up('word_bank') == [], "not owned"
+
+    events = engine.use_power_up('time_freeze')
+    assert kinds(events) == ['power_up'] and engine.time_freeze_remaining == 10
+    clock.advance(65)
+    assert engine.tick() == [], "frozen rounds do not time out"
+    clock.advance(1)
+    assert kinds(engine.tick()) == ['time_up']
+
+    engine.next_round()
+    engine.use_power_up('double_points')
+    engine.use_power_up('letter_reveal')
+    assert len(engine.letters_revealed) == 2
+    clock.advance(12)
+    score = expected_score(engine, 12, engine.current_difficulty, 0, multiplier=2)
+    engine.process_guess(engine.current_word)
+    assert engine.round_results[-1].score == score
+    assert engine.profile.power_ups == {'time_freeze': 0, 'double_points': 0, 'letter_reveal': 1}
+
+    engine.profile.power_ups['shuffle_master'] = 10
+    engine.profile.statistics.power_ups_used = 9
+    engine.next_round()
+    before = engine.scrambled_word
+    events = engine.use_power_up('shuffle_master')
+    assert kinds(events) == ['power_up', 'achievement'], kinds(events)  # power_user
+    assert engine.scrambled_word != before or len(set(before)) == 1
+
+
+def test_word_bank():
+    engine, _ = new_engine(seed=1)
+    engine.profile.preferences.auto_difficulty = False
+    engine.profile.preferences.difficulty = 'easy'
+    engine.start_game('classic')
+    engine.profile.power_ups['word_bank'] = 1
+    engine.use_power_up('word_bank')
+    options = engine.word_bank_options
+    assert engine.word_bank_shown and len(options) == 3 and engine.current_word in options, options
+    assert len(set(options)) == 3 and sum(engine.is_correct(o) for o in options) == 1, options
+    # Without a similarity index the bank falls back to mangled letters, never an anagram
+    assert all(o == engine.current_word or sorted(o) != sorted(engine.current_word) for o in options)
+    assert engine.word_bank_options is options, "chosen once per round"
+
+    words = WordIndex.from_database({"easy": {"animals": ["CAT", "BAT", "COAT", "DOG", "ACT"]}})
+    anagrams = AnagramIndex(words)
+    engine = GameEngine(words, anagram_index=anagrams, similar_words=SimilarWords(anagrams, words),
+                        rng=random.Random(0), clock=FakeClock())
+    engine.start_game('classic')
+    engine.current_word = "CAT"
+    options = engine.word_bank()
+    assert sorted(options) == ["BAT", "CAT", "COAT"], options  # Distance 2; ACT is an anagram, DOG is far
+
+
+def test_ratings():
+    words = WordIndex.from_database(DATABASE)
+    ratings = WordRatings(words)
+    clock = FakeClock()
+    engine = GameEngine(words, word_ratings=ratings, rng=random.Random(0), clock=clock)
+    engine.start_game('marathon')
+    assert engine.current_difficulty == 'easy', "a new player is matched with easy words"
+
+    # Solving every word raises the player's rating until hard words are served
+    difficulties = []
+    while len(difficulties) < 100 and engine.current_difficulty != 'hard':
+        word_id, before = engine.current_word_id, ratings.ratings[engine.current_word_id]
+        rating = engine.profile.rating
+        clock.advance(20)
+        engine.process_guess(engine.current_word)
+        assert engine.profile.rating > rating and ratings.ratings[word_id] < before
+        difficulties.append(engine.current_difficulty)
+        engine.next_round()
+        if engine.game_complete:
+            engine.reset_game()
+            engine.start_game('marathon')
+    order = ['easy', 'medium', 'hard']
+    assert engine.current_difficulty == 'hard', difficulties
+    assert difficulties == sorted(difficulties, key=order.index), difficulties
+
+    # Timing out lowers it again, by the same O(1) update
+    engine.reset_game()
+    engine.start_game('classic')
+    rating = engine.profile.rating
+    clock.advance(engine.time_per_round)
+    assert kinds(engine.tick()) == ['time_up'] and engine.profile.rating < rating
+
+    # Manual difficulty still picks from the chosen band, and still rates the round
+    engine.profile.preferences.auto_difficulty = False
+    engine.profile.preferences.difficulty = 'medium'
+    engine.next_round()
+    assert engine.current_difficulty == 'medium' and engine.current_word in ("FOREST", "GARDEN")
+
+
+def test_ratings_without_a_database_are_reindexed():
+    words = WordIndex.from_database(DATABASE)
+    ratings = WordRatings(words, sync_interval=0.01)
+    word_id = ratings.pick(1000.0, random.Random(0))
+    for _ in range(200):
+        ratings.record(word_id, 3000.0, 0)  # A strong player keeps failing it: the word gets much harder
+    deadline = time.monotonic() + 5
+    while ratings._index[1][-1] != word_id and time.monotonic() < deadline:
+        time.sleep(0.01)
+    ratings.close()
+    assert ratings._index[1][-1] == word_id, "the periodic reindex moved the word to the hard end"
+
+
+class FakeDifficultyTable:
+    def __init__(self, percentiles):
+        self.percentiles = percentiles
+
+    def percentile(self, word):
+        return self.percentiles.get(word)
+
+
+def test_calibrated_difficulty():
+    table = FakeDifficultyTable({"STOP": 0.9, "FOREST": 0.0})
+    words = WordIndex.from_database(DATABASE)
+    engine = GameEngine(words, difficulty_table=table, rng=random.Random(0), clock=FakeClock())
+    engine.start_game('classic')
+    # Calibrated words score between the easy (1.0) and hard (2.0) multipliers by percentile
+    assert engine.difficulty_multiplier('easy', "STOP") == 1.9
+    assert engine.difficulty_multiplier('medium', "FOREST") == 1.0
+    assert engine.difficulty_multiplier('medium', "GARDEN") == 1.5, "uncalibrated words keep their band"
+    hard_score = engine.calculate_score(10, 'hard', 0)
+    assert engine.calculate_score(10, 'easy', 0, "STOP") == hard_score - int(GAME_CONFIG['base_points_per_correct'] * 0.1)
+
+    ratings = WordRatings(words, difficulty_table=table)
+    seeds = dict(zip(words.words, ratings.ratings))
+    assert seeds["STOP"] == 1200 + 0.9 * 600 and seeds["FOREST"] == 1200 and seeds["GARDEN"] == 1500
+
+
+class RecordingEventLog:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, *event):
+        self.events.append(event)
+
+
+def test_event_log():
+    log = RecordingEventLog()
+    words = WordIndex.from_database(DATABASE)
+    clock = FakeClock()
+    engine = GameEngine(words, event_log=log, player_id="p1", rng=random.Random(0), clock=clock)
+    engine.profile.coins = 10
+    engine.start_game('classic')
+    engine.use_hint('category')
+    engine.use_free_hint()
+    engine.use_power_up('time_freeze')
+    clock.advance(12)
+    engine.process_guess(engine.current_word)
+    for guess in ("WRONG", SKIP_GUESS):
+        engine.next_round()
+        clock.advance(5)
+        engine.process_guess(guess)
+    engine.next_round()
+    clock.advance(engine.time_per_round)
+    engine.expire_round()
+    engine.next_round()
+    engine.process_guess(engine.current_word)
+    engine.next_round()
+    engine.purchase('power_pack_small')
+
+    kinds_logged = [event[0] for event in log.events]
+    assert kinds_logged == ['round_start', 'hint', 'hint', 'power_up', 'guess', 'round_start', 'guess', 'round_start',
+                            'skip', 'round_start', 'time_up', 'round_start', 'guess', 'game_complete', 'purchase'], \
+        kinds_logged
+    kind, player, mode, difficulty, word, seconds, hints, detail = log.events[4]
+    assert (player, mode, seconds, hints, detail) == ("p1", 'classic', 12, 2, 1), log.events[4]
+    assert log.events[2][-1].endswith(':free') and log.events[6][-1] == 0 and log.events[10][5] == engine.time_per_round
+    assert log.events[13][5] == clock.now - 1_000_000.0 and log.events[13][-1] == engine.score
+
+
+def test_daily_challenge():
+    words = WordIndex.from_database(DATABASE)
+    anagrams = AnagramIndex(words)
+    similar = SimilarWords(anagrams, words)
+    challenge = build_daily_challenge("2026-01-01", words, anagrams, similar, lambda word, category: f"def {word}")
+    assert challenge == build_daily_challenge("2026-01-01", words, anagrams, similar,
+                                              lambda word, category: f"def {word}"), "same day, same puzzles"
+    assert [p.difficulty for p in challenge.puzzles] == ['easy', 'easy', 'medium', 'medium', 'hard']
+    assert len({p.word for p in challenge.puzzles}) == 5 or len(words) < 5
+
+    # Every player gets the same scramble, hints and word bank, whatever their own RNG
+    engines = [new_engine(seed)[0] for seed in (1, 2)]
+    for engine in engines:
+        engine.profile.power_ups['word_bank'] = 1
+        engine.start_daily_challenge(challenge)
+        engine.use_hint('shuffle')
+        engine.use_power_up('word_bank')
+    puzzle = challenge.puzzles[0]
+    for engine in engines:
+        assert (engine.current_word, engine.scrambled_word) == (puzzle.word, puzzle.scrambled)
+        assert engine.current_hint_text == puzzle.hints['shuffle'] and engine.word_bank_options == list(puzzle.word_bank)
+
+    # Completing it on consecutive days builds the streak; a missed day restarts it
+    engine, clock = new_engine()
+    days = [f"2026-01-{d:02d}" for d in (1, 2, 2, 3, 4, 5, 6, 7, 9)]
+    streaks = []
+    unlocked_on = None
+    for day in days:
+        engine.reset_game()
+        engine.start_daily_challenge(challenge._replace(day=day))
+        if engine.daily_challenge is None:
+            assert day == engine.profile.last_played, "played once a day"
+            streaks.append(engine.profile.daily_streak)
+            continue
+        while not engine.game_complete:
+            clock.advance(5)
+            engine.process_guess(engine.current_word)
+            engine.next_round()
+        streaks.append(engine.profile.daily_streak)
+        if unlocked_on is None and 'streak_7' in engine.profile.achievements_unlocked:
+            unlocked_on = day
+    assert streaks == [1, 2, 2, 3, 4, 5, 6, 7, 1], streaks
+    assert unlocked_on == "2026-01-07" and engine.profile.last_played == "2026-01-09", unlocked_on
+
+    # Finishing it again from a second session that started before the first one finished ranks nothing
+    engine.reset_game()
+    engine.start_daily_challenge(challenge._replace(day="2026-01-10"))
+    engine.profile.last_played = "2026-01-10"
+    games, total, xp = engine.profile.total_games, engine.profile.total_score, engine.profile.xp
+    events = []
+    while not engine.game_complete:
+        engine.process_guess(engine.current_word)
+        events = engine.next_round()
+    assert [e.data['ranked'] for e in events if e.kind == 'game_complete'] == [False], events
+    assert (engine.profile.total_games, engine.profile.total_score) == (games, total) and engine.profile.xp >= xp
+
+    # Restarting it after leaving mid-game, answers already seen, plays but ranks nothing
+    engine.reset_game()
+    engine.start_daily_challenge(challenge._replace(day="2026-01-11"))
+    engine.process_guess(engine.current_word)
+    engine.reset_game()
+    engine.start_daily_challenge(challenge._replace(day="2026-01-11"))
+    assert engine.daily_challenge is not None and engine.profile.daily_started == "2026-01-11"
+    games, streak = engine.profile.total_games, engine.profile.daily_streak
+    while not engine.game_complete:
+        engine.process_guess(engine.current_word)
+        events = engine.next_round()
+    assert [e.data['ranked'] for e in events if e.kind == 'game_complete'] == [False], events
+    assert (engine.profile.total_games, engine.profile.daily_streak) == (games, streak)
+
+
+def test_game_complete_and_level_up():
+    engine, clock = new_engine()
+    engine.start_game('classic')
+    for round_number in range(1, 6):
+        clock.advance(15)
+        engine.process_guess(engine.current_word)
+        events = engine.next_round()
+        assert engine.game_complete == (round_number == 5)
+    assert kinds(events)[-1] == 'game_complete'
+    profile = engine.profile
+    assert profile.total_games == 1 and profile.total_score == engine.score
+    assert {'perfect_game', 'first_game', 'hint_less'} <= set(profile.achievements_unlocked)
+    assert profile.statistics.perfect_games == 1
+
+    # 749 XP at level 1: the next 25 XP reaches level 2 (750 XP) and pays 4 coins
+    profile = PlayerProfile(xp=749, coins=0)
+    engine, clock = new_engine(profile=profile)
+    events = engine.add_xp(25)
+    assert kinds(events) == ['level_up'] and profile.level == 2 and profile.coins == 4
+    profile.level, profile.xp = 9, 6749
+    events = engine.add_xp(1)
+    assert kinds(events) == ['level_up', 'achievement'], kinds(events)
+    assert 'level_10' in profile.achievements_unlocked
+
+
+def test_shop():
+    engine, _ = new_engine()
+    assert engine.purchase('power_pack_medium') == [], "5 coins cannot buy an 8 coin pack"
+    events = engine.purchase('power_pack_small')
+    assert kinds(events) == ['purchase'] and engine.profile.coins == 0
+    assert engine.profile.power_ups['time_freeze'] == 3 and engine.profile.power_ups['double_points'] == 2
+    engine.earn_coins(3)
+    assert engine.profile.coins == 3
+
+
+def test_reset_keeps_mode():
+    engine, clock = new_engine()
+    engine.start_game('marathon')
+    engine.process_guess(engine.current_word)
+    engine.reset_game()
+    assert engine.score == 0 and len(engine.round_results) == 0 and engine.current_round == 1
+    assert engine.game_mode == 'marathon' and engine.total_rounds == 20
+
+
+def test_hibernate_keeps_shared_objects():
+    engine, _ = new_engine()
+    challenge = build_daily_challenge("2026-01-01", engine.word_index)
+    engine.start_daily_challenge(challenge)
+    profile = engine.hibernate()
+    assert engine.profile is None and engine.shared_objects()[6] is challenge
+    engine.resume(profile)
+    assert engine.profile is profile and engine.daily_challenge is None and engine.game_mode == 'daily'
+
+
+def test_missing_band_uses_nearest():
+    words = WordIndex.from_database({"easy": {"stops": ["STOP"]}, "medium": {"nature": ["FOREST"]}})
+    engine = GameEngine(words, rng=random.Random(0), clock=FakeClock())
+    engine.profile.preferences.auto_difficulty = False
+    engine.profile.preferences.difficulty = 'hard'
+    engine.start_game('classic')
+    assert (engine.current_word, engine.current_difficulty) == ("FOREST", 'medium')
+    assert engine.process_guess(engine.current_word)[0].kind == 'correct'
+    assert [p.difficulty for p in build_daily_challenge("2026-01-01", words).puzzles][-1] == 'medium'
+
+
+def test_engine_does_not_import_streamlit():
+    assert sys.modules.get('streamlit') is None
@@ -0,0 +1,15 @@
+"""Event log lines always hold exactly the FIELDS columns."""
+
+from event_log import FIELDS, EventLog, read_events
+
+
+def test_separators_inside_fields_cannot_forge_lines(tmp_path):
+    log = EventLog(str(tmp_path), flush_interval=0, clock=lambda: 1_790_000_000.0)
+    log.emit('round_start', "evil\nnot-a-time\tguess\tx", 'classic', 'easy', 'CAT', '', '', 1)
+    log.emit('guess', "p1", 'classic', 'easy', 'CAT', 12.5, 0, "1\r")
+    log.close()
+    (path,) = tmp_path.glob("*.tsv.gz")
+    events = list(read_events(str(path)))
+    assert [event[1] for event in events] == ['round_start', 'guess'], events
+    assert all(len(event) == len(FIELDS) for event in events)
+    assert events[0][2] == "evil not-a-time guess x" and events[1][-1] == "1 "
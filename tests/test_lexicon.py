@@ -0,0 +1,54 @@
+"""Word lists and lexicon files only hold the easy, medium and hard bands."""
+
+import pytest
+
+from lexicon import LexiconError, MappedLexicon, read_word_list, write_lexicon
+
+
+def test_unknown_difficulty_is_rejected():
+    with pytest.raises(LexiconError, match="line 2: unknown difficulty 'expert'"):
+        list(read_word_list(["CAT easy animals", "BIRD expert animals"]))
+
+
+def test_lexicon_file_with_unknown_difficulty_is_rejected(tmp_path):
+    path = str(tmp_path / "lexicon.bin")
+    write_lexicon([("BIRD", 'expert', 'animals', None)], path)
+    with pytest.raises(LexiconError, match="unknown difficulties expert"):
+        MappedLexicon(path)
+
+
+def test_missing_band_draws_from_nearest(tmp_path):
+    path = str(tmp_path / "lexicon.bin")
+    write_lexicon(read_word_list(["CAT easy animals", "HORSE easy", "CATTLE medium farm"]), path)
+    lexicon = MappedLexicon(path)
+    assert lexicon.difficulties() == ('easy', 'medium')
+    assert lexicon.band('hard') == 'medium' and lexicon.pick('hard') == ("CATTLE", 'farm')
+    assert lexicon.pick('hard', preferred_categories=['farm']) == ("CATTLE", 'farm')
+
+
+def test_rebuild_leaves_mapped_lexicon_readable(tmp_path):
+    path = str(tmp_path / "lexicon.bin")
+    write_lexicon(read_word_list(["CAT easy animals", "CATTLE medium farm"]), path)
+    lexicon = MappedLexicon(path)
+    write_lexicon(read_word_list(["DOG easy animals"]), path)
+    assert list(lexicon) == ["CAT", "CATTLE"], "the old mapping still reads the old file"
+    assert list(MappedLexicon(path)) == ["DOG"]
+
+
+def test_truncated_lexicon_files_are_rejected(tmp_path):
+    path = str(tmp_path / "lexicon.bin")
+    write_lexicon(read_word_list(["CAT easy animals 1.5", "CATTLE medium farm"]), path)
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    # Every cut short of the last section's padding, down to an empty file
+    cut_path = str(tmp_path / "cut.bin")
+    for size in range(len(data) - 7):
+        with open(cut_path, 'wb') as fh:
+            fh.write(data[:size])
+        with pytest.raises(LexiconError):
+            MappedLexicon(cut_path)
+
+
+def test_bad_frequency_is_reported_with_its_line():
+    with pytest.raises(LexiconError, match="line 2: frequency 'often' for DOG is not a number"):
+        list(read_word_list(["CAT easy animals 1.5", "DOG easy animals often"]))
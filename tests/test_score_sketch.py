@@ -0,0 +1,48 @@
+"""QuantileSketch stays within its documented error bounds of exact percentiles."""
+
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+from score_sketch import RELATIVE_ACCURACY, QuantileSketch
+
+
+def synthetic_scores(seed, count=5000):
+    rng = random.Random(seed)
+    return [0 if rng.random() < 0.05 else int(rng.lognormvariate(4, 0.9)) for _ in range(count)]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_error_bounds_against_exact_percentiles(seed):
+    data = synthetic_scores(seed)
+    sketch = QuantileSketch()
+    for score in data:
+        sketch.add(score)
+    data.sort()
+    n = len(data)
+
+    # fraction_below(x) lies between the exact fractions below x / gamma and below x
+    for x in sorted(set(data)) + [data[-1] + 1]:
+        low = bisect_right(data, x / sketch.gamma) / n if x > 0 else 0.0
+        high = bisect_left(data, x) / n
+        assert low - 1e-12 <= sketch.fraction_below(x) <= high + 1e-12, x
+
+    # quantile(q) is within a factor 1 +/- alpha of the exact q-quantile
+    for i in range(1, 100):
+        exact = data[int(i / 100 * (n - 1))]
+        estimate = sketch.quantile(i / 100)
+        if exact == 0:
+            assert estimate == 0, i
+        else:
+            assert abs(estimate - exact) <= RELATIVE_ACCURACY * exact + 1e-9, (i, estimate, exact)
+
+
+def test_merged_halves_match_one_sketch():
+    data = synthetic_scores(0)
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, score in enumerate(data):
+        whole.add(score)
+        (left if i % 2 else right).add(score)
+    left.merge(right)
+    assert (left.counts, left.zero_count, left.count) == (whole.counts, whole.zero_count, whole.count)
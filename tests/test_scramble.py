@@ -0,0 +1,48 @@
+"""scramble_word and scramble_batch terminate quickly on worst-case words."""
+
+import random
+import time
+
+import pytest
+
+from scramble import distinct_arrangements, scramble_batch, scramble_word
+
+# Generous next to benchmarks/bench_scramble.py's budgets, so a loaded CI machine does not flake
+BUDGET_MS = 250
+
+
+def slowest_ms(fn, repeat):
+    worst = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        worst = max(worst, time.perf_counter() - start)
+    return worst * 1e3
+
+
+@pytest.mark.parametrize('word', ["A", "A" * 32, "AB", "AAAAAAAAAAAAAAAB", "MISSISSIPPI", "ENTREPRENEURSHIP",
+                                  "PNEUMONOULTRAMICROSCOPICSILICOVOLCANOCONIOSIS"])
+def test_scramble_word_terminates(word):
+    rng = random.Random(0)
+    for _ in range(200):
+        scrambled = scramble_word(word, rng, avoid=(word[::-1],))
+        assert sorted(scrambled) == sorted(word)
+        assert scrambled != word or len(set(word)) < 2
+    assert slowest_ms(lambda: scramble_word(word, rng), 200) < BUDGET_MS
+
+
+def test_scramble_word_with_every_arrangement_avoided():
+    # "AB" has one other arrangement; avoiding it too still returns promptly with a different word
+    assert scramble_word("AB", random.Random(0), avoid=("BA",)) == "BA"
+
+
+@pytest.mark.parametrize('word, count', [("A" * 32, 10), ("AB", 10), ("AAAAAAAAAAAAAAAB", 100),
+                                         ("MISSISSIPPI", 1000), ("ENTREPRENEURSHIP", 10_000),
+                                         ("PNEUMONOULTRAMICROSCOPICSILICOVOLCANOCONIOSIS", 1000)])
+def test_scramble_batch_terminates(word, count):
+    rng = random.Random(0)
+    batch = scramble_batch(word, count, rng)
+    assert len(batch) == min(count, distinct_arrangements(word) - 1)
+    assert len(set(batch)) == len(batch) and word not in batch
+    assert all(sorted(scrambled) == sorted(word) for scrambled in batch)
+    assert slowest_ms(lambda: scramble_batch(word, count, rng), 5) < BUDGET_MS * 4
@@ -0,0 +1,131 @@
+"""Bounded session memory with many idle sessions, checked without Streamlit.
+
+Registers SESSIONS GameEngines that have each played part of a game, as
+abandoned browser tabs would leave them, with a SessionMemory backed by a
+temporary ProfileStore. Checks that sessions past the idle threshold are
+saved and trimmed, that the measured total and the tracemalloc-measured
+heap both shrink and stay under the cap, that a cap alone trims the least
+recently used sessions, that recently active sessions are never trimmed,
+and that returning sessions get their saved profiles back.
+"""
+
+import random
+import tracemalloc
+
+from engine import GameEngine
+from player_state import PlayerProfile
+from profile_store import ProfileStore
+from session_memory import SessionMemory, deep_size
+from tests.helpers import DATABASE, FakeClock
+from word_index import WordIndex
+
+IDLE_SECONDS = 900
+SESSIONS = 5000
+
+
+def measure(engine):
+    return deep_size(engine, exclude=engine.shared_objects())
+
+
+def played_engine(words, rng):
+    """An engine a few rounds into a game, with some lifetime progress"""
+    engine = GameEngine(words, rng=rng)
+    engine.profile.xp = rng.randint(0, 50_000)
+    engine.start_game(rng.choice(['classic', 'speed', 'marathon']))
+    for _ in range(rng.randint(1, 4)):
+        engine.use_hint('category')
+        engine.process_guess(engine.current_word if rng.random() < 0.7 else "WRONG")
+        engine.next_round()
+    return engine
+
+
+class Harness:
+    def __init__(self, sessions, cap_bytes, path):
+        self.clock = FakeClock()
+        self.store = ProfileStore(path, flush_interval=0, encode=PlayerProfile.to_json,
+                                  decode=PlayerProfile.from_json)
+        self.memory = SessionMemory(measure, self.trim, cap_bytes, idle_seconds=IDLE_SECONDS,
+                                    sweep_interval=0, after_sweep=lambda totals: self.store.flush(),
+                                    clock=self.clock)
+        words = WordIndex.from_database(DATABASE)
+        rng = random.Random(0)
+        self.engines = {}
+        for i in range(sessions):
+            self.engines[f"s{i}"] = engine = played_engine(words, rng)
+            self.memory.register(f"s{i}", engine, f"player{i}")
+        self.saved = {session_id: engine.profile.to_dict() for session_id, engine in self.engines.items()}
+
+    def trim(self, player_id, engine):
+        self.store.save(player_id, engine.hibernate())
+
+    def resume(self, session_id):
+        if self.memory.touch(session_id):
+            self.engines[session_id].resume(self.store.load(f"player{session_id[1:]}"))
+            return True
+        return False
+
+    def close(self):
+        self.store.close()
+
+
+def test_idle_sessions_trimmed(tmp_path):
+    sessions = SESSIONS
+    path = str(tmp_path / "profiles.db")
+    tracemalloc.start()
+    harness = Harness(sessions, cap_bytes=1 << 40, path=path)
+    before = harness.memory.sweep()
+    heap_before = tracemalloc.get_traced_memory()[0]
+
+    # A tenth of the players are still around
+    harness.clock.advance(IDLE_SECONDS - 10)
+    active = [f"s{i}" for i in range(0, sessions, 10)]
+    for session_id in active:
+        harness.memory.touch(session_id)
+    harness.clock.advance(20)
+    after = harness.memory.sweep()
+    heap_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert after['trimmed'] == sessions - len(active), after
+    assert all(harness.engines[session_id].profile is not None for session_id in active)
+    assert after['bytes'] < before['bytes'] * 0.6, (before, after)
+    assert heap_after < heap_before, (heap_before, heap_after)
+
+    # Every trimmed profile was written, and comes back when the player returns
+    returning = [f"s{i}" for i in range(1, sessions, 10)]
+    for session_id in returning:
+        assert harness.resume(session_id)
+        assert harness.engines[session_id].profile.to_dict() == harness.saved[session_id], session_id
+        assert not harness.resume(session_id), "rehydrated only once"
+    assert not any(harness.resume(session_id) for session_id in active)
+    harness.close()
+
+
+def test_cap_trims_least_recently_used(tmp_path):
+    sessions = SESSIONS // 5
+    probe = Harness(sessions, cap_bytes=1 << 40, path=str(tmp_path / "probe.db"))
+    full = probe.memory.sweep()['bytes']
+    probe.close()
+
+    cap = full // 2
+    harness = Harness(sessions, cap_bytes=cap, path=str(tmp_path / "profiles.db"))
+    for i in range(sessions):
+        harness.clock.advance(0.1)  # s0 is the least recently used
+        harness.memory.touch(f"s{i}")
+    harness.clock.advance(60)
+    totals = harness.memory.sweep()
+    assert totals['bytes'] <= cap, (totals, cap)
+    assert 0 < totals['trimmed'] < sessions, totals
+    trimmed = [harness.engines[f"s{i}"].profile is None for i in range(sessions)]
+    assert trimmed == sorted(trimmed, reverse=True), "oldest sessions are trimmed first"
+    harness.close()
+
+
+def test_grace_and_closed_sessions(tmp_path):
+    harness = Harness(50, cap_bytes=0, path=str(tmp_path / "profiles.db"))
+    harness.clock.advance(30)
+    assert harness.memory.sweep()['trimmed'] == 0, "sessions inside the grace period are never trimmed"
+    del harness.engines["s0"]
+    totals = harness.memory.sweep()
+    assert totals['sessions'] == 49, totals
+    harness.close()
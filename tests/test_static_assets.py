@@ -0,0 +1,18 @@
+"""Hashed assets are published readable by a static server running as another user."""
+
+import os
+
+from static_assets import FILE_MODE, build_assets
+
+
+def test_published_assets_are_world_readable(tmp_path):
+    source, output = tmp_path / "assets", tmp_path / "public"
+    source.mkdir()
+    (source / "app.css").write_text("body {}")
+    manifest = build_assets(str(source), str(output))
+    published = output / manifest["app.css"]
+    assert published.read_text() == "body {}" and published.stat().st_mode & 0o777 == FILE_MODE
+
+    os.chmod(published, 0o600)  # As published by builds before the fix
+    build_assets(str(source), str(output))
+    assert published.stat().st_mode & 0o777 == FILE_MODE
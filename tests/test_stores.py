@@ -0,0 +1,85 @@
+"""SQLite-backed stores keep their buffered writes when the database is busy."""
+
+import sqlite3
+
+import pytest
+
+from profile_store import ProfileStore
+from ratings import WordRatings
+from score_sketch import ScoreDistributions
+from tests.helpers import DATABASE
+from word_index import WordIndex
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "profiles.db")
+
+
+class WriteLock:
+    """Holds the database's write lock from another connection until released"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def release(self):
+        self.conn.execute("ROLLBACK")
+        self.conn.close()
+
+
+def fail_fast(conn):
+    conn.execute("PRAGMA busy_timeout = 50")
+
+
+def test_profile_store_keeps_profiles_when_locked(path):
+    store = ProfileStore(path, flush_interval=0)
+    fail_fast(store._conn)
+    lock = WriteLock(path)
+    store.save("a", {"xp": 1})
+    store.save("b", {"xp": 2})
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert store.pending_count() == 2 and not store._conn.in_transaction
+
+    store.save("a", {"xp": 3})  # Newer than the copy that failed to write
+    lock.release()
+    assert store.flush() == 2
+    assert store.load("a") == {"xp": 3} and store.load("b") == {"xp": 2}
+    store.close()
+
+
+def test_score_sketch_keeps_counts_when_locked(path):
+    distributions = ScoreDistributions(path)
+    fail_fast(distributions._conn)
+    lock = WriteLock(path)
+    for score in (10, 20, 30):
+        distributions.record('classic', score)
+    with pytest.raises(sqlite3.OperationalError):
+        distributions.sync(force=True)
+    assert len(distributions._pending['classic']) == 3
+
+    lock.release()
+    distributions.sync(force=True)
+    assert distributions._pending == {} and distributions.games('classic') == 3
+    assert ScoreDistributions(path).games('classic') == 3
+    distributions.close()
+
+
+def test_word_ratings_keep_deltas_when_locked(path):
+    words = WordIndex.from_database(DATABASE)
+    ratings = WordRatings(words, path, sync_interval=0)
+    fail_fast(ratings._conn)
+    lock = WriteLock(path)
+    ratings.record(0, 1500, 1)
+    ratings.record(1, 1500, 0)
+    pending = dict(ratings._pending)
+    with pytest.raises(sqlite3.OperationalError):
+        ratings.sync()
+    assert ratings._pending == pending
+
+    lock.release()
+    ratings.sync()
+    assert ratings._pending == {}
+    assert list(WordRatings(words, path, sync_interval=0).ratings) == list(ratings.ratings)
+    ratings.close()
@@ -0,0 +1,108 @@
+"""Flattened, array-backed word index used for per-round word selection."""
+
+import random
+from array import array
+from bisect import bisect_right
+
+# Difficulty bands, easiest first
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+
+class WordIndex:
+    """All words in one flat tuple, grouped by (difficulty, category).
+
+    Group ``g`` owns ``words[offsets[g]:offsets[g + 1]]``, so picking a word is
+    two random draws and two array reads with no per-round copying.
+    """
+
+    def __init__(self, words, group_keys, offsets):
+        self.words = words
+        self.group_keys = group_keys
+        self.offsets = offsets
+
+        self._groups_by_difficulty = {}
+        self._group_by_category = {}
+        for group_id, (difficulty, category) in enumerate(group_keys):
+            if offsets[group_id + 1] == offsets[group_id]:
+                continue
+            self._groups_by_difficulty.setdefault(difficulty, []).append(group_id)
+            self._group_by_category.setdefault(difficulty, {})[category] = group_id
+        self._groups_by_difficulty = {d: tuple(g) for d, g in self._groups_by_difficulty.items()}
+        self._preferred_groups = {}
+        self._difficulties = tuple(self._groups_by_difficulty)
+        # Bands without words borrow the nearest band that has some, the easier one on a tie
+        present = [i for i, d in enumerate(DIFFICULTIES) if d in self._groups_by_difficulty]
+        self._bands = {d: DIFFICULTIES[min(present, key=lambda p: (abs(p - i), p))]
+                       for i, d in enumerate(DIFFICULTIES)} if present else {}
+        for difficulty, band in self._bands.items():
+            self._groups_by_difficulty.setdefault(difficulty, self._groups_by_difficulty[band])
+            self._group_by_category.setdefault(difficulty, self._group_by_category[band])
+
+    @classmethod
+    def from_database(cls, database):
+        """Build an index from a ``{difficulty: {category: [words]}}`` mapping"""
+        words = []
+        group_keys = []
+        offsets = array('L', [0])
+        for difficulty, categories in database.items():
+            for category, category_words in categories.items():
+                words.extend(category_words)
+                group_keys.append((difficulty, category))
+                offsets.append(len(words))
+        return cls(tuple(words), tuple(group_keys), offsets)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def difficulties(self):
+        """Bands that have words"""
+        return self._difficulties
+
+    def categories(self, difficulty):
+        return tuple(self._group_by_category.get(difficulty, ()))
+
+    def group_words(self, difficulty, category):
+        """Return the contiguous slice of words for one (difficulty, category)"""
+        group_id = self._group_by_category[difficulty][category]
+        return self.words[self.offsets[group_id]:self.offsets[group_id + 1]]
+
+    def group_key(self, word_id):
+        """(difficulty, category) of the word at position ``word_id``"""
+        return self.group_keys[bisect_right(self.offsets, word_id) - 1]
+
+    def pick(self, difficulty, preferred_categories=None, rng=random):
+        """Pick a category uniformly, then a word uniformly within it.
+
+        Mirrors the historical dict-of-dict selection: preferred categories
+        that exist for the difficulty restrict the draw, otherwise every
+        category of that difficulty is eligible.
+        """
+        word_id, category = self.pick_id(difficulty, preferred_categories, rng)
+        return self.words[word_id], category
+
+    def band(self, difficulty):
+        """The band ``pick`` draws ``difficulty`` words from: the nearest one the index has words in"""
+        return self._bands.get(difficulty, difficulty)
+
+    def pick_id(self, difficulty, preferred_categories=None, rng=random):
+        """Like ``pick``, returning the word's position instead of the word"""
+        if preferred_categories:
+            key = (difficulty, tuple(preferred_categories))
+            groups = self._preferred_groups.get(key)
+            if groups is None:
+                groups = self._resolve_preferred(difficulty, preferred_categories)
+                self._preferred_groups[key] = groups
+        else:
+            groups = self._groups_by_difficulty[difficulty]
+
+        group_id = groups[int(rng.random() * len(groups))]
+        start = self.offsets[group_id]
+        return start + int(rng.random() * (self.offsets[group_id + 1] - start)), self.group_keys[group_id][1]
+
+    def _resolve_preferred(self, difficulty, preferred_categories):
+        by_category = self._group_by_category[difficulty]
+        preferred = tuple(by_category[c] for c in preferred_categories if c in by_category)
+        return preferred or self._groups_by_difficulty[difficulty]